@@ -0,0 +1,25 @@
+"""
+Standalone performance benchmarks.
+
+Run from the project root against a disposable database, e.g.
+    python -m benchmarks.idempotency_ledger --rows 50000000
+"""
+import os
+
+import django
+
+
+def setup_django():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings')
+    django.setup()
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def report(label, samples):
+    """Print mean/p50/p99 of a list of durations given in seconds."""
+    mean = sum(samples) / len(samples)
+    print(f"{label:<40} mean {mean * 1000:8.3f} ms   p50 {percentile(samples, 50) * 1000:8.3f} ms   p99 {percentile(samples, 99) * 1000:8.3f} ms")
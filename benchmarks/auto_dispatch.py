@@ -0,0 +1,116 @@
+"""
+Sustained auto dispatch throughput: the Redis workload heap (one O(log n) pick per
+delivery, one UPDATE per batch) versus a COUNT query per candidate admin per delivery.
+
+    python -m benchmarks.auto_dispatch --deliveries 10000 --admins 200 --batch 1000
+
+Needs Redis. Creates `bench-dispatch` admins and deliveries in the real tables
+and deletes them at the end, so only run it against a disposable database.
+"""
+import argparse
+import time
+from datetime import date, timedelta
+
+from benchmarks import report, setup_django
+
+PRODUCT = 'bench-dispatch'
+
+
+def naive_pick(cursor, admin_ids):
+    """What a per-request 'least loaded admin' lookup costs without the heap."""
+    loads = []
+    for admin_id in admin_ids:
+        cursor.execute(
+            "SELECT count(*) FROM deliveries WHERE assigned_to_id = %s AND status IN ('ASSIGNED', 'IN_TRANSIT')",
+            [admin_id],
+        )
+        loads.append((cursor.fetchone()[0], admin_id))
+    return min(loads)[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--deliveries', type=int, default=10_000, help='CREATED deliveries to dispatch')
+    parser.add_argument('--admins', type=int, default=200, help='eligible admins')
+    parser.add_argument('--batch', type=int, default=1000, help='deliveries per dispatch batch')
+    parser.add_argument('--naive-sample', type=int, default=200, help='decisions timed for the COUNT-per-admin baseline')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.db import connection
+    from django.db.models import Count
+
+    from delivery.models import Delivery
+    from delivery.services import dispatch, workload
+    from delivery_auth.models import AuthUser
+
+    settings.DELIVERY_AUTO_DISPATCH = 'periodic'
+
+    admins = AuthUser.objects.bulk_create([
+        AuthUser(email=f'{PRODUCT}-{i}@example.com', first_name='Bench', last_name=str(i), role='admin')
+        for i in range(args.admins)
+    ])
+    admin_ids = [admin.id for admin in admins]
+    try:
+        Delivery.objects.bulk_create(
+            [Delivery(product_name=PRODUCT, delivery_date=date.today() + timedelta(days=i % 30)) for i in range(args.deliveries)],
+            batch_size=5000,
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE deliveries")
+        workload.rebuild_workload()
+
+        pick_samples = []
+        original_pick = workload.pick_admins
+
+        def timed_pick(count):
+            started = time.perf_counter()
+            picked = original_pick(count)
+            pick_samples.extend([(time.perf_counter() - started) / max(1, len(picked))] * len(picked))
+            return picked
+
+        dispatch.pick_admins = timed_pick
+        batch_samples = []
+        dispatched = 0
+        started = time.perf_counter()
+        while True:
+            batch_started = time.perf_counter()
+            assigned = dispatch.dispatch_deliveries(limit=args.batch)
+            if not assigned:
+                break
+            batch_samples.append(time.perf_counter() - batch_started)
+            dispatched += assigned
+        elapsed = time.perf_counter() - started
+        dispatch.pick_admins = original_pick
+
+        loads = list(
+            Delivery.objects.filter(product_name=PRODUCT, assigned_to_id__in=admin_ids)
+            .values('assigned_to_id').order_by().annotate(load=Count('id'))
+            .values_list('load', flat=True)
+        )
+
+        naive_samples = []
+        with connection.cursor() as cursor:
+            for _ in range(args.naive_sample):
+                decision_started = time.perf_counter()
+                naive_pick(cursor, admin_ids)
+                naive_samples.append(time.perf_counter() - decision_started)
+    finally:
+        Delivery.objects.filter(product_name=PRODUCT).delete()
+        AuthUser.objects.filter(id__in=admin_ids).delete()
+        workload.rebuild_workload()
+
+    print(f"\nDispatched {dispatched:,} deliveries to {args.admins} admins in {elapsed:.2f} s "
+          f"= {dispatched / elapsed * 60:,.0f} deliveries/minute")
+    if loads:
+        print(f"Per-admin load among bench admins: min {min(loads)}, max {max(loads)}")
+    report(f"heap: dispatch batch of {args.batch}", batch_samples)
+    report("heap: pick per delivery", pick_samples)
+    report("COUNT per admin: pick per delivery", naive_samples)
+    naive_mean = sum(naive_samples) / len(naive_samples)
+    print(f"COUNT per admin would sustain at most {60 / naive_mean:,.0f} decisions/minute")
+
+
+if __name__ == '__main__':
+    main()
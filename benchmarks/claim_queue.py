@@ -0,0 +1,131 @@
+"""
+Throughput of the admin claim queue as the number of concurrent claimers grows,
+with `FOR UPDATE SKIP LOCKED` (what `claim_deliveries` uses) versus a plain `FOR UPDATE`.
+
+    python -m benchmarks.claim_queue --rows 20000 --batch 10 --claimers 1 2 4 8 16
+
+Uses a scratch `bench_claim_deliveries` table that is dropped at the end.
+"""
+import argparse
+import threading
+import time
+
+from benchmarks import setup_django
+
+DDL = [
+    """
+    CREATE TABLE bench_claim_deliveries (
+        id bigserial PRIMARY KEY,
+        status varchar(20) NOT NULL,
+        delivery_date date NOT NULL,
+        delivery_address varchar(255),
+        assigned_to_id bigint,
+        version integer NOT NULL DEFAULT 0,
+        updated_at timestamptz NOT NULL DEFAULT now()
+    )
+    """,
+    """
+    CREATE INDEX bench_claim_deliveries_claimable ON bench_claim_deliveries (delivery_date, id)
+    WHERE status = 'CREATED' AND assigned_to_id IS NULL
+    """,
+]
+
+SEED = """
+    INSERT INTO bench_claim_deliveries (status, delivery_date, delivery_address)
+    SELECT 'CREATED', current_date + (i %% 30), 'Street ' || i
+    FROM generate_series(1, %s) AS i
+"""
+
+CLAIM_SQL = """
+    UPDATE bench_claim_deliveries AS d
+    SET status = 'ASSIGNED', assigned_to_id = %s, version = d.version + 1, updated_at = now()
+    FROM (
+        SELECT id FROM bench_claim_deliveries
+        WHERE status = 'CREATED' AND assigned_to_id IS NULL
+        ORDER BY delivery_date, id
+        LIMIT %s
+        FOR UPDATE {skip_locked}
+    ) AS picked
+    WHERE d.id = picked.id
+    RETURNING d.id
+"""
+
+
+def run(claimers, batch, skip_locked):
+    """Let `claimers` threads drain the queue; return (claimed ids, claims, elapsed seconds, empty claims)."""
+    from django.db import connection
+
+    sql = CLAIM_SQL.format(skip_locked='SKIP LOCKED' if skip_locked else '')
+    claimed = []
+    counts = {'claims': 0, 'empty': 0}
+    lock = threading.Lock()
+    barrier = threading.Barrier(claimers + 1)
+
+    def claimer(admin_id):
+        connection.set_autocommit(True)
+        try:
+            barrier.wait()
+            while True:
+                with connection.cursor() as cursor:
+                    cursor.execute(sql, [admin_id, batch])
+                    ids = [row[0] for row in cursor.fetchall()]
+                if not ids:
+                    with connection.cursor() as cursor:
+                        cursor.execute("SELECT EXISTS (SELECT 1 FROM bench_claim_deliveries WHERE status = 'CREATED')")
+                        if not cursor.fetchone()[0]:
+                            return
+                    with lock:
+                        counts['empty'] += 1
+                    continue
+                with lock:
+                    counts['claims'] += 1
+                    claimed.extend(ids)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=claimer, args=(admin_id,)) for admin_id in range(1, claimers + 1)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return claimed, counts['claims'], time.perf_counter() - started, counts['empty']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=20_000, help='CREATED deliveries to drain per run')
+    parser.add_argument('--batch', type=int, default=10, help='deliveries per claim')
+    parser.add_argument('--claimers', type=int, nargs='+', default=[1, 2, 4, 8, 16], help='concurrent claimers per run')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection
+
+    connection.set_autocommit(True)
+    with connection.cursor() as cursor:
+        cursor.execute("DROP TABLE IF EXISTS bench_claim_deliveries")
+        for sql in DDL:
+            cursor.execute(sql)
+
+    print(f"Draining {args.rows:,} deliveries in claims of {args.batch}\n")
+    print(f"{'claimers':>8} {'mode':<16} {'claims/s':>10} {'deliveries/s':>13} {'empty claims':>13} {'double claims':>14}")
+    try:
+        for claimers in args.claimers:
+            for skip_locked in (True, False):
+                with connection.cursor() as cursor:
+                    cursor.execute("TRUNCATE bench_claim_deliveries RESTART IDENTITY")
+                    cursor.execute(SEED, [args.rows])
+                    cursor.execute("VACUUM ANALYZE bench_claim_deliveries")
+
+                claimed, claims, elapsed, empty_claims = run(claimers, args.batch, skip_locked)
+                mode = 'SKIP LOCKED' if skip_locked else 'FOR UPDATE'
+                print(f"{claimers:>8} {mode:<16} {claims / elapsed:>10,.0f} {len(claimed) / elapsed:>13,.0f} {empty_claims:>13,} {len(claimed) - len(set(claimed)):>14}")
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TABLE IF EXISTS bench_claim_deliveries")
+
+
+if __name__ == '__main__':
+    main()
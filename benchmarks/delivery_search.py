@@ -0,0 +1,96 @@
+"""
+Latency of the `ListDeliveries` search: the first page of results for a partner,
+through the indexed search document (`delivery.services.search`) against the
+previous eight `icontains` predicates over deliveries and both joined users.
+
+    python -m benchmarks.delivery_search --rows 10000000 --terms laptop kathmandu "dell pokhara" 7f3a
+
+Inserts `bench-search` deliveries for a `bench-search@example.com` partner with COPY
+(their search documents built by the trigger) and deletes both at the end, so only
+run it against a disposable database.
+"""
+import argparse
+import io
+import random
+import time
+from datetime import date, timedelta
+
+from benchmarks import report, setup_django
+
+PRODUCT_TAG = 'bench-search'
+EMAIL = 'bench-search@example.com'
+PRODUCTS = ['Laptop', 'Phone', 'Charger', 'Monitor', 'Keyboard', 'Printer', 'Camera', 'Speaker']
+BRANDS = ['Dell', 'HP', 'Lenovo', 'Samsung', 'Apple', 'Canon', 'Sony', 'Asus']
+CITIES = ['Kathmandu', 'Pokhara', 'Lalitpur', 'Bhaktapur', 'Biratnagar', 'Butwal', 'Dharan', 'Hetauda']
+
+
+def seed(cursor, partner_id, rows, chunk=200_000):
+    """`rows` deliveries with product, brand and city drawn from small vocabularies plus a random hex serial."""
+    rng = random.Random(7)
+    today = date.today()
+    for start in range(0, rows, chunk):
+        buffer = io.StringIO()
+        for index in range(start, min(start + chunk, rows)):
+            product = f"{rng.choice(PRODUCTS)} {rng.choice(BRANDS)} {rng.getrandbits(32):08x} {PRODUCT_TAG}"
+            address = f"{rng.randrange(1, 500)} Ward, {rng.choice(CITIES)}"
+            buffer.write(f"{product}\tCOMPLETED\t{today - timedelta(days=index % 700)}\t{address}\t{partner_id}\tnow\tnow\tf\t{{}}\n")
+        buffer.seek(0)
+        cursor.copy_expert(
+            "COPY deliveries (product_name, status, delivery_date, delivery_address, created_by_id, created_at, updated_at, is_deleted, extras) FROM STDIN",
+            buffer,
+        )
+    cursor.execute("VACUUM ANALYZE deliveries")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000, help='deliveries to seed')
+    parser.add_argument('--terms', nargs='+', default=['laptop', 'kathmandu', 'dell pokhara', '7f3a'], help='search terms timed')
+    parser.add_argument('--per-page', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=10, help='searches timed per term and query')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection
+    from django.db.models import Q
+
+    from delivery.models import Delivery
+    from delivery.services.search import search_deliveries
+    from delivery_auth.models import AuthUser
+
+    partner = AuthUser.objects.create_user(email=EMAIL, password='bench', role='partner', first_name='Bench', last_name='Partner')
+    with connection.cursor() as cursor:
+        seed(cursor, partner.id, args.rows)
+    try:
+        queryset = Delivery.objects.select_related('assigned_to', 'created_by').filter(created_by=partner).order_by('-created_at')
+
+        def legacy(term):
+            return queryset.filter(
+                Q(product_name__icontains=term) | Q(status__icontains=term) | Q(delivery_date__icontains=term) |
+                Q(delivery_address__icontains=term) | Q(assigned_to__first_name__icontains=term) |
+                Q(assigned_to__last_name__icontains=term) | Q(created_by__first_name__icontains=term) |
+                Q(created_by__last_name__icontains=term)
+            )
+
+        def timed(build, term):
+            samples = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                rows = list(build(term)[:args.per_page])
+                samples.append(time.perf_counter() - started)
+            return samples, rows
+
+        for term in args.terms:
+            indexed_samples, indexed_rows = timed(lambda value: search_deliveries(queryset, value), term)
+            legacy_samples, _ = timed(legacy, term)
+            print(f"{term!r}: {len(indexed_rows)} results on the first page")
+            report(f'{term[:20]} icontains', legacy_samples)
+            report(f'{term[:20]} search document', indexed_samples)
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM deliveries WHERE created_by_id = %s", [partner.id])
+        partner.delete()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Cost of an offline geocoding lookup against a memory-mapped gazetteer
+(`utils.gazetteer.Gazetteer`) of a given size.
+
+    python -m benchmarks.gazetteer_lookup --entries 5000000 --lookups 200000
+
+Writes a synthetic gazetteer to a temporary file and deletes it at the end.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks import percentile
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--entries', type=int, default=1_000_000, help='addresses in the gazetteer')
+    parser.add_argument('--lookups', type=int, default=100_000, help='lookups timed, half of them misses')
+    args = parser.parse_args()
+
+    from utils.gazetteer import Gazetteer
+
+    rng = random.Random(3)
+    keys = sorted({f"{rng.randrange(1, 999)} street {rng.randrange(10 ** 7)} ward {rng.randrange(40)}".encode() for _ in range(args.entries)})
+    handle, path = tempfile.mkstemp(suffix='.gazetteer')
+    try:
+        with os.fdopen(handle, 'wb') as output:
+            for key in keys:
+                output.write(b'%s\t%r\t%r\n' % (key, rng.uniform(26, 30), rng.uniform(80, 88)))
+        size_mb = os.path.getsize(path) / 2 ** 20
+
+        gazetteer = Gazetteer(path)
+        queries = [(rng.choice(keys).decode(), True) if i % 2 else (f"{i} missing road", False) for i in range(args.lookups)]
+        samples = []
+        for query, expected in queries:
+            started = time.perf_counter_ns()
+            found = gazetteer.get(query)
+            samples.append(time.perf_counter_ns() - started)
+            assert (found is not None) == expected
+        gazetteer.close()
+    finally:
+        os.remove(path)
+
+    mean = sum(samples) / len(samples)
+    print(f"{len(keys):,} entries, {size_mb:.0f} MB file")
+    print(f"{'lookup (hits and misses)':<40} mean {mean / 1000:8.2f} us   p50 {percentile(samples, 50) / 1000:8.2f} us   p99 {percentile(samples, 99) / 1000:8.2f} us")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Latency of nearby delivery searches: geohash prefix pruning plus a vectorized
+haversine filter (what `delivery.services.geo` uses) versus a full-table haversine in SQL.
+
+    python -m benchmarks.geo_nearby --rows 5000000 --radius 2 --queries 200
+
+Inserts `bench-geo` deliveries into the real table with COPY and deletes them
+at the end, so only run it against a disposable database.
+"""
+import argparse
+import io
+import random
+import time
+
+from benchmarks import report, setup_django
+
+PRODUCT = 'bench-geo'
+
+# Centre of the square the points are scattered over, see --span
+CENTRE = (13.0, 77.6)
+
+SQL_HAVERSINE = """
+    SELECT id FROM deliveries
+    WHERE latitude IS NOT NULL AND status = 'CREATED'
+      AND 2 * 6371.0088 * asin(sqrt(
+          power(sin(radians(latitude - %(lat)s) / 2), 2)
+          + cos(radians(%(lat)s)) * cos(radians(latitude)) * power(sin(radians(longitude - %(lon)s) / 2), 2)
+      )) <= %(radius)s
+"""
+
+
+def area(span):
+    latitude, longitude = CENTRE
+    return latitude - span / 2, longitude - span / 2, latitude + span / 2, longitude + span / 2
+
+
+def seed(cursor, rows, span, chunk=500_000):
+    import numpy as np
+
+    from utils.geohash import encode_many
+
+    rng = np.random.default_rng(42)
+    min_lat, min_lon, max_lat, max_lon = area(span)
+    for start in range(0, rows, chunk):
+        size = min(chunk, rows - start)
+        latitudes = rng.uniform(min_lat, max_lat, size)
+        longitudes = rng.uniform(min_lon, max_lon, size)
+        geohashes = encode_many(latitudes, longitudes)
+        buffer = io.StringIO()
+        for latitude, longitude, geohash in zip(latitudes.tolist(), longitudes.tolist(), geohashes):
+            buffer.write(f"{PRODUCT}\tCREATED\t2030-01-01\t{latitude!r}\t{longitude!r}\t{geohash}\tnow\tnow\tf\t{{}}\n")
+        buffer.seek(0)
+        cursor.copy_expert(
+            "COPY deliveries (product_name, status, delivery_date, latitude, longitude, geohash,"
+            " created_at, updated_at, is_deleted, extras) FROM STDIN",
+            buffer,
+        )
+    # Steady state: autovacuum keeps the visibility map current, allowing index-only scans
+    cursor.execute("VACUUM ANALYZE deliveries")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000, help='deliveries with coordinates to seed')
+    parser.add_argument('--span', type=float, default=2.0, help='side of the seeded square in degrees (2.0 is about 220 km)')
+    parser.add_argument('--radius', type=float, default=2.0, help='search radius in km')
+    parser.add_argument('--limit', type=int, default=100, help='results per search')
+    parser.add_argument('--queries', type=int, default=200, help='searches timed')
+    parser.add_argument('--sql-sample', type=int, default=5, help='searches timed for the full-table SQL baseline')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection
+
+    from delivery.models import Delivery
+    from delivery.services.geo import within_radius
+
+    min_lat, min_lon, max_lat, max_lon = area(args.span)
+    random.seed(7)
+    centres = [(random.uniform(min_lat, max_lat), random.uniform(min_lon, max_lon)) for _ in range(args.queries)]
+    queryset = Delivery.objects.filter(status='CREATED')
+    try:
+        with connection.cursor() as cursor:
+            started = time.perf_counter()
+            seed(cursor, args.rows, args.span)
+            print(f"Seeded {args.rows:,} rows in {time.perf_counter() - started:.1f} s")
+
+        samples = []
+        found = 0
+        for latitude, longitude in centres:
+            started = time.perf_counter()
+            found += len(within_radius(queryset, latitude, longitude, args.radius, args.limit))
+            samples.append(time.perf_counter() - started)
+
+        sql_samples = []
+        with connection.cursor() as cursor:
+            for latitude, longitude in centres[:args.sql_sample]:
+                started = time.perf_counter()
+                cursor.execute(SQL_HAVERSINE, {'lat': latitude, 'lon': longitude, 'radius': args.radius})
+                cursor.fetchall()
+                sql_samples.append(time.perf_counter() - started)
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM deliveries WHERE product_name = %s", [PRODUCT])
+
+    print(f"Mean results per search: {found / len(centres):.1f} (limit {args.limit})")
+    report(f"geohash + numpy, radius {args.radius} km", samples)
+    report("full-table haversine in SQL", sql_samples)
+
+
+if __name__ == '__main__':
+    main()
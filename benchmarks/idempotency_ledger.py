@@ -0,0 +1,143 @@
+"""
+INSERT latency of a delivery with idempotency keys on the deliveries table (before)
+versus keys in the separate idempotency ledger (after), with N historical keys.
+
+    python -m benchmarks.idempotency_ledger --rows 50000000 --inserts 2000
+
+Uses scratch `bench_*` tables that are dropped at the end.
+"""
+import argparse
+import time
+import uuid
+
+from benchmarks import report, setup_django
+
+BEFORE_DDL = """
+    CREATE TABLE bench_deliveries_before (
+        id bigserial PRIMARY KEY,
+        idempotency_key varchar(255) UNIQUE,
+        product_name varchar(255),
+        status varchar(20) NOT NULL,
+        delivery_date date NOT NULL,
+        created_by_id bigint,
+        created_at timestamptz NOT NULL,
+        UNIQUE (idempotency_key, delivery_date, created_by_id)
+    )
+"""
+
+AFTER_DDL = [
+    """
+    CREATE TABLE bench_deliveries_after (
+        id bigserial PRIMARY KEY,
+        product_name varchar(255),
+        status varchar(20) NOT NULL,
+        delivery_date date NOT NULL,
+        created_by_id bigint,
+        created_at timestamptz NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE bench_idempotency_keys (
+        id bigserial PRIMARY KEY,
+        user_id bigint NOT NULL,
+        key varchar(64) NOT NULL,
+        created_at timestamptz NOT NULL,
+        UNIQUE (user_id, key)
+    )
+    """,
+    "CREATE INDEX ON bench_idempotency_keys USING brin (created_at)",
+]
+
+SEED_BEFORE = """
+    INSERT INTO bench_deliveries_before (idempotency_key, product_name, status, delivery_date, created_by_id, created_at)
+    SELECT encode(sha256(i::text::bytea), 'hex'), 'product', 'COMPLETED', date '2020-01-01' + (i %% 2000), i %% 500, now()
+    FROM generate_series(1, %s) AS i
+"""
+
+SEED_AFTER = [
+    """
+    INSERT INTO bench_deliveries_after (product_name, status, delivery_date, created_by_id, created_at)
+    SELECT 'product', 'COMPLETED', date '2020-01-01' + (i %% 2000), i %% 500, now()
+    FROM generate_series(1, %s) AS i
+    """,
+    """
+    INSERT INTO bench_idempotency_keys (user_id, key, created_at)
+    SELECT i %% 500, encode(sha256(i::text::bytea), 'hex'), now() - (i || ' seconds')::interval
+    FROM generate_series(1, %s) AS i
+    """,
+]
+
+
+def timed_inserts(connection, count, statements):
+    samples = []
+    with connection.cursor() as cursor:
+        for _ in range(count):
+            key = uuid.uuid4().hex + uuid.uuid4().hex
+            started = time.perf_counter()
+            cursor.execute("BEGIN")
+            for sql in statements:
+                cursor.execute(sql, {'key': key})
+            cursor.execute("COMMIT")
+            samples.append(time.perf_counter() - started)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000, help='historical keys to seed')
+    parser.add_argument('--inserts', type=int, default=2000, help='timed single-row insert transactions')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection
+
+    connection.set_autocommit(True)
+    with connection.cursor() as cursor:
+        cursor.execute("DROP TABLE IF EXISTS bench_deliveries_before, bench_deliveries_after, bench_idempotency_keys")
+        print(f"Seeding {args.rows:,} historical keys...")
+        cursor.execute(BEFORE_DDL)
+        cursor.execute(SEED_BEFORE, [args.rows])
+        for sql in AFTER_DDL:
+            cursor.execute(sql)
+        for sql in SEED_AFTER:
+            cursor.execute(sql, [args.rows])
+        cursor.execute("VACUUM ANALYZE bench_deliveries_before")
+        cursor.execute("VACUUM ANALYZE bench_deliveries_after")
+        cursor.execute("VACUUM ANALYZE bench_idempotency_keys")
+
+    try:
+        before = timed_inserts(connection, args.inserts, [
+            "SELECT 1 FROM bench_deliveries_before WHERE idempotency_key = %(key)s",
+            """
+            INSERT INTO bench_deliveries_before (idempotency_key, product_name, status, delivery_date, created_by_id, created_at)
+            VALUES (%(key)s, 'product', 'CREATED', current_date, 1, now())
+            """,
+        ])
+        after = timed_inserts(connection, args.inserts, [
+            """
+            INSERT INTO bench_idempotency_keys (user_id, key, created_at) VALUES (1, %(key)s, now())
+            ON CONFLICT (user_id, key) DO NOTHING RETURNING key
+            """,
+            """
+            INSERT INTO bench_deliveries_after (product_name, status, delivery_date, created_by_id, created_at)
+            VALUES ('product', 'CREATED', current_date, 1, now())
+            """,
+        ])
+        deliveries_only = timed_inserts(connection, args.inserts, [
+            """
+            INSERT INTO bench_deliveries_after (product_name, status, delivery_date, created_by_id, created_at)
+            VALUES ('product', 'CREATED', current_date, 1, now())
+            """,
+        ])
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TABLE IF EXISTS bench_deliveries_before, bench_deliveries_after, bench_idempotency_keys")
+
+    print(f"\n{args.inserts:,} insert transactions with {args.rows:,} historical keys")
+    report("before: keys on deliveries", before)
+    report("after: ledger claim + delivery insert", after)  # Bloom filter miss skips the SELECT
+    report("after: deliveries insert alone", deliveries_only)
+
+
+if __name__ == '__main__':
+    main()
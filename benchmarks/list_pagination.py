@@ -0,0 +1,90 @@
+"""
+Page latency of a partner's delivery list (`ListDeliveries`) by page depth, page
+number pagination (`CustomPagination`: COUNT + OFFSET) against cursor pagination
+(`KeysetPagination`), on one partner owning most of a large table.
+
+    python -m benchmarks.list_pagination --rows 10000000 --pages 1 100 10000 200000
+
+Inserts `bench-list` deliveries for a `bench-list@example.com` partner with COPY and
+deletes both at the end, so only run it against a disposable database.
+"""
+import argparse
+import base64
+import io
+import time
+from datetime import date, datetime, timedelta, timezone
+from urllib import parse
+
+from benchmarks import report, setup_django
+
+PRODUCT = 'bench-list'
+EMAIL = 'bench-list@example.com'
+
+
+def seed(cursor, partner_id, rows, chunk=500_000):
+    """`rows` deliveries of the partner created a second apart, plus some of other partners in between."""
+    newest = datetime.now(timezone.utc)
+    day = date.today()
+    for start in range(0, rows, chunk):
+        buffer = io.StringIO()
+        for index in range(start, min(start + chunk, rows)):
+            owner = partner_id if index % 10 else '\\N'
+            buffer.write(f"{PRODUCT}\tCOMPLETED\t{day}\t{owner}\t{newest - timedelta(seconds=index)}\tnow\tf\t{{}}\n")
+        buffer.seek(0)
+        cursor.copy_expert("COPY deliveries (product_name, status, delivery_date, created_by_id, created_at, updated_at, is_deleted, extras) FROM STDIN", buffer)
+    cursor.execute("VACUUM ANALYZE deliveries")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000, help='deliveries to seed')
+    parser.add_argument('--per-page', type=int, default=20)
+    parser.add_argument('--pages', type=int, nargs='+', default=[1, 100, 10_000], help='page numbers timed')
+    parser.add_argument('--repeat', type=int, default=20, help='requests timed per page and paginator')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from delivery.models import Delivery
+    from delivery_auth.models import AuthUser
+    from utils.pagination import CustomPagination, KeysetPagination
+
+    factory = APIRequestFactory()
+    partner = AuthUser.objects.create_user(email=EMAIL, password='bench', role='partner')
+    with connection.cursor() as cursor:
+        seed(cursor, partner.id, args.rows)
+    try:
+        queryset = Delivery.objects.select_related('assigned_to', 'created_by').filter(created_by=partner).order_by('-created_at')
+
+        def timed(paginator_class, params):
+            samples = []
+            for _ in range(args.repeat):
+                request = Request(factory.get('/api/v1/delivery/list/', params, HTTP_HOST='localhost'))
+                started = time.perf_counter()
+                rows = list(paginator_class().paginate_queryset(queryset, request))
+                samples.append(time.perf_counter() - started)
+            return samples, rows
+
+        for page in args.pages:
+            # The cursor a client would hold after following `next` page - 1 times
+            cursor = ''
+            if page > 1:
+                created_at, pk = queryset.order_by('-created_at', '-id').values_list('created_at', 'id')[(page - 1) * args.per_page - 1]
+                cursor = base64.urlsafe_b64encode(parse.urlencode({'p': created_at.isoformat(), 'i': pk, 'r': 0}).encode()).decode()
+
+            offset_samples, offset_rows = timed(CustomPagination, {'page': page, 'per_page': args.per_page})
+            keyset_samples, keyset_rows = timed(KeysetPagination, {'cursor': cursor, 'per_page': args.per_page})
+            assert [row.id for row in offset_rows] == [row.id for row in keyset_rows]
+            report(f'page {page:,} offset', offset_samples)
+            report(f'page {page:,} keyset', keyset_samples)
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM deliveries WHERE product_name = %s", [PRODUCT])
+        partner.delete()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+CPU time and memory of one `ListDeliveries` page: reading and serializing model
+instances with both users joined (`DeliverySerializer`) against the projected
+dict rows of `DeliveryRowSerializer`.
+
+    python -m benchmarks.list_projection --rows 100000 --per-page 100
+
+CPU is the process time of this client, so database execution is left out; the
+peak is what tracemalloc sees allocated while the page is built. Inserts
+`bench-projection` deliveries for a `bench-projection@example.com` partner and
+an admin with COPY and deletes all of them at the end, so only run it against a
+disposable database.
+"""
+import argparse
+import io
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta, timezone
+
+from benchmarks import report, setup_django
+
+PRODUCT = 'bench-projection'
+EMAIL = 'bench-projection@example.com'
+ADMIN_EMAIL = 'bench-projection-admin@example.com'
+
+
+def seed(cursor, partner_id, admin_id, rows, chunk=200_000):
+    """`rows` assigned deliveries of the partner created a second apart, with addresses and coordinates."""
+    newest = datetime.now(timezone.utc)
+    day = date.today()
+    for start in range(0, rows, chunk):
+        buffer = io.StringIO()
+        for index in range(start, min(start + chunk, rows)):
+            created_at = newest - timedelta(seconds=index)
+            buffer.write(
+                f"{PRODUCT} {index}\tASSIGNED\t{day}\t{index % 500} Ward, Kathmandu\t{partner_id}\t{admin_id}\t"
+                f"{27.7 + index % 100 / 1000}\t{85.3 + index % 100 / 1000}\t{created_at}\t{created_at}\tf\t{{}}\n"
+            )
+        buffer.seek(0)
+        cursor.copy_expert(
+            "COPY deliveries (product_name, status, delivery_date, delivery_address, created_by_id, assigned_to_id, "
+            "latitude, longitude, created_at, updated_at, is_deleted, extras) FROM STDIN",
+            buffer,
+        )
+    cursor.execute("VACUUM ANALYZE deliveries")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100_000, help='deliveries to seed')
+    parser.add_argument('--per-page', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=200, help='pages built per serializer')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection
+
+    from delivery.models import Delivery
+    from delivery.serializers.delivery import DeliverySerializer
+    from delivery.serializers.delivery_row import DeliveryRowSerializer
+    from delivery.services.search import SEARCH_FIELDS
+    from delivery_auth.models import AuthUser
+
+    partner = AuthUser.objects.create_user(email=EMAIL, password='bench', role='partner', first_name='Bench', last_name='Partner')
+    admin = AuthUser.objects.create_user(email=ADMIN_EMAIL, password='bench', role='admin', first_name='Bench', last_name='Admin')
+    with connection.cursor() as cursor:
+        seed(cursor, partner.id, admin.id, args.rows)
+    try:
+        queryset = Delivery.objects.filter(created_by=partner).order_by('-created_at')
+        pages = max(1, args.rows // args.per_page)
+
+        def instances(offset):
+            page = queryset.select_related('assigned_to', 'created_by').defer(*SEARCH_FIELDS)[offset:offset + args.per_page]
+            return DeliverySerializer(page, many=True).data
+
+        def projected(offset):
+            page = DeliveryRowSerializer.project(queryset)[offset:offset + args.per_page]
+            return DeliveryRowSerializer(page).data
+
+        def timed(build):
+            cpu, wall = [], []
+            for index in range(args.repeat):
+                offset = index % pages * args.per_page
+                started, started_cpu = time.perf_counter(), time.process_time()
+                build(offset)
+                cpu.append(time.process_time() - started_cpu)
+                wall.append(time.perf_counter() - started)
+            return cpu, wall
+
+        def peak(build):
+            tracemalloc.start()
+            build(0)
+            peak_bytes = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return peak_bytes
+
+        assert instances(0) == projected(0)
+        for label, build in [('instances', instances), ('projected', projected)]:
+            cpu, wall = timed(build)
+            report(f'{args.per_page}-row page {label} cpu', cpu)
+            report(f'{args.per_page}-row page {label} wall', wall)
+            print(f"{args.per_page}-row page {label} peak memory {peak(build) / 1024:,.0f} KiB")
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM deliveries WHERE created_by_id = %s", [partner.id])
+        partner.delete()
+        admin.delete()
+
+
+if __name__ == '__main__':
+    main()
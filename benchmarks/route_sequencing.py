@@ -0,0 +1,57 @@
+"""
+Time to sequence an admin's daily stops (distance matrix, nearest neighbour
+and 2-opt, see `delivery.services.routing`) and the route length it saves
+over visiting the stops in the order they were requested.
+
+    python -m benchmarks.route_sequencing --stops 300 --runs 20
+
+Pure CPU, no database or Redis needed.
+"""
+import argparse
+import time
+
+from benchmarks import report, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--stops', type=int, default=300, help='deliveries in the route')
+    parser.add_argument('--runs', type=int, default=20, help='random routes timed')
+    parser.add_argument('--span', type=float, default=0.3, help='side of the square the stops are scattered over, in degrees')
+    parser.add_argument('--budget-ms', type=int, default=None, help='2-opt time budget (DELIVERY_ROUTE_TIME_BUDGET_MS by default)')
+    args = parser.parse_args()
+
+    setup_django()
+    import numpy as np
+    from django.conf import settings
+
+    from delivery.services.routing import distance_matrix, sequence_stops
+
+    budget_ms = args.budget_ms or settings.DELIVERY_ROUTE_TIME_BUDGET_MS
+    rng = np.random.default_rng(11)
+    samples = []
+    savings = []
+    two_opt_gains = []
+    for _ in range(args.runs):
+        latitudes = 27.7 + rng.uniform(0, args.span, args.stops)
+        longitudes = 85.3 + rng.uniform(0, args.span, args.stops)
+        started = time.perf_counter()
+        _, distance_km = sequence_stops(latitudes, longitudes, start=(27.7, 85.3), time_budget=budget_ms / 1000)
+        samples.append(time.perf_counter() - started)
+
+        # A zero budget stops after the nearest neighbour construction
+        _, greedy_km = sequence_stops(latitudes, longitudes, start=(27.7, 85.3), time_budget=0)
+        two_opt_gains.append(1 - distance_km / greedy_km)
+
+        matrix = distance_matrix(np.append(27.7, latitudes), np.append(85.3, longitudes))
+        requested_km = matrix[np.arange(args.stops), np.arange(1, args.stops + 1)].sum()
+        savings.append(1 - distance_km / requested_km)
+
+    print(f"{args.stops} stops, 2-opt budget {budget_ms} ms")
+    print(f"Route length vs. requested order: {np.mean(savings):.1%} shorter on average")
+    print(f"Route length vs. nearest neighbour alone: {np.mean(two_opt_gains):.1%} shorter on average")
+    report(f"sequence {args.stops} stops", samples)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Cost of the stale delivery sweep (`delivery.services.sweeper`): how long each
+chunk's UPDATE holds its row locks, and overall throughput, on a large table
+where most deliveries are already terminal.
+
+    python -m benchmarks.stale_sweep --rows 10000000 --stale 200000 --chunk 2000
+
+Inserts `bench-sweep` deliveries into the real table with COPY and deletes them
+at the end, so only run it against a disposable database.
+"""
+import argparse
+import io
+import time
+from datetime import date, timedelta
+
+from benchmarks import report, setup_django
+
+PRODUCT = 'bench-sweep'
+
+
+def seed(cursor, rows, stale, chunk=500_000):
+    """`rows` deliveries: `stale` overdue IN_TRANSIT/ASSIGNED, a few current active ones, the rest COMPLETED."""
+    today = date.today()
+    step = rows // stale
+    for start in range(0, rows, chunk):
+        buffer = io.StringIO()
+        for index in range(start, min(start + chunk, rows)):
+            if index % step == 0:
+                status, day = ('IN_TRANSIT' if index // step % 2 else 'ASSIGNED'), today - timedelta(days=2 + index % 60)
+            elif index % 50 == 0:
+                status, day = 'ASSIGNED', today + timedelta(days=index % 7)
+            else:
+                status, day = 'COMPLETED', today - timedelta(days=index % 700)
+            buffer.write(f"{PRODUCT}\t{status}\t{day}\tnow\tnow\tf\t{{}}\n")
+        buffer.seek(0)
+        cursor.copy_expert("COPY deliveries (product_name, status, delivery_date, created_at, updated_at, is_deleted, extras) FROM STDIN", buffer)
+    cursor.execute("VACUUM ANALYZE deliveries")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=2_000_000, help='deliveries to seed')
+    parser.add_argument('--stale', type=int, default=50_000, help='of which overdue and still active')
+    parser.add_argument('--chunk', type=int, default=2000, help='rows per UPDATE')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.db import connection
+
+    from delivery.services import sweeper
+
+    settings.DELIVERY_SWEEP_PAUSE_MS = 0
+    with connection.cursor() as cursor:
+        seed(cursor, args.rows, args.stale)
+    try:
+        today = date.today()
+        cutoff = today - timedelta(days=settings.DELIVERY_STALE_GRACE_DAYS)
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN {sweeper.CANDIDATES_SQL.format(condition='')}", [sweeper.FAILED_STATUSES, cutoff, 0, args.chunk])
+            print('\n'.join(row[0] for row in cursor.fetchall()))
+
+        samples = {'fail': [], 'flag': []}
+
+        def timed(kind, function):
+            def step(*step_args):
+                started = time.perf_counter()
+                result = function(*step_args)
+                samples[kind].append(time.perf_counter() - started)
+                return result
+            return step
+
+        sweeper.fail_overdue_deliveries = timed('fail', sweeper.fail_overdue_deliveries)
+        sweeper.flag_overdue_deliveries = timed('flag', sweeper.flag_overdue_deliveries)
+        started = time.perf_counter()
+        failed, flagged = sweeper.sweep_stale(today=today, chunk_size=args.chunk)
+        elapsed = time.perf_counter() - started
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM delivery_status_events WHERE delivery_id IN (SELECT id FROM deliveries WHERE product_name = %s)", [PRODUCT])
+            cursor.execute("DELETE FROM deliveries WHERE product_name = %s", [PRODUCT])
+
+    print(f"{args.rows:,} deliveries: failed {failed:,} and flagged {flagged:,} in {elapsed:.2f} s ({(failed + flagged) / elapsed:,.0f} rows/s)")
+    report(f'fail chunk of {args.chunk} (lock held)', samples['fail'])
+    report(f'flag chunk of {args.chunk} (lock held)', samples['flag'])
+
+
+if __name__ == '__main__':
+    main()
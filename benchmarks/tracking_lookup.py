@@ -0,0 +1,65 @@
+"""
+Throughput of the public tracking endpoint (`api/v1/delivery/track/<code>/`) through
+the full Django/DRF stack in one process, with the tracking cache warm.
+
+    python -m benchmarks.tracking_lookup --deliveries 1000 --lookups 50000
+
+Uses the configured cache (Redis in production settings). Creates `bench-tracking`
+deliveries in the real table and deletes them at the end, so only run it against
+a disposable database.
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from benchmarks import report, setup_django
+
+PRODUCT = 'bench-tracking'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--deliveries', type=int, default=1000, help='deliveries to track')
+    parser.add_argument('--lookups', type=int, default=50_000, help='requests timed')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext, setup_test_environment
+
+    from delivery.models import Delivery
+
+    setup_test_environment()
+    Delivery.objects.bulk_create(
+        [Delivery(product_name=PRODUCT, delivery_date=date.today() + timedelta(days=i % 30)) for i in range(args.deliveries)],
+        batch_size=5000,
+    )
+    try:
+        codes = list(Delivery.objects.filter(product_name=PRODUCT).values_list('tracking_code', flat=True))
+        client = Client()
+        for code in codes:
+            client.get(f'/api/v1/delivery/track/{code}/')
+
+        rng = random.Random(5)
+        paths = [f'/api/v1/delivery/track/{rng.choice(codes)}/' for _ in range(args.lookups)]
+        samples = []
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            for path in paths:
+                request_started = time.perf_counter()
+                response = client.get(path)
+                samples.append(time.perf_counter() - request_started)
+                assert response.status_code == 200
+            elapsed = time.perf_counter() - started
+    finally:
+        Delivery.objects.filter(product_name=PRODUCT).delete()
+
+    print(f"{args.lookups:,} lookups over {len(codes):,} deliveries, {len(queries)} database queries")
+    print(f"{args.lookups / elapsed:,.0f} requests/sec in one process")
+    report('tracking lookup (warm cache)', samples)
+
+
+if __name__ == '__main__':
+    main()
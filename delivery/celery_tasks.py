@@ -0,0 +1,89 @@
+from celery import shared_task
+from django.conf import settings
+
+from delivery.services.dispatch import dispatch_deliveries
+from delivery.services.history import add_partitions
+from delivery.services.hooks import run_hooks
+from delivery.services.idempotency import purge_expired_keys
+from delivery.services.ingestion import drain_stream
+from delivery.services.schedules import expand_schedules
+from delivery.services.sweeper import sweep_stale
+from delivery.services.workload import rebuild_workload, reconcile_workloads
+
+
+@shared_task
+def purge_idempotency_keys():
+    """Delete idempotency ledger rows older than IDEMPOTENCY_LEDGER_TTL_DAYS."""
+    purged = purge_expired_keys()
+    return f"Purged {purged} idempotency keys"
+
+
+@shared_task
+def drain_delivery_ingest_stream():
+    """Write deliveries queued by `request/?mode=async` in group commits."""
+    written = drain_stream()
+    return f"Wrote {written} queued delivery requests"
+
+
+@shared_task
+def expand_delivery_schedules():
+    """Create the deliveries of recurring schedules up to DELIVERY_SCHEDULE_HORIZON_DAYS ahead."""
+    created = expand_schedules()
+    return f"Created {created} scheduled deliveries"
+
+
+@shared_task
+def dispatch_new_deliveries(delivery_ids):
+    """Assign freshly created deliveries to the least-loaded admins (DELIVERY_AUTO_DISPATCH=on_create)."""
+    assigned = dispatch_deliveries(delivery_ids=delivery_ids)
+    return f"Dispatched {assigned} new deliveries"
+
+
+@shared_task
+def dispatch_created_deliveries():
+    """Assign waiting CREATED deliveries in batches; also catches anything `on_create` missed."""
+    if settings.DELIVERY_AUTO_DISPATCH == 'off':
+        return "Auto dispatch is off"
+    assigned = 0
+    while True:
+        batch = dispatch_deliveries()
+        assigned += batch
+        if batch < settings.DELIVERY_DISPATCH_BATCH_SIZE:
+            return f"Dispatched {assigned} deliveries"
+
+
+@shared_task
+def rebuild_dispatch_workload():
+    """Recount the admin workload heap used by auto dispatch."""
+    if settings.DELIVERY_AUTO_DISPATCH == 'off':
+        return "Auto dispatch is off"
+    admins = rebuild_workload()
+    return f"Rebuilt workload of {admins} admins"
+
+
+@shared_task
+def reconcile_admin_workloads():
+    """Repair drifted AdminWorkload counters by recounting deliveries, a chunk of admins at a time."""
+    repaired = reconcile_workloads()
+    return f"Repaired workload counters of {repaired} admins"
+
+
+@shared_task
+def add_status_event_partitions():
+    """Create the monthly delivery_status_events partitions for the next DELIVERY_STATUS_EVENT_PARTITIONS_AHEAD months."""
+    created = add_partitions()
+    return f"Created {created} status event partitions"
+
+
+@shared_task
+def run_transition_hooks(events):
+    """Run the side effects registered for committed delivery transitions, see delivery.services.hooks."""
+    calls = run_hooks(events)
+    return f"Ran {calls} hooks for {len(events)} transitions"
+
+
+@shared_task
+def sweep_stale_deliveries():
+    """Fail or flag ASSIGNED and IN_TRANSIT deliveries left behind after their delivery date."""
+    failed, flagged = sweep_stale()
+    return f"Failed {failed} and flagged {flagged} stale deliveries"
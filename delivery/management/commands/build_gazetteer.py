@@ -0,0 +1,52 @@
+import csv
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.gazetteer import normalize
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the sorted gazetteer file used to geocode delivery addresses offline. "
+        "The source is a CSV with `key` (an address or postcode), `latitude` and `longitude` columns. "
+        "The output is replaced atomically, so running workers keep their current mapping until restarted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('source', help="CSV file with a key,latitude,longitude header")
+        parser.add_argument('output', help="Gazetteer file to write, e.g. the DELIVERY_GAZETTEER_PATH")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        entries = {}
+        skipped = 0
+        try:
+            with open(options['source'], newline='', encoding='utf-8') as source:
+                for row in csv.DictReader(source):
+                    key = normalize(row.get('key') or '')
+                    try:
+                        latitude, longitude = float(row['latitude']), float(row['longitude'])
+                    except (KeyError, TypeError, ValueError):
+                        skipped += 1
+                        continue
+                    if not key or not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+                        skipped += 1
+                        continue
+                    # The first occurrence of a key wins
+                    entries.setdefault(key.encode(), (latitude, longitude))
+        except OSError as exc:
+            raise CommandError(f"Cannot read {options['source']}: {exc}")
+
+        # Lookups binary search raw bytes, so sort by the encoded key rather than by str
+        temporary_path = f"{options['output']}.tmp"
+        with open(temporary_path, 'wb') as output:
+            for key in sorted(entries):
+                latitude, longitude = entries[key]
+                output.write(b'%s\t%r\t%r\n' % (key, latitude, longitude))
+        os.replace(temporary_path, options['output'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {len(entries):,} entries to {options['output']} in {time.monotonic() - started:.1f}s; {skipped:,} rows skipped"
+        ))
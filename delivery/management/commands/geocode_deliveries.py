@@ -0,0 +1,61 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from delivery.models import Delivery
+from delivery.services.geocoding import get_gazetteer
+from utils.geohash import encode
+
+UPDATE_SQL = """
+    UPDATE deliveries AS d
+    SET latitude = c.latitude, longitude = c.longitude, geohash = c.geohash, updated_at = now()
+    FROM unnest(%s::bigint[], %s::double precision[], %s::double precision[], %s::varchar[])
+        AS c(id, latitude, longitude, geohash)
+    WHERE d.id = c.id AND d.latitude IS NULL
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill in coordinates for deliveries that have an address but no latitude/longitude, "
+        "using the gazetteer at DELIVERY_GAZETTEER_PATH. Deliveries are walked once in id order "
+        "and each chunk is written with a single UPDATE."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=5000, help="Deliveries looked up and updated per transaction")
+
+    def handle(self, *args, **options):
+        gazetteer = get_gazetteer()
+        if gazetteer is None:
+            raise CommandError("DELIVERY_GAZETTEER_PATH is not set or cannot be opened")
+
+        started = time.monotonic()
+        totals = {'read': 0, 'geocoded': 0}
+        last_id = 0
+        while True:
+            chunk = list(
+                Delivery.objects.filter(id__gt=last_id, latitude__isnull=True, delivery_address__isnull=False)
+                .order_by('id').values_list('id', 'delivery_address')[:options['chunk_size']]
+            )
+            if not chunk:
+                break
+            last_id = chunk[-1][0]
+
+            resolved = []
+            for delivery_id, address in chunk:
+                coordinates = gazetteer.lookup(address)
+                if coordinates:
+                    resolved.append((delivery_id, *coordinates, encode(*coordinates)))
+
+            if resolved:
+                with transaction.atomic(), connection.cursor() as cursor:
+                    cursor.execute(UPDATE_SQL, [list(column) for column in zip(*resolved)])
+                    totals['geocoded'] += cursor.rowcount
+            totals['read'] += len(chunk)
+            self.stdout.write(f"{totals['read']:,} deliveries read, {totals['geocoded']:,} geocoded")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Geocoded {totals['geocoded']:,} of {totals['read']:,} deliveries in {time.monotonic() - started:.1f}s"
+        ))
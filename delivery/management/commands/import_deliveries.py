@@ -0,0 +1,271 @@
+import csv
+import io
+import itertools
+import json
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from delivery.services.capacity import reserve_capacity
+from delivery.services.list_counts import count_created
+from delivery.services.workload import ACTIVE_STATUSES, record_transitions
+from delivery_auth.models import AuthUser
+from utils.enums import DeliveryStatus, UserRole
+from utils.idempotency_key import generate_idempotency_key
+
+STAGING_COLUMNS = [
+    'line', 'idempotency_key', 'product_name', 'status', 'delivery_date',
+    'delivery_address', 'assigned_to_id', 'created_by_id',
+]
+
+TEXT_FIELDS = ['status', 'product_name', 'delivery_address', 'idempotency_key']
+
+CREATE_STAGING_SQL = """
+    CREATE TEMP TABLE IF NOT EXISTS delivery_import_staging (
+        line bigint NOT NULL,
+        idempotency_key varchar(64) NOT NULL,
+        product_name varchar(255),
+        status varchar(20) NOT NULL,
+        delivery_date date NOT NULL,
+        delivery_address varchar(255),
+        assigned_to_id bigint,
+        created_by_id bigint NOT NULL
+    )
+"""
+
+# Claim every staged key in the idempotency ledger and return the first row of each key that was new
+CLAIM_SQL = """
+    WITH claimed AS (
+        INSERT INTO idempotency_keys (user_id, key, created_at)
+        SELECT DISTINCT created_by_id, idempotency_key, now()
+        FROM delivery_import_staging
+        ON CONFLICT (user_id, key) DO NOTHING
+        RETURNING user_id, key
+    )
+    SELECT * FROM (
+        SELECT DISTINCT ON (s.created_by_id, s.idempotency_key) s.line, s.delivery_date
+        FROM delivery_import_staging s
+        JOIN claimed c ON c.user_id = s.created_by_id AND c.key = s.idempotency_key
+        ORDER BY s.created_by_id, s.idempotency_key, s.line
+    ) AS new_rows
+    ORDER BY line
+"""
+
+# Deliveries imported past CREATED are logged as having moved there from CREATED
+INSERT_SQL = """
+    WITH inserted AS (
+        INSERT INTO deliveries (
+            product_name, status, delivery_date, delivery_address, assigned_to_id, created_by_id,
+            created_at, updated_at, is_deleted, extras
+        )
+        SELECT
+            s.product_name, s.status, s.delivery_date, s.delivery_address, s.assigned_to_id, s.created_by_id,
+            now(), now(), false, '{}'::jsonb
+        FROM delivery_import_staging s
+        WHERE s.line = ANY(%s)
+        ORDER BY s.line
+        RETURNING id, status, assigned_to_id, created_by_id
+    ),
+    logged AS (
+        INSERT INTO delivery_status_events (delivery_id, old_status, new_status, assigned_to_id, changed_by_id)
+        SELECT id, 'CREATED', status, assigned_to_id, NULL FROM inserted WHERE status <> 'CREATED'
+    )
+    SELECT created_by_id, assigned_to_id, status FROM inserted
+"""
+
+# Keys of rows left out for lack of capacity are given back, so a later import can retry them
+RELEASE_SQL = """
+    DELETE FROM idempotency_keys k
+    USING delivery_import_staging s
+    WHERE s.line = ANY(%s) AND k.user_id = s.created_by_id AND k.key = s.idempotency_key
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk import deliveries from a CSV or NDJSON file. "
+        "Rows are validated in chunks, loaded with COPY into a staging table and merged into "
+        "deliveries; rows whose idempotency key was already used are skipped, and rows for a "
+        "date without delivery capacity left are rejected."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV (with header) or NDJSON file")
+        parser.add_argument('--format', choices=['csv', 'ndjson'], help="Defaults to the file extension")
+        parser.add_argument('--chunk-size', type=int, default=10000, help="Rows validated and copied per transaction")
+        parser.add_argument('--max-errors', type=int, default=20, help="Invalid rows to print before staying quiet")
+
+    def handle(self, *args, **options):
+        file_format = options['format'] or ('ndjson' if options['path'].endswith(('.ndjson', '.jsonl')) else 'csv')
+        self.max_errors = options['max_errors']
+        self.error_count = 0
+
+        totals = {'read': 0, 'invalid': 0, 'full': 0, 'imported': 0}
+        started = time.monotonic()
+
+        try:
+            source = open(options['path'], newline='', encoding='utf-8')
+        except OSError as exc:
+            raise CommandError(f"Cannot open {options['path']}: {exc}")
+
+        with source:
+            rows = self.read_rows(source, file_format)
+            with connection.cursor() as cursor:
+                cursor.execute(CREATE_STAGING_SQL)
+
+            while True:
+                chunk = list(itertools.islice(rows, options['chunk_size']))
+                if not chunk:
+                    break
+                valid_rows = self.validate_chunk(chunk)
+                totals['read'] += len(chunk)
+                totals['invalid'] += len(chunk) - len(valid_rows)
+                imported, full = self.load_chunk(valid_rows)
+                totals['imported'] += imported
+                totals['full'] += full
+
+                elapsed = time.monotonic() - started
+                self.stdout.write(f"{totals['read']:,} rows read, {totals['imported']:,} imported ({totals['read'] / elapsed:,.0f} rows/sec)")
+
+        elapsed = time.monotonic() - started
+        skipped = totals['read'] - totals['invalid'] - totals['full'] - totals['imported']
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {totals['imported']:,} deliveries in {elapsed:.1f}s "
+            f"({totals['read'] / elapsed if elapsed else 0:,.0f} rows/sec); "
+            f"{totals['invalid']:,} invalid, {totals['full']:,} without capacity, {skipped:,} duplicates skipped"
+        ))
+
+    def read_rows(self, source, file_format):
+        """Yield (line number, row dict) without loading the file into memory."""
+        if file_format == 'csv':
+            reader = csv.DictReader(source)
+            for row in reader:
+                yield reader.line_num, row
+            return
+
+        for line_number, line in enumerate(source, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except ValueError:
+                yield line_number, None
+
+    def reject(self, line_number, message):
+        self.error_count += 1
+        if self.error_count <= self.max_errors:
+            self.stderr.write(f"line {line_number}: {message}")
+
+    def validate_chunk(self, chunk):
+        """Return the chunk's valid rows as staging tuples; users are checked with one query per chunk."""
+        user_ids = set()
+        for _, row in chunk:
+            if isinstance(row, dict):
+                user_ids.update(str(row.get(field) or '') for field in ('created_by', 'assigned_to'))
+        user_ids = {int(user_id) for user_id in user_ids if user_id.isdigit()}
+        roles = dict(AuthUser.objects.filter(id__in=user_ids, is_deleted=False).values_list('id', 'role'))
+
+        valid_statuses = {choice.value for choice in DeliveryStatus}
+        valid_rows = []
+        for line_number, row in chunk:
+            if not isinstance(row, dict):
+                self.reject(line_number, "not a JSON object")
+                continue
+
+            # NDJSON values may be of any JSON type; empty ones count as missing
+            text = {field: None if row.get(field) in (None, '') else row.get(field) for field in TEXT_FIELDS}
+            wrong_type = [field for field, value in text.items() if value is not None and not isinstance(value, str)]
+            if wrong_type:
+                self.reject(line_number, f"{', '.join(wrong_type)} must be a string")
+                continue
+
+            status = text['status'] or DeliveryStatus.CREATED.value
+            if status not in valid_statuses:
+                self.reject(line_number, f"invalid status {status!r}")
+                continue
+
+            try:
+                delivery_date = date.fromisoformat(str(row.get('delivery_date') or ''))
+            except ValueError:
+                self.reject(line_number, f"invalid delivery_date {row.get('delivery_date')!r}")
+                continue
+
+            created_by = str(row.get('created_by') or '')
+            if not created_by.isdigit() or roles.get(int(created_by)) != UserRole.partner.value:
+                self.reject(line_number, f"created_by {created_by!r} is not a partner user")
+                continue
+
+            assigned_to = str(row.get('assigned_to') or '')
+            if assigned_to and (not assigned_to.isdigit() or roles.get(int(assigned_to)) != UserRole.admin.value):
+                self.reject(line_number, f"assigned_to {assigned_to!r} is not an admin user")
+                continue
+
+            # Every status after CREATED is reached through ASSIGNED, which needs an admin
+            if status == DeliveryStatus.CREATED.value and assigned_to:
+                self.reject(line_number, "status CREATED cannot have assigned_to")
+                continue
+            if status != DeliveryStatus.CREATED.value and not assigned_to:
+                self.reject(line_number, f"status {status} requires assigned_to")
+                continue
+
+            product_name = text['product_name']
+            delivery_address = text['delivery_address']
+            if len(product_name or '') > 255 or len(delivery_address or '') > 255:
+                self.reject(line_number, "product_name and delivery_address must be at most 255 characters")
+                continue
+
+            idempotency_key = text['idempotency_key'] or generate_idempotency_key(
+                user_id=int(created_by),
+                payload={key: row.get(key) for key in ('product_name', 'status', 'delivery_date', 'delivery_address', 'assigned_to')},
+                prefix='import',
+            )
+            if len(idempotency_key) > 64:
+                self.reject(line_number, "idempotency_key must be at most 64 characters")
+                continue
+
+            valid_rows.append((
+                line_number, idempotency_key, product_name, status, delivery_date,
+                delivery_address, int(assigned_to) if assigned_to else None, int(created_by),
+            ))
+        return valid_rows
+
+    def load_chunk(self, valid_rows):
+        """
+        COPY the rows into the staging table and merge them into deliveries in one transaction.
+
+        New rows book delivery capacity in line order, grouped by date; those that
+        do not fit are rejected. Rows imported as ASSIGNED or IN_TRANSIT count in
+        their admin's workload. Returns `(imported, rejected for capacity)`.
+        """
+        if not valid_rows:
+            return 0, 0
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in valid_rows:
+            writer.writerow(['' if value is None else value for value in row])
+        buffer.seek(0)
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute("TRUNCATE delivery_import_staging")
+            cursor.cursor.copy_expert(
+                f"COPY delivery_import_staging ({', '.join(STAGING_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+            cursor.execute(CLAIM_SQL)
+            new_rows = cursor.fetchall()
+            # Imported rows carry no coordinates, so only the date's own capacity applies
+            admitted = reserve_capacity([(delivery_date, None) for _, delivery_date in new_rows])
+            full = [(line_number, delivery_date) for (line_number, delivery_date), is_admitted in zip(new_rows, admitted) if not is_admitted]
+            for line_number, delivery_date in full:
+                self.reject(line_number, f"no delivery capacity left for {delivery_date}")
+            if full:
+                cursor.execute(RELEASE_SQL, [[line_number for line_number, _ in full]])
+
+            cursor.execute(INSERT_SQL, [[line_number for (line_number, _), is_admitted in zip(new_rows, admitted) if is_admitted]])
+            rows = cursor.fetchall()
+            count_created([row[0] for row in rows], [row[1] for row in rows])
+            record_transitions([(assigned_to_id, None, status) for _, assigned_to_id, status in rows if status in ACTIVE_STATUSES])
+            return len(rows), len(full)
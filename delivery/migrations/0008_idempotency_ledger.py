@@ -0,0 +1,52 @@
+# Generated by Django 6.0.1 on 2026-10-17 09:12
+
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('delivery', '0007_delivery_delivery_address'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdempotencyKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='idempotency_keys', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'idempotency_keys',
+                'indexes': [django.contrib.postgres.indexes.BrinIndex(fields=['created_at'], name='idempotency_keys_created_brin')],
+                'unique_together': {('user', 'key')},
+            },
+        ),
+        # Carry the keys already stored on deliveries over to the ledger
+        migrations.RunSQL(
+            sql="""
+                INSERT INTO idempotency_keys (user_id, key, created_at)
+                SELECT DISTINCT ON (created_by_id, idempotency_key) created_by_id, idempotency_key, created_at
+                FROM deliveries
+                WHERE created_by_id IS NOT NULL
+                  AND idempotency_key IS NOT NULL
+                  AND length(idempotency_key) <= 64
+                ORDER BY created_by_id, idempotency_key, created_at
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AlterUniqueTogether(
+            name='delivery',
+            unique_together=set(),
+        ),
+        migrations.RemoveField(
+            model_name='delivery',
+            name='idempotency_key',
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-17 00:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('delivery', '0009_delivery_schedules'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='delivery',
+            name='version',
+            field=models.PositiveIntegerField(db_default=0, default=0),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 6.0.1 on 2026-10-17 00:42
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Built without blocking writes to the table
+    atomic = False
+
+    dependencies = [
+        ('delivery', '0010_delivery_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='delivery',
+            index=models.Index(condition=models.Q(('assigned_to__isnull', True), ('status', 'CREATED')), fields=['delivery_date', 'id'], name='deliveries_claimable_idx'),
+        ),
+    ]
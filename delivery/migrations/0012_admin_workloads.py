@@ -0,0 +1,50 @@
+# Generated by Django 6.0.1 on 2026-10-17 00:47
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('delivery', '0011_delivery_claimable_index'),
+        ('delivery_auth', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AdminWorkload',
+            fields=[
+                ('admin', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='workload', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('assigned_count', models.IntegerField(default=0)),
+                ('in_transit_count', models.IntegerField(default=0)),
+                ('completed_today', models.IntegerField(default=0)),
+                ('failed_today', models.IntegerField(default=0)),
+                ('counted_on', models.DateField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'admin_workloads',
+            },
+        ),
+        # Count the deliveries admins already hold
+        migrations.RunSQL(
+            sql="""
+                INSERT INTO admin_workloads (admin_id, assigned_count, in_transit_count, completed_today, failed_today, counted_on, updated_at)
+                SELECT
+                    u.id,
+                    count(d.id) FILTER (WHERE d.status = 'ASSIGNED'),
+                    count(d.id) FILTER (WHERE d.status = 'IN_TRANSIT'),
+                    count(d.id) FILTER (WHERE d.status = 'COMPLETED' AND d.updated_at >= current_date),
+                    count(d.id) FILTER (WHERE d.status = 'FAILED' AND d.updated_at >= current_date),
+                    current_date,
+                    now()
+                FROM auth_user AS u
+                LEFT JOIN deliveries AS d ON d.assigned_to_id = u.id
+                WHERE u.role = 'admin'
+                GROUP BY u.id
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
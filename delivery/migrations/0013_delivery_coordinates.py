@@ -0,0 +1,37 @@
+# Generated by Django 6.0.1 on 2026-10-17 00:56
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Built without blocking writes to the table
+    atomic = False
+
+    dependencies = [
+        ('delivery', '0012_admin_workloads'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='delivery',
+            name='geohash',
+            field=models.CharField(blank=True, max_length=12, null=True),
+        ),
+        migrations.AddField(
+            model_name='delivery',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='delivery',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        AddIndexConcurrently(
+            model_name='delivery',
+            index=models.Index(condition=models.Q(('geohash__isnull', False)), fields=['geohash'], include=('id', 'latitude', 'longitude', 'status'), name='deliveries_geohash_idx', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
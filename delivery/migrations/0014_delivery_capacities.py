@@ -0,0 +1,28 @@
+# Generated by Django 6.0.1 on 2026-10-17 01:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('delivery', '0013_delivery_coordinates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeliveryCapacity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('delivery_date', models.DateField()),
+                ('zone', models.CharField(blank=True, db_default='', default='', max_length=12)),
+                ('capacity', models.PositiveIntegerField()),
+                ('booked', models.PositiveIntegerField(db_default=0, default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'delivery_capacities',
+                'constraints': [models.UniqueConstraint(fields=('delivery_date', 'zone'), name='delivery_capacities_date_zone_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 6.0.1 on 2026-10-17 01:11
+
+import delivery.models
+from django.conf import settings
+from django.db import migrations, models
+
+BACKFILL_CHUNK = 10000
+TRACKING_CODE_SQL = delivery.models.RandomTrackingCode.template
+
+
+def backfill_tracking_codes(apps, schema_editor):
+    # Each chunk commits on its own, so only the rows of one chunk are locked at a time
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT coalesce(max(id), 0) FROM deliveries")
+        last_id = cursor.fetchone()[0]
+        for start in range(0, last_id + 1, BACKFILL_CHUNK):
+            cursor.execute(
+                f"UPDATE deliveries SET tracking_code = {TRACKING_CODE_SQL} WHERE id >= %s AND id < %s AND tracking_code IS NULL",
+                [start, start + BACKFILL_CHUNK],
+            )
+
+
+class Migration(migrations.Migration):
+    # A volatile column default would rewrite the whole table under an exclusive lock: the
+    # column is added empty, backfilled in chunks and indexed without blocking writes instead
+    atomic = False
+
+    dependencies = [
+        ('delivery', '0014_delivery_capacities'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddField(
+                    model_name='delivery',
+                    name='tracking_code',
+                    field=models.CharField(db_default=delivery.models.RandomTrackingCode(), editable=False, max_length=16),
+                ),
+                migrations.AddConstraint(
+                    model_name='delivery',
+                    constraint=models.UniqueConstraint(fields=('tracking_code',), name='deliveries_tracking_code_uniq'),
+                ),
+            ],
+            database_operations=[
+                # New rows get a code from here on, while existing ones are backfilled
+                migrations.RunSQL(
+                    sql=[
+                        "ALTER TABLE deliveries ADD COLUMN tracking_code varchar(16) NULL",
+                        f"ALTER TABLE deliveries ALTER COLUMN tracking_code SET DEFAULT {TRACKING_CODE_SQL}",
+                    ],
+                    reverse_sql="ALTER TABLE deliveries DROP COLUMN tracking_code",
+                ),
+                migrations.RunPython(backfill_tracking_codes, migrations.RunPython.noop),
+                migrations.RunSQL(
+                    sql="CREATE UNIQUE INDEX CONCURRENTLY deliveries_tracking_code_uniq ON deliveries (tracking_code)",
+                    reverse_sql="DROP INDEX CONCURRENTLY IF EXISTS deliveries_tracking_code_uniq",
+                ),
+                # A validated CHECK lets SET NOT NULL skip its full-table scan under the exclusive lock;
+                # each statement runs in its own transaction, so VALIDATE does not block writes
+                migrations.RunSQL(
+                    sql=[
+                        "ALTER TABLE deliveries ADD CONSTRAINT deliveries_tracking_code_not_null CHECK (tracking_code IS NOT NULL) NOT VALID",
+                        "ALTER TABLE deliveries VALIDATE CONSTRAINT deliveries_tracking_code_not_null",
+                        "ALTER TABLE deliveries ALTER COLUMN tracking_code SET NOT NULL",
+                        "ALTER TABLE deliveries DROP CONSTRAINT deliveries_tracking_code_not_null",
+                    ],
+                    reverse_sql="ALTER TABLE deliveries ALTER COLUMN tracking_code DROP NOT NULL",
+                ),
+                migrations.RunSQL(
+                    sql="ALTER TABLE deliveries ADD CONSTRAINT deliveries_tracking_code_uniq UNIQUE USING INDEX deliveries_tracking_code_uniq",
+                    reverse_sql="ALTER TABLE deliveries DROP CONSTRAINT deliveries_tracking_code_uniq",
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 6.0.1 on 2026-10-17 01:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('delivery', '0015_delivery_tracking_code'),
+    ]
+
+    operations = [
+        # Partitioned by month, see DeliveryStatusEvent. No foreign keys so inserts never lock deliveries rows;
+        # the default partition only catches rows when the beat task has fallen behind
+        migrations.RunSQL(
+            sql="""
+                CREATE TABLE delivery_status_events (
+                    id bigserial NOT NULL,
+                    delivery_id bigint NOT NULL,
+                    old_status varchar NOT NULL,
+                    new_status varchar NOT NULL,
+                    assigned_to_id bigint NULL,
+                    changed_by_id bigint NULL,
+                    created_at timestamp with time zone NOT NULL DEFAULT now()
+                ) PARTITION BY RANGE (created_at);
+                CREATE TABLE delivery_status_events_default PARTITION OF delivery_status_events DEFAULT;
+                CREATE INDEX delivery_status_events_created_brin ON delivery_status_events USING brin (created_at);
+                CREATE INDEX delivery_status_events_delivery_idx ON delivery_status_events (delivery_id, created_at);
+
+                CREATE FUNCTION delivery_status_events_add_partitions(months_ahead integer) RETURNS integer
+                LANGUAGE plpgsql AS $$
+                DECLARE
+                    month date := date_trunc('month', now())::date;
+                    partition text;
+                    created integer := 0;
+                BEGIN
+                    FOR i IN 0..months_ahead LOOP
+                        partition := 'delivery_status_events_' || to_char(month, 'YYYY_MM');
+                        IF to_regclass(partition) IS NULL THEN
+                            EXECUTE format(
+                                'CREATE TABLE %I PARTITION OF delivery_status_events FOR VALUES FROM (%L) TO (%L)',
+                                partition, month, (month + interval '1 month')::date
+                            );
+                            created := created + 1;
+                        END IF;
+                        month := (month + interval '1 month')::date;
+                    END LOOP;
+                    RETURN created;
+                END
+                $$;
+                SELECT delivery_status_events_add_partitions(2);
+            """,
+            reverse_sql="""
+                DROP FUNCTION delivery_status_events_add_partitions(integer);
+                DROP TABLE delivery_status_events;
+            """,
+        ),
+        migrations.CreateModel(
+            name='DeliveryStatusEvent',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('old_status', models.CharField(choices=[('CREATED', 'CREATED'), ('ASSIGNED', 'ASSIGNED'), ('IN_TRANSIT', 'IN_TRANSIT'), ('COMPLETED', 'COMPLETED'), ('FAILED', 'FAILED')])),
+                ('new_status', models.CharField(choices=[('CREATED', 'CREATED'), ('ASSIGNED', 'ASSIGNED'), ('IN_TRANSIT', 'IN_TRANSIT'), ('COMPLETED', 'COMPLETED'), ('FAILED', 'FAILED')])),
+                ('created_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'delivery_status_events',
+                'managed': False,
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 6.0.1 on 2026-10-17 01:20
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Built without blocking writes to the table
+    atomic = False
+
+    dependencies = [
+        ('delivery', '0016_delivery_status_events'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='delivery',
+            index=models.Index(condition=models.Q(('status__in', ['ASSIGNED', 'IN_TRANSIT'])), fields=['status', 'delivery_date'], name='deliveries_active_date_idx'),
+        ),
+    ]
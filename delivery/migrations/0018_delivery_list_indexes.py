@@ -0,0 +1,26 @@
+# Generated by Django 6.0.1 on 2026-10-17 01:29
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Built without blocking writes to the table
+    atomic = False
+
+    dependencies = [
+        ('delivery', '0017_delivery_active_date_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='delivery',
+            index=models.Index(fields=['created_by', '-created_at', '-id'], name='deliveries_created_by_list_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='delivery',
+            index=models.Index(fields=['assigned_to', '-created_at', '-id'], name='deliveries_assigned_list_idx'),
+        ),
+    ]
@@ -0,0 +1,95 @@
+# Generated by Django 6.0.1 on 2026-10-17 01:36
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations, models
+
+BACKFILL_CHUNK = 10000
+
+
+def backfill_search_documents(apps, schema_editor):
+    # Touching a column the trigger watches rebuilds the document; each chunk commits on its own
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT coalesce(max(id), 0) FROM deliveries")
+        last_id = cursor.fetchone()[0]
+        for start in range(0, last_id + 1, BACKFILL_CHUNK):
+            cursor.execute("UPDATE deliveries SET status = status WHERE id >= %s AND id < %s", [start, start + BACKFILL_CHUNK])
+
+
+class Migration(migrations.Migration):
+    # Backfilled in chunks and indexed without blocking writes to the table
+    atomic = False
+
+    dependencies = [
+        ('delivery', '0018_delivery_list_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='delivery',
+            name='search_text',
+            field=models.TextField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='delivery',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        # The document is rebuilt whenever one of its columns changes, and for every delivery
+        # of a partner or admin whose name changes
+        migrations.RunSQL(
+            sql="""
+                CREATE FUNCTION deliveries_search_document() RETURNS trigger LANGUAGE plpgsql AS $$
+                DECLARE
+                    names text;
+                BEGIN
+                    SELECT string_agg(concat_ws(' ', first_name, last_name), ' ') INTO names
+                    FROM auth_user WHERE id IN (NEW.created_by_id, NEW.assigned_to_id);
+                    NEW.search_text := lower(concat_ws(' ', NEW.product_name, NEW.delivery_address, NEW.status, NEW.delivery_date, names));
+                    NEW.search_vector :=
+                        setweight(to_tsvector('simple', coalesce(NEW.product_name, '')), 'A') ||
+                        setweight(to_tsvector('simple', coalesce(NEW.delivery_address, '')), 'B') ||
+                        setweight(to_tsvector('simple', concat_ws(' ', NEW.status, names)), 'C');
+                    RETURN NEW;
+                END
+                $$;
+
+                CREATE TRIGGER deliveries_search_document
+                    BEFORE INSERT OR UPDATE OF product_name, delivery_address, status, delivery_date, assigned_to_id, created_by_id
+                    ON deliveries
+                    FOR EACH ROW EXECUTE FUNCTION deliveries_search_document();
+
+                CREATE FUNCTION auth_user_delivery_search_names() RETURNS trigger LANGUAGE plpgsql AS $$
+                BEGIN
+                    UPDATE deliveries SET created_by_id = created_by_id WHERE created_by_id = NEW.id OR assigned_to_id = NEW.id;
+                    RETURN NULL;
+                END
+                $$;
+
+                CREATE TRIGGER auth_user_delivery_search_names
+                    AFTER UPDATE OF first_name, last_name ON auth_user
+                    FOR EACH ROW
+                    WHEN (OLD.first_name IS DISTINCT FROM NEW.first_name OR OLD.last_name IS DISTINCT FROM NEW.last_name)
+                    EXECUTE FUNCTION auth_user_delivery_search_names();
+            """,
+            reverse_sql="""
+                DROP TRIGGER auth_user_delivery_search_names ON auth_user;
+                DROP FUNCTION auth_user_delivery_search_names();
+                DROP TRIGGER deliveries_search_document ON deliveries;
+                DROP FUNCTION deliveries_search_document();
+            """,
+        ),
+        migrations.RunPython(backfill_search_documents, migrations.RunPython.noop),
+        AddIndexConcurrently(
+            model_name='delivery',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='deliveries_search_vector_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='delivery',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_text'], name='deliveries_search_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
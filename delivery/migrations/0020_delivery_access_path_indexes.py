@@ -0,0 +1,48 @@
+# Generated by Django 6.0.1 on 2026-10-17 01:41
+
+import django.db.models.deletion
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Built and dropped without blocking writes to the table
+    atomic = False
+
+    dependencies = [
+        ('delivery', '0019_delivery_search_document'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='delivery',
+            index=models.Index(condition=models.Q(('status__in', ['ASSIGNED', 'IN_TRANSIT'])), fields=['assigned_to', 'delivery_date'], name='deliveries_admin_active_idx'),
+        ),
+        # The single column foreign key indexes are prefixes of the list indexes from 0018
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='delivery',
+                    name='assigned_to',
+                    field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='assigned_deliveries', to=settings.AUTH_USER_MODEL),
+                ),
+                migrations.AlterField(
+                    model_name='delivery',
+                    name='created_by',
+                    field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='created_deliveries', to=settings.AUTH_USER_MODEL),
+                ),
+            ],
+            database_operations=[
+                migrations.RunSQL(
+                    sql="DROP INDEX CONCURRENTLY IF EXISTS deliveries_assigned_to_id_6fbf9328",
+                    reverse_sql="CREATE INDEX CONCURRENTLY IF NOT EXISTS deliveries_assigned_to_id_6fbf9328 ON deliveries (assigned_to_id)",
+                ),
+                migrations.RunSQL(
+                    sql="DROP INDEX CONCURRENTLY IF EXISTS deliveries_created_by_id_92ad640e",
+                    reverse_sql="CREATE INDEX CONCURRENTLY IF NOT EXISTS deliveries_created_by_id_92ad640e ON deliveries (created_by_id)",
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 6.0.1 on 2026-10-17 03:10
+
+from django.db import migrations
+
+# A month's partition cannot be created while the default partition holds rows of that
+# month, so they are moved out first: the default is detached, the partition created and
+# filled, the moved rows deleted and the default attached again. Inserts into the table
+# wait on the DETACH lock until the function's transaction commits.
+ADD_PARTITIONS_SQL = """
+    CREATE OR REPLACE FUNCTION delivery_status_events_add_partitions(months_ahead integer) RETURNS integer
+    LANGUAGE plpgsql AS $$
+    DECLARE
+        month date := date_trunc('month', now())::date;
+        next_month date;
+        partition text;
+        stranded boolean;
+        created integer := 0;
+    BEGIN
+        FOR i IN 0..months_ahead LOOP
+            partition := 'delivery_status_events_' || to_char(month, 'YYYY_MM');
+            next_month := (month + interval '1 month')::date;
+            IF to_regclass(partition) IS NULL THEN
+                SELECT EXISTS (
+                    SELECT 1 FROM delivery_status_events_default WHERE created_at >= month AND created_at < next_month
+                ) INTO stranded;
+                IF stranded THEN
+                    ALTER TABLE delivery_status_events DETACH PARTITION delivery_status_events_default;
+                END IF;
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF delivery_status_events FOR VALUES FROM (%L) TO (%L)',
+                    partition, month, next_month
+                );
+                IF stranded THEN
+                    EXECUTE format(
+                        'INSERT INTO %I (id, delivery_id, old_status, new_status, assigned_to_id, changed_by_id, created_at) '
+                        'SELECT id, delivery_id, old_status, new_status, assigned_to_id, changed_by_id, created_at '
+                        'FROM delivery_status_events_default WHERE created_at >= %L AND created_at < %L',
+                        partition, month, next_month
+                    );
+                    DELETE FROM delivery_status_events_default WHERE created_at >= month AND created_at < next_month;
+                    ALTER TABLE delivery_status_events ATTACH PARTITION delivery_status_events_default DEFAULT;
+                END IF;
+                created := created + 1;
+            END IF;
+            month := next_month;
+        END LOOP;
+        RETURN created;
+    END
+    $$;
+"""
+
+PREVIOUS_ADD_PARTITIONS_SQL = """
+    CREATE OR REPLACE FUNCTION delivery_status_events_add_partitions(months_ahead integer) RETURNS integer
+    LANGUAGE plpgsql AS $$
+    DECLARE
+        month date := date_trunc('month', now())::date;
+        partition text;
+        created integer := 0;
+    BEGIN
+        FOR i IN 0..months_ahead LOOP
+            partition := 'delivery_status_events_' || to_char(month, 'YYYY_MM');
+            IF to_regclass(partition) IS NULL THEN
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF delivery_status_events FOR VALUES FROM (%L) TO (%L)',
+                    partition, month, (month + interval '1 month')::date
+                );
+                created := created + 1;
+            END IF;
+            month := (month + interval '1 month')::date;
+        END LOOP;
+        RETURN created;
+    END
+    $$;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('delivery', '0020_delivery_access_path_indexes'),
+    ]
+
+    operations = [
+        migrations.RunSQL(sql=ADD_PARTITIONS_SQL, reverse_sql=PREVIOUS_ADD_PARTITIONS_SQL),
+    ]
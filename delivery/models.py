@@ -1,3 +1,5 @@
+from django.contrib.postgres.indexes import BrinIndex, GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from rest_framework.exceptions import ValidationError
 
@@ -5,18 +7,75 @@ from delivery_auth.models import BaseModel, AuthUser
 from utils.enums import DeliveryStatus
 
 
+class RandomTrackingCode(models.Func):
+    """16 upper-case hex characters (64 bits) drawn from Postgres' strong random generator."""
+    template = "upper(substr(md5(gen_random_uuid()::text), 1, 16))"
+    output_field = models.CharField()
+
+
 class Delivery(BaseModel):
-    idempotency_key = models.CharField(max_length=255, unique=True, null=True, blank=True)
     product_name = models.CharField(max_length=255, null=True, blank=True)
     status = models.CharField(choices=DeliveryStatus.choices(), default=DeliveryStatus.CREATED.value)
     delivery_date = models.DateField()
     delivery_address = models.CharField(max_length=255, null=True, blank=True)
-    assigned_to = models.ForeignKey(AuthUser, on_delete=models.CASCADE, related_name='assigned_deliveries', null=True, blank=True)
-    created_by = models.ForeignKey(AuthUser, on_delete=models.CASCADE, related_name='created_deliveries', null=True, blank=True)
+    # Looked up through the list indexes below, which lead with these columns
+    assigned_to = models.ForeignKey(AuthUser, on_delete=models.CASCADE, related_name='assigned_deliveries', null=True, blank=True, db_index=False)
+    created_by = models.ForeignKey(AuthUser, on_delete=models.CASCADE, related_name='created_deliveries', null=True, blank=True, db_index=False)
+    # Bumped by every status transition, see delivery.services.transitions
+    version = models.PositiveIntegerField(default=0, db_default=0)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    # Derived from latitude/longitude by DeliverySerializer, see utils.geohash
+    geohash = models.CharField(max_length=12, null=True, blank=True)
+    # Public, unguessable id for end customers; generated by the database so raw SQL inserts get one too
+    tracking_code = models.CharField(max_length=16, editable=False, db_default=RandomTrackingCode())
+    # Search document of the delivery and its partner/admin names, kept by the deliveries_search_document
+    # trigger; see delivery.services.search
+    search_text = models.TextField(null=True, blank=True, editable=False)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         db_table = "deliveries"
-        unique_together = [['idempotency_key', 'delivery_date', 'created_by'], ]
+        indexes = [
+            # Queue order for admins claiming work, see delivery.services.transitions.claim_deliveries
+            models.Index(
+                fields=['delivery_date', 'id'],
+                name='deliveries_claimable_idx',
+                condition=models.Q(status='CREATED', assigned_to__isnull=True),
+            ),
+            # Prefix (LIKE 'abc%') scans for nearby searches, see delivery.services.geo;
+            # the included columns let the candidate scan skip the table
+            models.Index(
+                fields=['geohash'],
+                name='deliveries_geohash_idx',
+                opclasses=['varchar_pattern_ops'],
+                include=['id', 'latitude', 'longitude', 'status'],
+                condition=models.Q(geohash__isnull=False),
+            ),
+            # List pages per partner/admin, newest first, see utils.pagination.KeysetPagination
+            models.Index(fields=['created_by', '-created_at', '-id'], name='deliveries_created_by_list_idx'),
+            models.Index(fields=['assigned_to', '-created_at', '-id'], name='deliveries_assigned_list_idx'),
+            # An admin's active deliveries for a day (delivery.services.routing) and workload recounts
+            models.Index(
+                fields=['assigned_to', 'delivery_date'],
+                name='deliveries_admin_active_idx',
+                condition=models.Q(status__in=['ASSIGNED', 'IN_TRANSIT']),
+            ),
+            # Word matches and ranking, and substring matches of the lower-cased text (pg_trgm)
+            GinIndex(fields=['search_vector'], name='deliveries_search_vector_idx'),
+            GinIndex(fields=['search_text'], name='deliveries_search_trgm_idx', opclasses=['gin_trgm_ops']),
+            # Active deliveries by date, e.g. overdue ones for delivery.services.sweeper;
+            # terminal rows, most of the table, are left out
+            models.Index(
+                fields=['status', 'delivery_date'],
+                name='deliveries_active_date_idx',
+                condition=models.Q(status__in=['ASSIGNED', 'IN_TRANSIT']),
+            ),
+        ]
+        # A constraint rather than unique=True, which would add an unused LIKE index
+        constraints = [
+            models.UniqueConstraint(fields=['tracking_code'], name='deliveries_tracking_code_uniq'),
+        ]
 
     VALID_TRANSITIONS = {
         DeliveryStatus.CREATED.value: [DeliveryStatus.ASSIGNED.value],
@@ -46,3 +105,124 @@ class Delivery(BaseModel):
 
     def __str__(self):
         return f"Delivery #{self.id} - {self.status}"
+
+
+class IdempotencyKey(models.Model):
+    """
+    Ledger of idempotency keys already used by each user.
+
+    Kept apart from `deliveries` so the hot table carries no key indexes.
+    Rows older than `IDEMPOTENCY_LEDGER_TTL_DAYS` are purged by a Celery beat task,
+    which walks the BRIN index on `created_at`.
+    """
+    user = models.ForeignKey(AuthUser, on_delete=models.CASCADE, related_name='idempotency_keys')
+    key = models.CharField(max_length=64)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "idempotency_keys"
+        unique_together = [['user', 'key'], ]
+        indexes = [BrinIndex(fields=['created_at'], name='idempotency_keys_created_brin')]
+
+    def __str__(self):
+        return f"{self.user_id}:{self.key}"
+
+
+class AdminWorkload(models.Model):
+    """
+    Denormalized count of an admin's deliveries per status, so workload reads never scan `deliveries`.
+
+    Updated in the same transaction as every transition (see
+    delivery.services.workload.record_transitions) and repaired by the
+    `reconcile_admin_workloads` beat task. `completed_today` and `failed_today`
+    belong to `counted_on` and read as 0 on any other day.
+    """
+    admin = models.OneToOneField(AuthUser, on_delete=models.CASCADE, primary_key=True, related_name='workload')
+    assigned_count = models.IntegerField(default=0)
+    in_transit_count = models.IntegerField(default=0)
+    completed_today = models.IntegerField(default=0)
+    failed_today = models.IntegerField(default=0)
+    counted_on = models.DateField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "admin_workloads"
+
+    def __str__(self):
+        return f"Workload of {self.admin_id}"
+
+
+class DeliveryCapacity(models.Model):
+    """
+    How many deliveries may be booked for a date, across all zones (`zone` = '')
+    or in one zone (a geohash prefix of DELIVERY_CAPACITY_ZONE_PRECISION characters).
+
+    `booked` is incremented in the same transaction that creates the deliveries,
+    see delivery.services.capacity. Dates and zones without a row are unlimited.
+    """
+    delivery_date = models.DateField()
+    zone = models.CharField(max_length=12, blank=True, default='', db_default='')
+    capacity = models.PositiveIntegerField()
+    booked = models.PositiveIntegerField(default=0, db_default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "delivery_capacities"
+        constraints = [
+            models.UniqueConstraint(fields=['delivery_date', 'zone'], name='delivery_capacities_date_zone_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.delivery_date} {self.zone or '*'}: {self.booked}/{self.capacity}"
+
+
+class DeliveryStatusEvent(models.Model):
+    """
+    Append-only log of delivery status transitions.
+
+    The table is created by migration 0016 with raw SQL: it is range partitioned by
+    month on `created_at` (partitions are added ahead by the
+    `add_status_event_partitions` beat task), BRIN indexed on `created_at` for
+    time range scans and btree indexed on `(delivery_id, created_at)` for timelines.
+    It has no foreign keys, so writing an event never locks a `deliveries` row;
+    rows are inserted by delivery.services.transitions in the transition statement.
+    """
+    id = models.BigAutoField(primary_key=True)
+    delivery = models.ForeignKey(Delivery, on_delete=models.DO_NOTHING, db_constraint=False, related_name='status_events')
+    old_status = models.CharField(choices=DeliveryStatus.choices())
+    new_status = models.CharField(choices=DeliveryStatus.choices())
+    assigned_to = models.ForeignKey(AuthUser, on_delete=models.DO_NOTHING, db_constraint=False, null=True, related_name='+')
+    changed_by = models.ForeignKey(AuthUser, on_delete=models.DO_NOTHING, db_constraint=False, null=True, related_name='+')
+    created_at = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = "delivery_status_events"
+
+    def __str__(self):
+        return f"Delivery #{self.delivery_id}: {self.old_status} -> {self.new_status}"
+
+
+class DeliverySchedule(BaseModel):
+    """
+    Recurring delivery a partner wants on given weekdays, every `interval_weeks` weeks.
+
+    The `expand_delivery_schedules` beat task turns schedules into `Delivery` rows
+    up to DELIVERY_SCHEDULE_HORIZON_DAYS ahead and records how far it got in
+    `expanded_until`, so each date is only expanded once.
+    """
+    partner = models.ForeignKey(AuthUser, on_delete=models.CASCADE, related_name='delivery_schedules')
+    product_name = models.CharField(max_length=255, null=True, blank=True)
+    delivery_address = models.CharField(max_length=255, null=True, blank=True)
+    weekdays = models.JSONField(default=list)  # 0 = Monday ... 6 = Sunday
+    interval_weeks = models.PositiveSmallIntegerField(default=1)
+    start_date = models.DateField()
+    end_date = models.DateField(null=True, blank=True)
+    expanded_until = models.DateField(null=True, blank=True)
+    is_active = models.BooleanField(default=True)
+
+    class Meta:
+        db_table = "delivery_schedules"
+
+    def __str__(self):
+        return f"Schedule #{self.id} - {self.partner_id}"
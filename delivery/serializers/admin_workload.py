@@ -0,0 +1,25 @@
+from django.utils import timezone
+from rest_framework import serializers
+
+from delivery.models import AdminWorkload
+
+
+class AdminWorkloadSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AdminWorkload
+        fields = [
+            'admin',
+            'assigned_count',
+            'in_transit_count',
+            'completed_today',
+            'failed_today',
+            'updated_at'
+        ]
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Daily counters are only reset by the next transition or reconciliation
+        if instance.counted_on != timezone.localdate():
+            data['completed_today'] = 0
+            data['failed_today'] = 0
+        return data
@@ -1,6 +1,8 @@
 from rest_framework import serializers
 
 from delivery.models import Delivery
+from delivery.services.geocoding import geocode_address
+from utils.geohash import encode
 
 
 class DeliverySerializer(serializers.ModelSerializer):
@@ -15,8 +17,17 @@ class DeliverySerializer(serializers.ModelSerializer):
             'assigned_to',
             'created_by',
             'created_at',
-            'updated_at'
+            'updated_at',
+            'version',
+            'latitude',
+            'longitude',
+            'tracking_code'
         ]
+        read_only_fields = ['version', 'tracking_code']
+        extra_kwargs = {
+            'latitude': {'min_value': -90, 'max_value': 90},
+            'longitude': {'min_value': -180, 'max_value': 180},
+        }
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
@@ -49,4 +60,18 @@ class DeliverySerializer(serializers.ModelSerializer):
             assigned_to = attrs.get('assigned_to') or (instance.assigned_to if instance else None)
             if not assigned_to:
                 raise serializers.ValidationError({'assigned_to': 'assigned_to is required when status is ASSIGNED'})
+
+        # Coordinates are optional but only make sense as a pair
+        if 'latitude' in attrs or 'longitude' in attrs:
+            latitude = attrs.get('latitude', instance.latitude if instance else None)
+            longitude = attrs.get('longitude', instance.longitude if instance else None)
+            if (latitude is None) != (longitude is None):
+                raise serializers.ValidationError({'latitude': 'latitude and longitude must be given together'})
+            attrs['geohash'] = encode(latitude, longitude) if latitude is not None else None
+        elif not instance and attrs.get('delivery_address'):
+            # New deliveries without coordinates are placed from the offline gazetteer when possible
+            coordinates = geocode_address(attrs['delivery_address'])
+            if coordinates:
+                attrs['latitude'], attrs['longitude'] = coordinates
+                attrs['geohash'] = encode(*coordinates)
         return attrs
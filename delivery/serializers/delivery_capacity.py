@@ -0,0 +1,30 @@
+from django.conf import settings
+from rest_framework import serializers
+
+from delivery.models import DeliveryCapacity
+from utils.geohash import BASE32
+
+
+class DeliveryCapacitySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DeliveryCapacity
+        fields = [
+            'id',
+            'delivery_date',
+            'zone',
+            'capacity',
+            'booked',
+            'updated_at'
+        ]
+        read_only_fields = ['booked']
+        # Posting an existing date and zone changes its capacity instead of failing
+        validators = []
+
+    def validate_zone(self, value):
+        """A zone is empty (the whole date) or a geohash prefix of DELIVERY_CAPACITY_ZONE_PRECISION characters."""
+        value = value.lower()
+        if value and (len(value) != settings.DELIVERY_CAPACITY_ZONE_PRECISION or any(char not in BASE32 for char in value)):
+            raise serializers.ValidationError(
+                f"zone must be empty or a geohash prefix of {settings.DELIVERY_CAPACITY_ZONE_PRECISION} characters"
+            )
+        return value
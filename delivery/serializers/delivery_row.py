@@ -0,0 +1,50 @@
+from django.db.models import Value
+from django.db.models.functions import Concat
+from rest_framework.fields import DateTimeField
+
+from delivery.serializers.delivery import DeliverySerializer
+
+
+class DeliveryRowSerializer:
+    """
+    Read-only counterpart of `DeliverySerializer` for delivery lists.
+
+    `project()` narrows a delivery queryset to the columns the list shows, as
+    dicts: the foreign keys come as their ids and `created_by_full_name` is
+    concatenated in SQL, so the partner row is joined for two names instead of
+    every user column. `data` then formats the dicts exactly as
+    `DeliverySerializer` would the model instances (with the default ISO 8601
+    date formats), without building them or a serializer field per row.
+    """
+    fields = DeliverySerializer.Meta.fields
+    datetime_field = DateTimeField()
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    @classmethod
+    def project(cls, queryset):
+        return queryset.values(
+            *cls.fields,
+            created_by_full_name=Concat('created_by__first_name', Value(' '), 'created_by__last_name'),
+        )
+
+    @staticmethod
+    def format_datetime(value, timezone):
+        if timezone is not None:
+            value = value.astimezone(timezone)
+        value = value.isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+
+    @property
+    def data(self):
+        # DateTimeField looks the current timezone up for every value; once per page is enough
+        timezone = self.datetime_field.default_timezone()
+        data = []
+        for row in self.rows:
+            row = dict(row)
+            row['delivery_date'] = row['delivery_date'].isoformat()
+            row['created_at'] = self.format_datetime(row['created_at'], timezone)
+            row['updated_at'] = self.format_datetime(row['updated_at'], timezone)
+            data.append(row)
+        return data
@@ -0,0 +1,42 @@
+from rest_framework import serializers
+
+from delivery.models import DeliverySchedule
+
+
+class DeliveryScheduleSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DeliverySchedule
+        fields = [
+            'id',
+            'product_name',
+            'delivery_address',
+            'weekdays',
+            'interval_weeks',
+            'start_date',
+            'end_date',
+            'expanded_until',
+            'is_active',
+            'created_at',
+            'updated_at'
+        ]
+        read_only_fields = ['expanded_until']
+
+    def validate_weekdays(self, value):
+        """Weekdays are a non-empty list of integers, 0 = Monday ... 6 = Sunday."""
+        if not isinstance(value, list) or not value:
+            raise serializers.ValidationError("weekdays must be a non-empty list")
+        if any(not isinstance(day, int) or isinstance(day, bool) or not 0 <= day <= 6 for day in value):
+            raise serializers.ValidationError("weekdays must contain integers from 0 (Monday) to 6 (Sunday)")
+        return sorted(set(value))
+
+    def validate_interval_weeks(self, value):
+        if value < 1:
+            raise serializers.ValidationError("interval_weeks must be at least 1")
+        return value
+
+    def validate(self, attrs):
+        start_date = attrs.get('start_date') or (self.instance.start_date if self.instance else None)
+        end_date = attrs.get('end_date')
+        if start_date and end_date and end_date < start_date:
+            raise serializers.ValidationError({'end_date': 'end_date cannot be before start_date'})
+        return attrs
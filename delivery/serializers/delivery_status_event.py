@@ -0,0 +1,15 @@
+from rest_framework import serializers
+
+from delivery.models import DeliveryStatusEvent
+
+
+class DeliveryStatusEventSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DeliveryStatusEvent
+        fields = [
+            'old_status',
+            'new_status',
+            'assigned_to',
+            'changed_by',
+            'created_at'
+        ]
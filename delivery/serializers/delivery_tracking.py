@@ -0,0 +1,17 @@
+from rest_framework import serializers
+
+from delivery.models import Delivery
+
+
+class DeliveryTrackingSerializer(serializers.ModelSerializer):
+    """What an end customer may see about a delivery: no names, addresses or ids."""
+
+    class Meta:
+        model = Delivery
+        fields = [
+            'tracking_code',
+            'status',
+            'delivery_date',
+            'created_at',
+            'updated_at'
+        ]
@@ -0,0 +1,108 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+
+from delivery.models import DeliveryCapacity
+
+ALL_ZONES = ''
+
+# Creating a limit for a date that already has deliveries starts it at what is booked so far
+UPSERT_CAPACITY_SQL = """
+    INSERT INTO delivery_capacities (delivery_date, zone, capacity, booked, updated_at)
+    SELECT %(delivery_date)s, %(zone)s, %(capacity)s, count(*), now()
+    FROM deliveries
+    WHERE delivery_date = %(delivery_date)s AND NOT is_deleted
+      AND (%(zone)s = '' OR geohash LIKE %(zone)s || '%%')
+    ON CONFLICT (delivery_date, zone) DO UPDATE SET capacity = EXCLUDED.capacity, updated_at = now()
+    RETURNING id
+"""
+
+BOOK_SQL = """
+    UPDATE delivery_capacities AS c
+    SET booked = c.booked + b.count, updated_at = now()
+    FROM unnest(%s::bigint[], %s::integer[]) AS b(id, count)
+    WHERE c.id = b.id
+"""
+
+
+def delivery_zone(geohash):
+    """Return the capacity zone of a delivery, or '' when it has no coordinates."""
+    return geohash[:settings.DELIVERY_CAPACITY_ZONE_PRECISION] if geohash else ALL_ZONES
+
+
+def _slot_keys(delivery_date, geohash):
+    zone = delivery_zone(geohash)
+    return [(delivery_date, ALL_ZONES), (delivery_date, zone)] if zone else [(delivery_date, ALL_ZONES)]
+
+
+def reserve_capacity(slots):
+    """
+    Book capacity for new deliveries and return, per slot, whether it was admitted.
+
+    `slots` is a list of `(delivery_date, geohash)`, one per delivery, admitted in
+    order. A delivery needs a free place on its date and, when it has coordinates,
+    in its zone; dates and zones without a capacity row are unlimited.
+
+    The capacity rows are locked and booked in the caller's transaction, which must
+    also create the admitted deliveries, so concurrent bookings of the same day
+    queue on the row instead of counting deliveries. Costs one SELECT when no
+    capacity is configured and one more UPDATE otherwise.
+    """
+    slots = [_slot_keys(delivery_date, geohash) for delivery_date, geohash in slots]
+    dates = {key[0] for keys in slots for key in keys}
+    zones = {key[1] for keys in slots for key in keys}
+    rows = list(
+        DeliveryCapacity.objects.select_for_update()
+        .filter(delivery_date__in=dates, zone__in=zones)
+        .order_by('id')
+        .values_list('id', 'delivery_date', 'zone', 'capacity', 'booked')
+    )
+    limits = {(delivery_date, zone): pk for pk, delivery_date, zone, _, _ in rows}
+    if not limits:
+        return [True] * len(slots)
+    remaining = {pk: capacity - booked for pk, _, _, capacity, booked in rows}
+
+    admitted = []
+    booked = Counter()
+    for keys in slots:
+        limited = [limits[key] for key in keys if key in limits]
+        if all(remaining[pk] > 0 for pk in limited):
+            for pk in limited:
+                remaining[pk] -= 1
+                booked[pk] += 1
+            admitted.append(True)
+        else:
+            admitted.append(False)
+
+    if booked:
+        with connection.cursor() as cursor:
+            cursor.execute(BOOK_SQL, [list(booked), list(booked.values())])
+    return admitted
+
+
+def set_capacity(delivery_date, capacity, zone=ALL_ZONES):
+    """Create or change the capacity of a date (or of one zone on that date) and return the row."""
+    with connection.cursor() as cursor:
+        cursor.execute(UPSERT_CAPACITY_SQL, {'delivery_date': delivery_date, 'zone': zone, 'capacity': capacity})
+        pk = cursor.fetchone()[0]
+    return DeliveryCapacity.objects.get(pk=pk)
+
+
+def available_dates(start, days, zone=ALL_ZONES):
+    """
+    Return `[(delivery_date, remaining)]` for the dates from `start` on which a delivery can be booked.
+
+    `remaining` is the smallest number of free places on the date and in `zone`,
+    or None when neither is limited. Reads only the capacity rows of the window.
+    """
+    end = start + timedelta(days=days - 1)
+    remaining = {}
+    rows = DeliveryCapacity.objects.filter(delivery_date__range=(start, end), zone__in={ALL_ZONES, zone}).values_list('delivery_date', 'capacity', 'booked')
+    for delivery_date, capacity, booked in rows:
+        left = max(capacity - booked, 0)
+        remaining[delivery_date] = min(left, remaining.get(delivery_date, left))
+
+    dates = (start + timedelta(days=offset) for offset in range(days))
+    return [(delivery_date, remaining.get(delivery_date)) for delivery_date in dates if remaining.get(delivery_date) != 0]
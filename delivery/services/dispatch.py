@@ -0,0 +1,60 @@
+from django.conf import settings
+from django.db import transaction
+
+from delivery.models import Delivery
+from delivery.services.transitions import bulk_assign_deliveries
+from delivery.services.workload import adjust_workload, pick_admins
+from utils.enums import DeliveryStatus
+
+
+def dispatch_deliveries(delivery_ids=None, limit=None):
+    """
+    Assign unassigned CREATED deliveries to the least-loaded eligible admins.
+
+    Takes up to `limit` deliveries (DELIVERY_DISPATCH_BATCH_SIZE by default) in
+    delivery date order, or only `delivery_ids` when given. Rows locked by a
+    concurrent dispatcher or claimer are skipped. Admins come from the Redis
+    workload heap, so each decision is O(log n) instead of a COUNT per admin,
+    and the whole batch is written with one UPDATE. Returns the number assigned.
+    """
+    limit = limit or settings.DELIVERY_DISPATCH_BATCH_SIZE
+    with transaction.atomic():
+        queryset = Delivery.objects.select_for_update(skip_locked=True).filter(
+            status=DeliveryStatus.CREATED.value, assigned_to__isnull=True, is_deleted=False
+        )
+        if delivery_ids is not None:
+            queryset = queryset.filter(id__in=delivery_ids)
+        ids = list(queryset.order_by('delivery_date', 'id').values_list('id', flat=True)[:limit])
+        if not ids:
+            return 0
+
+        admin_ids = pick_admins(len(ids))
+        if not admin_ids:
+            return 0
+        assignments = dict(zip(ids, admin_ids))
+
+        try:
+            assigned, _ = bulk_assign_deliveries(assignments, charge_heap=False)
+        except Exception:
+            adjust_workload(_count(assignments.values(), -1), on_commit=False)
+            raise
+        # The rows are locked, so this only happens if one was changed outside a transaction
+        adjust_workload(_count((admin_id for pk, admin_id in assignments.items() if pk not in assigned), -1), on_commit=False)
+    return len(assigned)
+
+
+def _count(admin_ids, delta):
+    counts = {}
+    for admin_id in admin_ids:
+        counts[admin_id] = counts.get(admin_id, 0) + delta
+    return counts
+
+
+def dispatch_on_commit(delivery_ids):
+    """In `on_create` mode, dispatch freshly created deliveries once their transaction commits."""
+    if settings.DELIVERY_AUTO_DISPATCH != 'on_create' or not delivery_ids:
+        return
+    from delivery.celery_tasks import dispatch_new_deliveries
+
+    delivery_ids = list(delivery_ids)
+    transaction.on_commit(lambda: dispatch_new_deliveries.delay(delivery_ids))
@@ -0,0 +1,66 @@
+import math
+
+import numpy as np
+from django.conf import settings
+
+from utils.geohash import cover
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def haversine_km(latitude, longitude, latitudes, longitudes):
+    """Great-circle distance in km from one point to arrays of points, vectorized."""
+    lat1 = np.radians(latitude)
+    lat2 = np.radians(latitudes)
+    dlat = lat2 - lat1
+    dlon = np.radians(longitudes) - np.radians(longitude)
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def radius_box(latitude, longitude, radius_km):
+    """Return the (min_lat, min_lon, max_lat, max_lon) box enclosing a circle."""
+    dlat = radius_km / KM_PER_DEGREE
+    # Near the poles the circle wraps every meridian
+    cos_lat = math.cos(math.radians(min(abs(latitude) + dlat, 90.0)))
+    dlon = radius_km / (KM_PER_DEGREE * cos_lat) if cos_lat > 1e-9 else 180.0
+    return latitude - dlat, longitude - min(dlon, 180.0), latitude + dlat, longitude + min(dlon, 180.0)
+
+
+def _in_cells(queryset, min_lat, min_lon, max_lat, max_lon):
+    """
+    Return `(id, latitude, longitude)` rows of `queryset` inside the bounding box.
+
+    Runs one geohash prefix range scan per covering cell, UNION ALL'd: an OR of
+    prefixes would be planned as a bitmap scan, which always visits the heap,
+    while each branch here can be answered from the index alone.
+    """
+    in_box = queryset.filter(latitude__range=(min_lat, max_lat), longitude__range=(min_lon, max_lon))
+    cells = [
+        in_box.filter(geohash__startswith=prefix).values_list('id', 'latitude', 'longitude')
+        for prefix in cover(min_lat, min_lon, max_lat, max_lon, max_cells=settings.DELIVERY_GEO_MAX_CELLS)
+    ]
+    return cells[0].union(*cells[1:], all=True)
+
+
+def within_radius(queryset, latitude, longitude, radius_km, limit):
+    """
+    Return up to `limit` `(delivery_id, distance_km)` pairs within `radius_km`, nearest first.
+
+    The geohash index prunes the table to the circle's bounding box; the exact
+    haversine test then runs on those candidates in numpy.
+    """
+    rows = list(_in_cells(queryset, *radius_box(latitude, longitude, radius_km)))
+    if not rows:
+        return []
+    ids, latitudes, longitudes = zip(*rows)
+    distances = haversine_km(latitude, longitude, np.array(latitudes), np.array(longitudes))
+    inside = np.flatnonzero(distances <= radius_km)
+    nearest = inside[np.argsort(distances[inside], kind='stable')[:limit]]
+    return [(ids[index], float(distances[index])) for index in nearest]
+
+
+def within_box(queryset, min_lat, min_lon, max_lat, max_lon, limit):
+    """Return up to `limit` delivery ids inside the bounding box, lowest id first."""
+    return [row[0] for row in _in_cells(queryset, min_lat, min_lon, max_lat, max_lon).order_by('id')[:limit]]
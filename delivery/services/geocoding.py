@@ -0,0 +1,29 @@
+import functools
+
+from django.conf import settings
+
+from utils.gazetteer import Gazetteer
+
+
+@functools.lru_cache(maxsize=1)
+def _open(path):
+    try:
+        return Gazetteer(path)
+    except OSError:
+        # A missing gazetteer only means deliveries are created without coordinates
+        return None
+
+
+def get_gazetteer():
+    """Return this process's mapping of DELIVERY_GAZETTEER_PATH, or None when geocoding is off."""
+    if not settings.DELIVERY_GAZETTEER_PATH:
+        return None
+    return _open(settings.DELIVERY_GAZETTEER_PATH)
+
+
+def geocode_address(address):
+    """Return `(latitude, longitude)` for a delivery address, or None if it is not in the gazetteer."""
+    gazetteer = get_gazetteer()
+    if gazetteer is None or not address:
+        return None
+    return gazetteer.lookup(address)
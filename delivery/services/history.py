@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.db import connection
+
+from delivery.models import DeliveryStatusEvent
+
+# Data-modifying CTE logging the rows of a preceding `changed` CTE, which must return
+# id, old_status, status and assigned_to_id; takes the changing user's id as parameter.
+# Postgres runs it even though the outer query does not read it.
+LOG_CHANGED_CTE = """
+    logged AS (
+        INSERT INTO delivery_status_events (delivery_id, old_status, new_status, assigned_to_id, changed_by_id)
+        SELECT id, old_status, status, assigned_to_id, %s::bigint FROM changed
+    )
+"""
+
+
+def delivery_timeline(delivery_id):
+    """Return the status events of one delivery, oldest first, from the `(delivery_id, created_at)` index."""
+    return DeliveryStatusEvent.objects.filter(delivery_id=delivery_id).order_by('created_at', 'id')
+
+
+def add_partitions(months_ahead=None):
+    """Create the monthly partitions of `delivery_status_events` missing up to `months_ahead` months out."""
+    if months_ahead is None:
+        months_ahead = settings.DELIVERY_STATUS_EVENT_PARTITIONS_AHEAD
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT delivery_status_events_add_partitions(%s)", [months_ahead])
+        return cursor.fetchone()[0]
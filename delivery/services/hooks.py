@@ -0,0 +1,119 @@
+import contextvars
+import logging
+from contextlib import contextmanager
+from functools import partial
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from kombu.exceptions import OperationalError
+
+from delivery.models import Delivery
+
+# Every (old_status, new_status) edge of the state machine
+EDGES = frozenset((source, target) for source, targets in Delivery.VALID_TRANSITIONS.items() for target in targets)
+
+logger = logging.getLogger(__name__)
+
+_hooks = {}
+
+# Transitions committed during the current request, sent as one message when it ends; None outside a request
+_request_events = contextvars.ContextVar('delivery_transition_events', default=None)
+
+
+def on_transition(*edges):
+    """
+    Register the decorated function as a side effect of the given `(old_status, new_status)` edges.
+
+    Hooks run in a Celery worker after the transition committed and get the list
+    of event dicts (see `transition_event`) of one edge, so they can work in bulk.
+    Hook modules are imported from their app's `ready()`.
+    """
+    def register(hook):
+        for edge in edges:
+            if edge not in EDGES:
+                raise ImproperlyConfigured(f"{edge[0]} -> {edge[1]} is not a valid delivery transition")
+            _hooks.setdefault(edge, []).append(hook)
+        return hook
+    return register
+
+
+def transition_event(delivery_id, old_status, new_status, assigned_to_id, created_by_id, product_name, changed_by_id):
+    """The JSON serializable description of one transition handed to hooks."""
+    return {
+        'delivery_id': delivery_id,
+        'old_status': old_status,
+        'new_status': new_status,
+        'assigned_to_id': assigned_to_id,
+        'created_by_id': created_by_id,
+        'product_name': product_name,
+        'changed_by_id': changed_by_id,
+    }
+
+
+def emit(events):
+    """
+    Schedule the hooks of `events` for when the caller's transaction commits.
+
+    Inside a request (see `collect`) committed events are batched into one Celery
+    message at the end of the request; elsewhere each commit sends its own.
+    Events of a rolled back transaction or savepoint are dropped with it.
+    """
+    events = [event for event in events if (event['old_status'], event['new_status']) in _hooks]
+    if events:
+        transaction.on_commit(partial(_committed, events))
+
+
+def _committed(events):
+    pending = _request_events.get()
+    if pending is None:
+        _send(events)
+    else:
+        pending.extend(events)
+
+
+def _send(events):
+    from delivery.celery_tasks import run_transition_hooks
+
+    # The transitions already committed, so an unreachable broker must not fail the request
+    try:
+        run_transition_hooks.delay(events)
+    except OperationalError:
+        logger.exception("Could not queue transition hooks for deliveries %s", [event['delivery_id'] for event in events])
+
+
+@contextmanager
+def collect():
+    """Send the hooks of every transition committed inside the block as one Celery message when it exits."""
+    token = _request_events.set([])
+    try:
+        yield
+    finally:
+        events = _request_events.get()
+        _request_events.reset(token)
+        if events:
+            _send(events)
+
+
+def run_hooks(events):
+    """
+    Call every registered hook with the events of its edge, in registration order.
+
+    A failing hook does not stop the others; the first error is raised once all ran.
+    Returns the number of hook calls.
+    """
+    by_edge = {}
+    for event in events:
+        by_edge.setdefault((event['old_status'], event['new_status']), []).append(event)
+
+    calls = 0
+    error = None
+    for edge, edge_events in by_edge.items():
+        for hook in _hooks.get(edge, []):
+            calls += 1
+            try:
+                hook(edge_events)
+            except Exception as exc:
+                error = error or exc
+    if error is not None:
+        raise error
+    return calls
@@ -0,0 +1,108 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from delivery.models import IdempotencyKey
+from utils.bloom_filter import RedisBloomFilter
+
+_bloom_filter = None
+
+PURGE_SQL = """
+    DELETE FROM idempotency_keys
+    WHERE id IN (
+        SELECT id FROM idempotency_keys
+        WHERE created_at < %s
+        LIMIT %s
+    )
+"""
+
+
+def get_bloom_filter():
+    """Return the shared idempotency Bloom filter, or None when it is disabled."""
+    global _bloom_filter
+    if not settings.IDEMPOTENCY_BLOOM_FILTER_ENABLED:
+        return None
+    if _bloom_filter is None:
+        _bloom_filter = RedisBloomFilter(
+            name='idempotency:bloom',
+            capacity=settings.IDEMPOTENCY_BLOOM_FILTER_CAPACITY,
+            error_rate=settings.IDEMPOTENCY_BLOOM_FILTER_ERROR_RATE,
+            period=settings.IDEMPOTENCY_LEDGER_TTL_DAYS * 24 * 60 * 60,
+        )
+    return _bloom_filter
+
+
+def _bloom_item(user_id, key):
+    return f"{user_id}:{key}"
+
+
+def find_used_keys(user_id, keys):
+    """
+    Return the subset of `keys` already present in the ledger for this user.
+
+    Keys the Bloom filter has never seen skip the database entirely,
+    which is the common case for fresh requests.
+    """
+    keys = set(keys)
+    bloom_filter = get_bloom_filter()
+    if bloom_filter is not None:
+        maybe = bloom_filter.might_contain_many(_bloom_item(user_id, key) for key in keys)
+        keys = {key for key in keys if _bloom_item(user_id, key) in maybe}
+    if not keys:
+        return set()
+    return set(IdempotencyKey.objects.filter(user_id=user_id, key__in=keys).values_list('key', flat=True))
+
+
+def claim_keys(user_id, keys):
+    """
+    Insert `keys` into the ledger and return the ones that were not there yet.
+
+    The unique (user, key) index makes this race free, so callers only create
+    deliveries for the keys returned. Must run inside the transaction that
+    creates those deliveries.
+    """
+    keys = list(keys)
+    if not keys:
+        return set()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            INSERT INTO idempotency_keys (user_id, key, created_at)
+            SELECT %s, unnest(%s::varchar[]), now()
+            ON CONFLICT (user_id, key) DO NOTHING
+            RETURNING key
+            """,
+            [user_id, keys],
+        )
+        claimed = {row[0] for row in cursor.fetchall()}
+
+    bloom_filter = get_bloom_filter()
+    if bloom_filter is not None and claimed:
+        transaction.on_commit(lambda: bloom_filter.add_many(_bloom_item(user_id, key) for key in claimed))
+    return claimed
+
+
+def release_keys(user_id, keys):
+    """Remove keys claimed in the current transaction whose deliveries were not created after all."""
+    keys = list(keys)
+    if keys:
+        IdempotencyKey.objects.filter(user_id=user_id, key__in=keys).delete()
+
+
+def purge_expired_keys():
+    """
+    Delete ledger rows older than IDEMPOTENCY_LEDGER_TTL_DAYS and return how many went.
+
+    Works in IDEMPOTENCY_LEDGER_PURGE_CHUNK_SIZE chunks so each DELETE holds its locks only briefly.
+    """
+    cutoff = timezone.now() - timedelta(days=settings.IDEMPOTENCY_LEDGER_TTL_DAYS)
+    chunk_size = settings.IDEMPOTENCY_LEDGER_PURGE_CHUNK_SIZE
+    purged = 0
+    with connection.cursor() as cursor:
+        while True:
+            cursor.execute(PURGE_SQL, [cutoff, chunk_size])
+            purged += cursor.rowcount
+            if cursor.rowcount < chunk_size:
+                return purged
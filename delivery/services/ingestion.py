@@ -0,0 +1,219 @@
+import json
+import os
+import socket
+import time
+import uuid
+
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db import DataError, IntegrityError, transaction
+from django.db.models import Model
+from django.utils import timezone
+from django_redis import get_redis_connection
+from redis.exceptions import ResponseError
+
+from delivery.models import Delivery
+from delivery.services.dispatch import dispatch_on_commit
+from delivery.services.capacity import reserve_capacity
+from delivery.services.idempotency import claim_keys, release_keys
+from delivery.services.list_counts import count_created
+
+STREAM = 'delivery:ingest'
+DEAD_LETTER_STREAM = 'delivery:ingest:dead'
+GROUP = 'delivery-writers'
+
+TICKET_PENDING = 'pending'
+TICKET_CREATED = 'created'
+TICKET_DUPLICATE = 'duplicate'
+TICKET_FULL = 'full'
+TICKET_ERROR = 'error'
+
+# Failures caused by an entry itself (bad fields, a deleted partner), as opposed to the database being unavailable
+ENTRY_ERRORS = (DataError, IntegrityError, KeyError, TypeError, ValueError)
+
+
+def _ticket_key(ticket):
+    return f"delivery:ingest:ticket:{ticket}"
+
+
+def _to_primitive(validated_data):
+    """Flatten serializer output so it survives JSON: related objects become `<field>_id`."""
+    fields = {}
+    for name, value in validated_data.items():
+        if isinstance(value, Model):
+            fields[f"{name}_id"] = value.pk
+        elif hasattr(value, 'isoformat'):
+            fields[name] = value.isoformat()
+        else:
+            fields[name] = value
+    return fields
+
+
+def enqueue_delivery(user_id, idempotency_key, validated_data):
+    """Append a validated delivery to the ingest stream and return its ticket id."""
+    ticket = uuid.uuid4().hex
+    redis = get_redis_connection('default')
+    pipe = redis.pipeline()
+    pipe.hset(_ticket_key(ticket), mapping={'status': TICKET_PENDING, 'user_id': user_id})
+    pipe.expire(_ticket_key(ticket), settings.DELIVERY_INGEST_TICKET_TTL)
+    pipe.xadd(STREAM, {
+        'ticket': ticket,
+        'user_id': user_id,
+        'key': idempotency_key,
+        'fields': json.dumps(_to_primitive(validated_data)),
+    }, maxlen=settings.DELIVERY_INGEST_STREAM_MAXLEN, approximate=True)
+    pipe.execute()
+    return ticket
+
+
+def get_ticket(ticket):
+    """Return the ticket hash ({'status', 'user_id', 'delivery_id'?}) or None once it has expired."""
+    values = get_redis_connection('default').hgetall(_ticket_key(ticket))
+    if not values:
+        return None
+    return {key.decode(): value.decode() for key, value in values.items()}
+
+
+def write_entries(entries):
+    """
+    Group-commit a batch of stream entries and return {ticket: (status, delivery_id)}.
+
+    Each entry is a dict with `ticket`, `user_id`, `key` and `fields`. Keys are claimed
+    in the idempotency ledger so a replayed or duplicated entry is never inserted twice,
+    and entries whose delivery date has no capacity left are answered with `full`.
+
+    Each delivery records its ticket in `extras`, so an entry replayed after its
+    delivery was committed but before its ticket was answered (the consumer died in
+    between) resolves to that delivery instead of a bare `duplicate`.
+    """
+    by_user = {}
+    for entry in entries:
+        by_user.setdefault(int(entry['user_id']), []).append(entry)
+
+    results = {}
+    new_deliveries = []
+    with transaction.atomic():
+        for user_id, user_entries in by_user.items():
+            claimed_keys = claim_keys(user_id, {entry['key'] for entry in user_entries})
+            claimed = []
+            for entry in user_entries:
+                if entry['key'] not in claimed_keys:
+                    results[entry['ticket']] = (TICKET_DUPLICATE, None)
+                    continue
+                # The same key may appear twice in one batch: only its first entry is created
+                claimed_keys.discard(entry['key'])
+                claimed.append((entry, json.loads(entry['fields'])))
+
+            admitted = reserve_capacity([(date.fromisoformat(fields['delivery_date']), fields.get('geohash')) for _, fields in claimed])
+            for (entry, fields), is_admitted in zip(claimed, admitted):
+                if is_admitted:
+                    new_deliveries.append((entry['ticket'], Delivery(**fields, created_by_id=user_id, extras={'ingest_ticket': entry['ticket']})))
+                else:
+                    results[entry['ticket']] = (TICKET_FULL, None)
+            release_keys(user_id, [entry['key'] for (entry, _), is_admitted in zip(claimed, admitted) if not is_admitted])
+        Delivery.objects.bulk_create([delivery for _, delivery in new_deliveries])
+        dispatch_on_commit([delivery.id for _, delivery in new_deliveries])
+        count_created([delivery.created_by_id for _, delivery in new_deliveries])
+
+    for ticket, delivery in new_deliveries:
+        results[ticket] = (TICKET_CREATED, delivery.pk)
+
+    replayed = [entry for entry in entries if results[entry['ticket']] == (TICKET_DUPLICATE, None)]
+    if replayed:
+        # Tickets expire after DELIVERY_INGEST_TICKET_TTL, so older deliveries cannot be theirs
+        created_since = timezone.now() - timedelta(seconds=settings.DELIVERY_INGEST_TICKET_TTL)
+        existing = Delivery.objects.filter(
+            created_by_id__in={int(entry['user_id']) for entry in replayed},
+            created_at__gte=created_since,
+            extras__ingest_ticket__in=[entry['ticket'] for entry in replayed],
+        ).values_list('extras__ingest_ticket', 'id')
+        for ticket, delivery_id in existing:
+            results[ticket] = (TICKET_CREATED, delivery_id)
+    return results
+
+
+def _decode(fields):
+    return {key.decode(): value.decode() for key, value in fields.items()}
+
+
+def _write_batch(batch):
+    """
+    Write `[(entry_id, entry)]` and return `(results, {entry_id: error})`.
+
+    When the batch fails because of one of its entries, the entries are written
+    one at a time so the others still go through; those failing on their own are
+    returned with their error.
+    """
+    try:
+        return write_entries([entry for _, entry in batch]), {}
+    except ENTRY_ERRORS:
+        pass
+
+    results, failed = {}, {}
+    for entry_id, entry in batch:
+        try:
+            results.update(write_entries([entry]))
+        except ENTRY_ERRORS as exc:
+            failed[entry_id] = f"{type(exc).__name__}: {exc}"
+    return results, failed
+
+
+def drain_stream():
+    """
+    Consume the ingest stream for up to DELIVERY_INGEST_DRAIN_SECONDS.
+
+    Entries are collected until DELIVERY_INGEST_BATCH_SIZE rows or DELIVERY_INGEST_MAX_WAIT_MS
+    have passed, whichever comes first, then written in one transaction. Entries left
+    pending by a crashed consumer are reclaimed after DELIVERY_INGEST_RECLAIM_IDLE_MS.
+    Entries that cannot be written are moved to the dead-letter stream with their
+    error and their ticket answered with `error`, so they never hold the rest back.
+    Returns the number of entries written.
+    """
+    redis = get_redis_connection('default')
+    consumer = f"{socket.gethostname()}:{os.getpid()}"
+    try:
+        redis.xgroup_create(STREAM, GROUP, id='0', mkstream=True)
+    except ResponseError:
+        pass  # BUSYGROUP: the group already exists
+
+    batch_size = settings.DELIVERY_INGEST_BATCH_SIZE
+    max_wait = settings.DELIVERY_INGEST_MAX_WAIT_MS / 1000
+    deadline = time.monotonic() + settings.DELIVERY_INGEST_DRAIN_SECONDS
+
+    _, reclaimed, _ = redis.xautoclaim(STREAM, GROUP, consumer, settings.DELIVERY_INGEST_RECLAIM_IDLE_MS, count=batch_size)
+    batch = [(entry_id, _decode(fields)) for entry_id, fields in reclaimed if fields]
+    written = 0
+
+    while True:
+        batch_started = time.monotonic()
+        while len(batch) < batch_size:
+            remaining = max_wait - (time.monotonic() - batch_started)
+            if remaining <= 0:
+                break
+            response = redis.xreadgroup(GROUP, consumer, {STREAM: '>'}, count=batch_size - len(batch), block=max(1, int(remaining * 1000)))
+            for _, stream_entries in response or []:
+                batch.extend((entry_id, _decode(fields)) for entry_id, fields in stream_entries)
+
+        if batch:
+            results, failed = _write_batch(batch)
+            pipe = redis.pipeline()
+            for ticket, (ticket_status, delivery_id) in results.items():
+                pipe.hset(_ticket_key(ticket), mapping={'status': ticket_status, 'delivery_id': delivery_id or ''})
+                pipe.expire(_ticket_key(ticket), settings.DELIVERY_INGEST_TICKET_TTL)
+            for entry_id, fields in batch:
+                if entry_id not in failed:
+                    continue
+                pipe.xadd(DEAD_LETTER_STREAM, {**fields, 'entry_id': entry_id, 'error': failed[entry_id]}, maxlen=settings.DELIVERY_INGEST_STREAM_MAXLEN, approximate=True)
+                if fields.get('ticket'):
+                    pipe.hset(_ticket_key(fields['ticket']), mapping={'status': TICKET_ERROR, 'delivery_id': ''})
+                    pipe.expire(_ticket_key(fields['ticket']), settings.DELIVERY_INGEST_TICKET_TTL)
+            entry_ids = [entry_id for entry_id, _ in batch]
+            pipe.xack(STREAM, GROUP, *entry_ids)
+            pipe.xdel(STREAM, *entry_ids)
+            pipe.execute()
+            written += len(batch) - len(failed)
+            batch = []
+
+        if time.monotonic() >= deadline:
+            return written
@@ -0,0 +1,57 @@
+from collections import Counter
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+# ListDeliveries roles: partners list the deliveries they created, admins those assigned to them
+PARTNER = 'partner'
+ADMIN = 'admin'
+
+
+def _cache_key(role, user_id):
+    return f"delivery:list_count:{role}:{user_id}"
+
+
+def cached_count(role, user_id, queryset):
+    """
+    Count strategy for a user's unfiltered delivery list, exact and cached.
+
+    A miss counts `queryset` and caches the total for DELIVERY_LIST_COUNT_TTL
+    seconds. Creations and assignments add to cached totals as they commit (see
+    `count_created` and `count_assigned`); the TTL bounds the drift of writes
+    that race a recount or bypass them.
+    """
+    key = _cache_key(role, user_id)
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, timeout=settings.DELIVERY_LIST_COUNT_TTL)
+    return count, True
+
+
+def _bump(role, user_ids):
+    deltas = Counter(user_id for user_id in user_ids if user_id)
+    if deltas:
+        transaction.on_commit(partial(_apply, role, deltas))
+
+
+def _apply(role, deltas):
+    for user_id, delta in deltas.items():
+        try:
+            cache.incr(_cache_key(role, user_id), delta)
+        except ValueError:
+            # Not cached, the next list call counts it
+            pass
+
+
+def count_created(created_by_ids, assigned_to_ids=()):
+    """Add new deliveries to the cached list totals of their partners (and admins) once the caller's transaction commits."""
+    _bump(PARTNER, created_by_ids)
+    _bump(ADMIN, assigned_to_ids)
+
+
+def count_assigned(admin_ids):
+    """Add assigned deliveries, one admin id each, to the cached list totals of the admins once the caller's transaction commits."""
+    _bump(ADMIN, admin_ids)
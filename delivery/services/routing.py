@@ -0,0 +1,124 @@
+import hashlib
+import time
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+
+from delivery.models import Delivery
+from delivery.services.geo import haversine_km
+
+ROUTE_STATUSES = ('ASSIGNED', 'IN_TRANSIT')
+
+
+def distance_matrix(latitudes, longitudes):
+    """Pairwise great-circle distances in km between the points, as an (n, n) array."""
+    latitudes = np.asarray(latitudes, dtype=np.float64)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    return haversine_km(latitudes[:, None], longitudes[:, None], latitudes[None, :], longitudes[None, :])
+
+
+def _nearest_neighbour(matrix):
+    """Greedy tour from node 0: always visit the closest unvisited node next."""
+    size = len(matrix)
+    order = np.empty(size, dtype=np.intp)
+    order[0] = 0
+    visited = np.zeros(size, dtype=bool)
+    visited[0] = True
+    for position in range(1, size):
+        distances = np.where(visited, np.inf, matrix[order[position - 1]])
+        order[position] = np.argmin(distances)
+        visited[order[position]] = True
+    return order
+
+
+def _two_opt(order, matrix, deadline):
+    """
+    Improve a tour in place by reversing segments until no reversal shortens it.
+
+    Node 0 stays first and the tour is closed back to it, so a zero column 0 in
+    `matrix` makes it an open path with a free end. For each segment start, every
+    segment end is scored at once with numpy and the best improving one is applied.
+    """
+    size = len(order)
+    improved = True
+    while improved and time.monotonic() < deadline:
+        improved = False
+        for start in range(1, size - 1):
+            if time.monotonic() >= deadline:
+                break
+            ends = np.arange(start + 1, size)
+            before, first = order[start - 1], order[start]
+            lasts, afters = order[ends], order[(ends + 1) % size]
+            delta = (
+                matrix[before, lasts] + matrix[first, afters]
+                - matrix[before, first] - matrix[lasts, afters]
+            )
+            best = np.argmin(delta)
+            if delta[best] < -1e-9:
+                end = ends[best]
+                order[start:end + 1] = order[start:end + 1][::-1]
+                improved = True
+    return order
+
+
+def sequence_stops(latitudes, longitudes, start=None, time_budget=None):
+    """
+    Return `(order, distance_km)`: the visiting order of the stops as indexes into
+    `latitudes`/`longitudes`, and the length of that path.
+
+    The route starts at `start` (a `(latitude, longitude)` pair) when given, or at
+    whichever stop makes the path shortest, and ends at the last stop. A nearest
+    neighbour tour is improved with 2-opt until it converges or `time_budget`
+    seconds (DELIVERY_ROUTE_TIME_BUDGET_MS by default) run out.
+    """
+    if time_budget is None:
+        time_budget = settings.DELIVERY_ROUTE_TIME_BUDGET_MS / 1000
+    deadline = time.monotonic() + time_budget
+    count = len(latitudes)
+    if count == 0:
+        return [], 0.0
+
+    # Node 0 is the start: the courier's position, or a point equally far (0 km) from every stop
+    matrix = np.zeros((count + 1, count + 1))
+    matrix[1:, 1:] = distance_matrix(latitudes, longitudes)
+    if start is not None:
+        matrix[0, 1:] = haversine_km(start[0], start[1], np.asarray(latitudes, dtype=np.float64), np.asarray(longitudes, dtype=np.float64))
+    # Returning to the start is free, which turns the closed tour into an open path
+    matrix[1:, 0] = 0
+
+    order = _two_opt(_nearest_neighbour(matrix), matrix, deadline)
+    distance_km = float(matrix[order[:-1], order[1:]].sum())
+    return [int(node) - 1 for node in order[1:]], distance_km
+
+
+def _route_cache_key(admin_id, delivery_date, stops, start):
+    signature = hashlib.sha256(repr((stops, start)).encode()).hexdigest()
+    return f"delivery:route:{admin_id}:{delivery_date.isoformat()}:{signature}"
+
+
+def plan_route(admin_id, delivery_date, start=None):
+    """
+    Return `(stops, unrouted, distance_km)` for an admin's active deliveries on `delivery_date`.
+
+    `stops` are the deliveries with coordinates in visiting order, `unrouted` the
+    ones without coordinates. The order is cached under a key derived from the
+    deliveries' ids and coordinates, so any change to the set gives a new route.
+    """
+    deliveries = list(
+        Delivery.objects.select_related('assigned_to', 'created_by')
+        .filter(assigned_to_id=admin_id, delivery_date=delivery_date, status__in=ROUTE_STATUSES)
+        .order_by('id')
+    )
+    located = [delivery for delivery in deliveries if delivery.latitude is not None]
+    unrouted = [delivery for delivery in deliveries if delivery.latitude is None]
+
+    key = _route_cache_key(admin_id, delivery_date, [(d.id, d.latitude, d.longitude) for d in located], start)
+    route = cache.get(key)
+    if route is None:
+        order, distance_km = sequence_stops([d.latitude for d in located], [d.longitude for d in located], start=start)
+        route = {'ids': [located[index].id for index in order], 'distance_km': distance_km}
+        cache.set(key, route, timeout=settings.DELIVERY_ROUTE_CACHE_TTL)
+
+    by_id = {delivery.id: delivery for delivery in located}
+    return [by_id[delivery_id] for delivery_id in route['ids']], unrouted, route['distance_km']
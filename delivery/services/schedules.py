@@ -0,0 +1,103 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from delivery.models import Delivery, DeliverySchedule
+from delivery.services.capacity import reserve_capacity
+from delivery.services.dispatch import dispatch_on_commit
+from delivery.services.idempotency import claim_keys, release_keys
+from delivery.services.list_counts import count_created
+from utils.idempotency_key import generate_idempotency_key
+
+
+def occurrences(schedule, start, end):
+    """Yield the dates in [start, end] on which `schedule` recurs."""
+    first = max(start, schedule.start_date)
+    last = min(end, schedule.end_date) if schedule.end_date else end
+    weekdays = set(schedule.weekdays)
+    # Weeks are counted from the Monday of the week the schedule starts in
+    anchor = schedule.start_date - timedelta(days=schedule.start_date.weekday())
+
+    day = first
+    while day <= last:
+        if day.weekday() in weekdays and ((day - anchor).days // 7) % schedule.interval_weeks == 0:
+            yield day
+        day += timedelta(days=1)
+
+
+def schedule_idempotency_key(schedule, delivery_date):
+    """Deterministic key so expanding the same schedule date twice is a no-op."""
+    return generate_idempotency_key(
+        user_id=schedule.partner_id,
+        payload={'schedule': schedule.id, 'delivery_date': delivery_date.isoformat()},
+        prefix='schedule',
+    )
+
+
+def expand_schedules(today=None):
+    """
+    Create the deliveries of every active schedule up to the horizon, in one pass.
+
+    Schedules are processed in chunks; each chunk claims its keys in the idempotency
+    ledger, books delivery capacity, inserts its deliveries with one `bulk_create` and
+    advances `expanded_until` in the same transaction. Dates without capacity left are
+    not created and `expanded_until` stops before the earliest of them, so later runs
+    retry them until they are booked or have passed. Returns the number of deliveries created.
+    """
+    today = today or timezone.localdate()
+    horizon = today + timedelta(days=settings.DELIVERY_SCHEDULE_HORIZON_DAYS)
+
+    due = DeliverySchedule.objects.filter(
+        Q(expanded_until__isnull=True) | Q(expanded_until__lt=horizon),
+        Q(end_date__isnull=True) | Q(end_date__gte=today),
+        is_active=True,
+        is_deleted=False,
+        start_date__lte=horizon,
+    ).order_by('id')
+
+    created = 0
+    chunk_size = settings.DELIVERY_SCHEDULE_CHUNK_SIZE
+    last_id = 0
+    while True:
+        schedules = list(due.filter(id__gt=last_id)[:chunk_size])
+        if not schedules:
+            return created
+        last_id = schedules[-1].id
+
+        with transaction.atomic():
+            planned = {}
+            for schedule in schedules:
+                start = max(today, schedule.expanded_until + timedelta(days=1)) if schedule.expanded_until else today
+                for delivery_date in occurrences(schedule, start, horizon):
+                    planned.setdefault(schedule.partner_id, []).append((schedule, delivery_date, schedule_idempotency_key(schedule, delivery_date)))
+
+            new_deliveries = []
+            # Earliest refused date per schedule; their keys are released so a later run can claim them again
+            refused = {}
+            for partner_id, items in planned.items():
+                claimed_keys = claim_keys(partner_id, [key for _, _, key in items])
+                claimed = [item for item in items if item[2] in claimed_keys]
+                admitted = reserve_capacity([(delivery_date, None) for _, delivery_date, _ in claimed])
+                release_keys(partner_id, [key for (_, _, key), is_admitted in zip(claimed, admitted) if not is_admitted])
+                for (schedule, delivery_date, _), is_admitted in zip(claimed, admitted):
+                    if not is_admitted:
+                        refused[schedule.id] = min(refused.get(schedule.id, delivery_date), delivery_date)
+                new_deliveries.extend(
+                    Delivery(
+                        product_name=schedule.product_name,
+                        delivery_address=schedule.delivery_address,
+                        delivery_date=delivery_date,
+                        created_by_id=partner_id,
+                    )
+                    for (schedule, delivery_date, _), is_admitted in zip(claimed, admitted) if is_admitted
+                )
+            for schedule in schedules:
+                schedule.expanded_until = refused[schedule.id] - timedelta(days=1) if schedule.id in refused else horizon
+            Delivery.objects.bulk_create(new_deliveries)
+            dispatch_on_commit([delivery.id for delivery in new_deliveries])
+            count_created([delivery.created_by_id for delivery in new_deliveries])
+            DeliverySchedule.objects.bulk_update(schedules, ['expanded_until'])
+            created += len(new_deliveries)
@@ -0,0 +1,27 @@
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F, Q
+
+# Text search configuration of `deliveries.search_vector`, see migration 0019: no stemming or
+# stop words, as most of the document is names and addresses
+SEARCH_CONFIG = 'simple'
+
+# Maintained by the database, not worth reading back with a delivery
+SEARCH_FIELDS = ('search_text', 'search_vector')
+
+
+def search_deliveries(queryset, term, rank=False):
+    """
+    Filter deliveries to those matching `term` in their search document.
+
+    A delivery matches when its product, address, status, delivery date or
+    partner/admin names contain `term` (the trigram index on `search_text`), or
+    when they hold all its words (`websearch_to_tsquery` on `search_vector`, so
+    word order does not matter and `"quoted phrases"` and `-word` work). Both
+    conditions are answered by GIN indexes. With `rank` the most relevant come
+    first, product name matches above address and name matches.
+    """
+    query = SearchQuery(term, config=SEARCH_CONFIG, search_type='websearch')
+    queryset = queryset.filter(Q(search_vector=query) | Q(search_text__contains=term.lower()))
+    if rank:
+        queryset = queryset.annotate(rank=SearchRank(F('search_vector'), query)).order_by('-rank', '-created_at')
+    return queryset
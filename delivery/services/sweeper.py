@@ -0,0 +1,88 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from delivery.services.transitions import PREDECESSORS, fail_overdue_deliveries
+from delivery.services.workload import ACTIVE_STATUSES
+from utils.enums import DeliveryStatus
+
+# Overdue deliveries the state machine lets fail are failed, the others are flagged in `extras`
+FAILED_STATUSES = PREDECESSORS[DeliveryStatus.FAILED.value]
+FLAGGED_STATUSES = [status for status in ACTIVE_STATUSES if status not in FAILED_STATUSES]
+STALE_FLAG = 'stale_flagged_on'
+
+# The next chunk of overdue ids, read without locks
+CANDIDATES_SQL = """
+    SELECT id FROM deliveries
+    WHERE status = ANY(%s) AND delivery_date < %s AND id > %s AND NOT is_deleted {condition}
+    ORDER BY id
+    LIMIT %s
+"""
+
+FLAG_SQL = f"""
+    UPDATE deliveries AS d
+    SET extras = d.extras || jsonb_build_object('{STALE_FLAG}', %s::text)
+    FROM (
+        SELECT id FROM deliveries
+        WHERE id = ANY(%s) AND status = ANY(%s) AND delivery_date < %s
+        ORDER BY id
+        FOR UPDATE SKIP LOCKED
+    ) AS picked
+    WHERE d.id = picked.id
+"""
+
+
+def flag_overdue_deliveries(ids, cutoff, today):
+    """Mark those of `ids` still overdue in FLAGGED_STATUSES with `extras['stale_flagged_on']`; returns how many."""
+    with connection.cursor() as cursor:
+        cursor.execute(FLAG_SQL, [today.isoformat(), list(ids), FLAGGED_STATUSES, cutoff])
+        return cursor.rowcount
+
+
+def _sweep(statuses, cutoff, apply, chunk_size, pause, condition=''):
+    """
+    Walk the overdue deliveries in `statuses` in primary key order, `chunk_size` at a time.
+
+    Each chunk's ids are read without locks, then `apply(ids)` locks and updates
+    just those rows, so the locks are held for the write only.
+    """
+    total = 0
+    after_id = 0
+    while True:
+        with connection.cursor() as cursor:
+            cursor.execute(CANDIDATES_SQL.format(condition=condition), [statuses, cutoff, after_id, chunk_size])
+            ids = [row[0] for row in cursor.fetchall()]
+        if not ids:
+            return total
+        total += apply(ids)
+        if len(ids) < chunk_size:
+            return total
+        after_id = ids[-1]
+        time.sleep(pause)
+
+
+def sweep_stale(today=None, chunk_size=None):
+    """
+    Resolve ASSIGNED and IN_TRANSIT deliveries whose date is more than DELIVERY_STALE_GRACE_DAYS past.
+
+    Deliveries that may become FAILED (IN_TRANSIT) are failed through the
+    transition engine, so their creators are notified in bulk by the transition
+    hooks; the others (ASSIGNED) are flagged. Each chunk of DELIVERY_SWEEP_CHUNK_SIZE
+    rows is one short UPDATE committed on its own and followed by a
+    DELIVERY_SWEEP_PAUSE_MS pause, so locks stay brief and replicas keep up.
+    Returns `(failed, flagged)`.
+    """
+    today = today or timezone.localdate()
+    cutoff = today - timedelta(days=settings.DELIVERY_STALE_GRACE_DAYS)
+    chunk_size = chunk_size or settings.DELIVERY_SWEEP_CHUNK_SIZE
+    pause = settings.DELIVERY_SWEEP_PAUSE_MS / 1000
+
+    failed = _sweep(FAILED_STATUSES, cutoff, lambda ids: len(fail_overdue_deliveries(ids, cutoff)), chunk_size, pause)
+    flagged = _sweep(
+        FLAGGED_STATUSES, cutoff, lambda ids: flag_overdue_deliveries(ids, cutoff, today), chunk_size, pause,
+        condition=f"AND NOT extras ? '{STALE_FLAG}'",
+    )
+    return failed, flagged
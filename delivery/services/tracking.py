@@ -0,0 +1,47 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from delivery.models import Delivery
+from delivery.serializers.delivery_tracking import DeliveryTrackingSerializer
+
+# Cached for unknown codes, so guessing codes does not reach the database either (falsy, compare by value)
+NOT_FOUND = {}
+
+
+def _cache_key(tracking_code):
+    return f"delivery:tracking:{tracking_code}"
+
+
+def get_tracking(tracking_code):
+    """
+    Return `{'data', 'etag'}` for a tracking code, or NOT_FOUND.
+
+    Served from the cache; a miss reads one row by the unique tracking code
+    index and caches it for DELIVERY_TRACKING_CACHE_TTL seconds.
+    """
+    key = _cache_key(tracking_code)
+    tracking = cache.get(key)
+    if tracking is not None:
+        return tracking
+
+    delivery = Delivery.objects.filter(tracking_code=tracking_code).only(*DeliveryTrackingSerializer.Meta.fields).first()
+    if delivery is None:
+        cache.set(key, NOT_FOUND, timeout=settings.DELIVERY_TRACKING_CACHE_TTL)
+        return NOT_FOUND
+
+    data = dict(DeliveryTrackingSerializer(delivery).data)
+    etag = hashlib.md5(json.dumps(data, sort_keys=True).encode()).hexdigest()
+    tracking = {'data': data, 'etag': f'"{etag}"'}
+    cache.set(key, tracking, timeout=settings.DELIVERY_TRACKING_CACHE_TTL)
+    return tracking
+
+
+def invalidate_tracking(tracking_codes):
+    """Drop the cached tracking of deliveries once the caller's transaction commits."""
+    keys = [_cache_key(tracking_code) for tracking_code in tracking_codes]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
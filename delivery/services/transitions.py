@@ -0,0 +1,372 @@
+from django.db import connection, transaction
+
+from delivery.models import Delivery
+from delivery.services.history import LOG_CHANGED_CTE
+from delivery.services.hooks import emit, transition_event
+from delivery.services.list_counts import count_assigned
+from delivery.services.search import SEARCH_FIELDS
+from delivery.services.tracking import invalidate_tracking
+from delivery.services.workload import record_transitions
+from utils.enums import DeliveryStatus
+
+# Statuses a delivery may be in for each target status, derived from Delivery.VALID_TRANSITIONS
+PREDECESSORS = {}
+for _source, _targets in Delivery.VALID_TRANSITIONS.items():
+    for _target in _targets:
+        PREDECESSORS.setdefault(_target, []).append(_source)
+
+_FIELDS = [field for field in Delivery._meta.concrete_fields if field.name not in SEARCH_FIELDS]
+_RETURNING = ', '.join(f'd.{field.column}' for field in _FIELDS)
+_COLUMNS = ', '.join(field.column for field in _FIELDS)
+
+
+class TransitionError(Exception):
+    """Raised when a delivery cannot move to the requested status."""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+def transition_delivery(pk, new_status, expected_version=None, assigned_to_id=None, changed_by_id=None):
+    """
+    Move delivery `pk` to `new_status` in a single conditional UPDATE.
+
+    The row only changes if its current status is an allowed predecessor of
+    `new_status` (and its version is `expected_version`, when given), so two
+    concurrent requests can never both apply a transition from the same state.
+    The row is locked for that one statement only, not while the caller works.
+    The same statement appends the transition to `delivery_status_events`,
+    recording `changed_by_id` as the user who made it. Hooks registered for the
+    edge run once the caller's transaction commits, see delivery.services.hooks.
+
+    Returns `(delivery, old_status)`. When no row was updated, a follow-up read
+    works out why and raises `TransitionError` with the matching message.
+    """
+    sets = ['status = %s', 'version = d.version + 1', 'updated_at = now()']
+    params = [new_status]
+    if assigned_to_id is not None:
+        sets.append('assigned_to_id = %s')
+        params.append(assigned_to_id)
+
+    conditions = ['d.id = old.id', 'old.status = ANY(%s)']
+    where_params = [PREDECESSORS.get(new_status, [])]
+    if new_status == DeliveryStatus.ASSIGNED.value and assigned_to_id is None:
+        conditions.append('d.assigned_to_id IS NOT NULL')
+    if expected_version is not None:
+        conditions.append('d.version = %s')
+        where_params.append(expected_version)
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            WITH changed AS (
+                UPDATE deliveries AS d
+                SET {', '.join(sets)}
+                FROM (SELECT id, status FROM deliveries WHERE id = %s FOR UPDATE) AS old
+                WHERE {' AND '.join(conditions)}
+                RETURNING old.status AS old_status, {_RETURNING}
+            ),
+            {LOG_CHANGED_CTE}
+            SELECT old_status, {_COLUMNS} FROM changed
+            """,
+            [*params, pk, *where_params, changed_by_id],
+        )
+        row = cursor.fetchone()
+        if row is not None:
+            delivery = Delivery.from_db(connection.alias, [field.attname for field in _FIELDS], row[1:])
+            record_transitions([(delivery.assigned_to_id, row[0], new_status)])
+            if assigned_to_id is not None:
+                count_assigned([assigned_to_id])
+            invalidate_tracking([delivery.tracking_code])
+            emit([transition_event(
+                delivery.id, row[0], new_status, delivery.assigned_to_id, delivery.created_by_id, delivery.product_name, changed_by_id
+            )])
+
+    if row is None:
+        raise _classify_failure(pk, new_status, expected_version, assigned_to_id)
+    return delivery, row[0]
+
+
+def _check_transition(current_status, new_status, assigned_to_id):
+    """Return the TransitionError for an invalid transition, or None when it is allowed."""
+    if current_status in Delivery.TERMINAL_STATES:
+        return TransitionError(f"Cannot update delivery in {current_status} state. This is a terminal state.")
+
+    can_transition, message = Delivery(status=current_status).can_transition_to(new_status)
+    if not can_transition:
+        return TransitionError(message)
+
+    if new_status == DeliveryStatus.ASSIGNED.value and assigned_to_id is None:
+        return TransitionError("assigned_to is required when status is ASSIGNED")
+    return None
+
+
+def _classify_failure(pk, new_status, expected_version, assigned_to_id):
+    current = Delivery.objects.filter(pk=pk).values('status', 'version', 'assigned_to_id').first()
+    if current is None:
+        return TransitionError("Delivery not found", status_code=404)
+
+    if expected_version is not None and current['version'] != expected_version and current['status'] not in Delivery.TERMINAL_STATES:
+        return TransitionError("Delivery was modified by another request, reload it and try again", status_code=409)
+
+    error = _check_transition(current['status'], new_status, assigned_to_id or current['assigned_to_id'])
+    if error is None:
+        # The status changed between the UPDATE and this read
+        return TransitionError("Delivery was modified by another request, reload it and try again", status_code=409)
+    return error
+
+
+def bulk_transition_deliveries(items, changed_by_id=None, assigned_to_id=None):
+    """
+    Apply many `(delivery_id, new_status)` transitions; must run inside a transaction.
+
+    With `assigned_to_id`, only deliveries assigned to that admin are considered;
+    the others are reported as not found.
+
+    All rows are read and locked with one SELECT ... FOR UPDATE in primary key
+    order, so concurrent bulk requests cannot deadlock. Transitions are validated
+    in memory, grouped by (from, to) and each group is written with one UPDATE,
+    which also logs its transitions to `delivery_status_events`.
+
+    Returns a list aligned with `items`: a `TransitionError` for every rejected
+    item, otherwise a dict with the delivery id, `old_status`, `status`,
+    `product_name` and `created_by_id`.
+    """
+    locked = Delivery.objects.select_for_update().filter(id__in={pk for pk, _ in items})
+    if assigned_to_id is not None:
+        locked = locked.filter(assigned_to_id=assigned_to_id)
+    current = {
+        row['id']: row
+        for row in locked
+        .order_by('id')
+        .values('id', 'status', 'assigned_to_id', 'created_by_id', 'product_name', 'tracking_code')
+    }
+
+    results = [None] * len(items)
+    groups = {}
+    seen = set()
+    for index, (pk, new_status) in enumerate(items):
+        row = current.get(pk)
+        if row is None:
+            results[index] = TransitionError("Delivery not found", status_code=404)
+            continue
+        if pk in seen:
+            results[index] = TransitionError("Delivery appears more than once in this request")
+            continue
+        seen.add(pk)
+
+        error = _check_transition(row['status'], new_status, row['assigned_to_id'])
+        if error is not None:
+            results[index] = error
+            continue
+        groups.setdefault((row['status'], new_status), []).append(index)
+
+    changes = []
+    tracking_codes = []
+    events = []
+    for (old_status, new_status), indexes in groups.items():
+        # The rows are locked, so the status condition only guards against misuse outside a transaction
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH changed AS (
+                    UPDATE deliveries
+                    SET status = %s, version = version + 1, updated_at = now()
+                    WHERE id = ANY(%s) AND status = %s
+                    RETURNING id, %s::varchar AS old_status, status, assigned_to_id
+                ),
+                {LOG_CHANGED_CTE}
+                SELECT count(*) FROM changed
+                """,
+                [new_status, [items[index][0] for index in indexes], old_status, old_status, changed_by_id],
+            )
+        for index in indexes:
+            row = current[items[index][0]]
+            changes.append((row['assigned_to_id'], old_status, new_status))
+            tracking_codes.append(row['tracking_code'])
+            events.append(transition_event(
+                row['id'], old_status, new_status, row['assigned_to_id'], row['created_by_id'], row['product_name'], changed_by_id
+            ))
+            results[index] = {
+                'id': row['id'],
+                'old_status': old_status,
+                'status': new_status,
+                'product_name': row['product_name'],
+                'created_by_id': row['created_by_id'],
+            }
+    record_transitions(changes)
+    invalidate_tracking(tracking_codes)
+    emit(events)
+    return results
+
+
+def assign_delivery(pk, assigned_to_id, expected_version=None, changed_by_id=None):
+    """Assign a CREATED delivery to an admin, see `transition_delivery`."""
+    return transition_delivery(
+        pk, DeliveryStatus.ASSIGNED.value, expected_version=expected_version, assigned_to_id=assigned_to_id, changed_by_id=changed_by_id
+    )
+
+
+def bulk_assign_deliveries(assignments, charge_heap=True, changed_by_id=None):
+    """
+    Assign many CREATED deliveries with one conditional UPDATE.
+
+    `assignments` maps delivery id to admin id; callers check the admins' roles.
+    The target rows are locked in primary key order by the same statement, and only
+    rows still in CREATED without an assignee are changed. Returns `(assigned, errors)`: a dict of
+    delivery id to `{'product_name', 'created_by_id'}` and a dict of delivery id
+    to `TransitionError` for the rest. `charge_heap=False` is for callers that
+    already charged the admins in the dispatch heap. The assignments are logged
+    to `delivery_status_events` by the same statement, as made by `changed_by_id`.
+    """
+    ids = list(assignments)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            WITH changed AS (
+                UPDATE deliveries AS d
+                SET status = %s, assigned_to_id = t.assigned_to_id, version = d.version + 1, updated_at = now()
+                FROM (
+                    SELECT id, status FROM deliveries
+                    WHERE id = ANY(%s) AND status = %s AND assigned_to_id IS NULL
+                    ORDER BY id
+                    FOR UPDATE
+                ) AS locked,
+                     unnest(%s::bigint[], %s::bigint[]) AS t(id, assigned_to_id)
+                WHERE d.id = locked.id AND t.id = d.id
+                RETURNING d.id, d.product_name, d.created_by_id, d.tracking_code, locked.status AS old_status, d.status, d.assigned_to_id
+            ),
+            {LOG_CHANGED_CTE}
+            SELECT id, product_name, created_by_id, tracking_code FROM changed
+            """,
+            [
+                DeliveryStatus.ASSIGNED.value, ids, DeliveryStatus.CREATED.value,
+                ids, [assignments[pk] for pk in ids], changed_by_id,
+            ],
+        )
+        rows = cursor.fetchall()
+        assigned = {pk: {'product_name': product_name, 'created_by_id': created_by_id} for pk, product_name, created_by_id, _ in rows}
+        record_transitions(
+            [(assignments[pk], DeliveryStatus.CREATED.value, DeliveryStatus.ASSIGNED.value) for pk in assigned],
+            charge_heap=charge_heap,
+        )
+        count_assigned([assignments[pk] for pk in assigned])
+        invalidate_tracking([row[3] for row in rows])
+        emit([
+            transition_event(pk, DeliveryStatus.CREATED.value, DeliveryStatus.ASSIGNED.value, assignments[pk], created_by_id, product_name, changed_by_id)
+            for pk, product_name, created_by_id, _ in rows
+        ])
+
+    errors = {}
+    missing = [pk for pk in ids if pk not in assigned]
+    if missing:
+        current = {pk: (status, assigned_to_id) for pk, status, assigned_to_id in Delivery.objects.filter(id__in=missing).values_list('id', 'status', 'assigned_to_id')}
+        for pk in missing:
+            if pk not in current:
+                errors[pk] = TransitionError("Delivery not found", status_code=404)
+            elif current[pk][0] == DeliveryStatus.CREATED.value and current[pk][1] is not None:
+                errors[pk] = TransitionError("Delivery is already assigned to an admin", status_code=409)
+            else:
+                errors[pk] = _check_transition(current[pk][0], DeliveryStatus.ASSIGNED.value, assignments[pk]) or TransitionError(
+                    "Delivery was modified by another request, reload it and try again", status_code=409
+                )
+    return assigned, errors
+
+
+def claim_deliveries(admin_id, count, area=None):
+    """
+    Assign the next `count` unassigned CREATED deliveries to `admin_id`.
+
+    Deliveries are taken in `delivery_date` order, optionally only those whose
+    address contains `area`. `FOR UPDATE SKIP LOCKED` lets many admins claim at
+    the same time: rows another claimer is taking are skipped instead of waited
+    for, and a row can never be claimed twice. The claims are logged to
+    `delivery_status_events` by the same statement. Returns the claimed deliveries.
+    """
+    area_condition = ''
+    params = [DeliveryStatus.ASSIGNED.value, admin_id, DeliveryStatus.CREATED.value]
+    if area:
+        area_condition = 'AND delivery_address ILIKE %s'
+        # Escaped so a `%` or `_` in the area matches itself instead of every address
+        params.append('%' + area.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%')
+    params.extend([count, admin_id])
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            WITH changed AS (
+                UPDATE deliveries AS d
+                SET status = %s, assigned_to_id = %s, version = d.version + 1, updated_at = now()
+                FROM (
+                    SELECT id, status FROM deliveries
+                    WHERE status = %s AND assigned_to_id IS NULL AND NOT is_deleted {area_condition}
+                    ORDER BY delivery_date, id
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                ) AS picked
+                WHERE d.id = picked.id
+                RETURNING picked.status AS old_status, {_RETURNING}
+            ),
+            {LOG_CHANGED_CTE}
+            SELECT {_COLUMNS} FROM changed
+            """,
+            params,
+        )
+        rows = cursor.fetchall()
+        record_transitions([(admin_id, DeliveryStatus.CREATED.value, DeliveryStatus.ASSIGNED.value)] * len(rows))
+        count_assigned([admin_id] * len(rows))
+
+        attnames = [field.attname for field in _FIELDS]
+        deliveries = [Delivery.from_db(connection.alias, attnames, row) for row in rows]
+        invalidate_tracking([delivery.tracking_code for delivery in deliveries])
+        emit([
+            transition_event(
+                delivery.id, DeliveryStatus.CREATED.value, DeliveryStatus.ASSIGNED.value, admin_id, delivery.created_by_id, delivery.product_name, admin_id
+            )
+            for delivery in deliveries
+        ])
+
+    deliveries.sort(key=lambda delivery: (delivery.delivery_date, delivery.id))
+    return deliveries
+
+
+def fail_overdue_deliveries(ids, cutoff):
+    """
+    Move those of `ids` whose `delivery_date` is before `cutoff` to FAILED.
+
+    Only deliveries in a status allowed to become FAILED change. One UPDATE locks
+    the rows in primary key order (skipping rows other requests hold), changes
+    them and logs them to `delivery_status_events`; workload counters, the tracking
+    cache and transition hooks are updated as for any other transition.
+    Returns the ids moved.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            WITH changed AS (
+                UPDATE deliveries AS d
+                SET status = %s, version = d.version + 1, updated_at = now()
+                FROM (
+                    SELECT id, status FROM deliveries
+                    WHERE id = ANY(%s) AND status = ANY(%s) AND delivery_date < %s
+                    ORDER BY id
+                    FOR UPDATE SKIP LOCKED
+                ) AS picked
+                WHERE d.id = picked.id
+                RETURNING d.id, picked.status AS old_status, d.status, d.assigned_to_id, d.created_by_id, d.product_name, d.tracking_code
+            ),
+            {LOG_CHANGED_CTE}
+            SELECT id, old_status, assigned_to_id, created_by_id, product_name, tracking_code FROM changed ORDER BY id
+            """,
+            [DeliveryStatus.FAILED.value, list(ids), PREDECESSORS[DeliveryStatus.FAILED.value], cutoff, None],
+        )
+        rows = cursor.fetchall()
+        record_transitions([(assigned_to_id, old_status, DeliveryStatus.FAILED.value) for _, old_status, assigned_to_id, _, _, _ in rows])
+        invalidate_tracking([row[5] for row in rows])
+        emit([
+            transition_event(pk, old_status, DeliveryStatus.FAILED.value, assigned_to_id, created_by_id, product_name, None)
+            for pk, old_status, assigned_to_id, created_by_id, product_name, _ in rows
+        ])
+    return [row[0] for row in rows]
@@ -0,0 +1,212 @@
+from datetime import datetime, time
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+
+from delivery.models import AdminWorkload
+from delivery_auth.models import AuthUser
+from utils.enums import DeliveryStatus, UserRole
+
+# Sorted set of eligible admin ids scored by their number of active deliveries
+WORKLOAD_KEY = 'delivery:dispatch:workload'
+
+ACTIVE_STATUSES = [DeliveryStatus.ASSIGNED.value, DeliveryStatus.IN_TRANSIT.value]
+
+# AdminWorkload counter that holds deliveries in each status
+COUNTER_COLUMNS = {
+    DeliveryStatus.ASSIGNED.value: 'assigned_count',
+    DeliveryStatus.IN_TRANSIT.value: 'in_transit_count',
+    DeliveryStatus.COMPLETED.value: 'completed_today',
+    DeliveryStatus.FAILED.value: 'failed_today',
+}
+
+# Add per-admin deltas; the daily counters restart when the stored day is not today
+UPSERT_COUNTERS_SQL = """
+    INSERT INTO admin_workloads AS w (admin_id, assigned_count, in_transit_count, completed_today, failed_today, counted_on, updated_at)
+    SELECT admin_id, assigned, in_transit, completed, failed, %s, now()
+    FROM unnest(%s::bigint[], %s::int[], %s::int[], %s::int[], %s::int[]) AS t(admin_id, assigned, in_transit, completed, failed)
+    ORDER BY admin_id
+    ON CONFLICT (admin_id) DO UPDATE SET
+        assigned_count = w.assigned_count + EXCLUDED.assigned_count,
+        in_transit_count = w.in_transit_count + EXCLUDED.in_transit_count,
+        completed_today = CASE WHEN w.counted_on = EXCLUDED.counted_on THEN w.completed_today ELSE 0 END + EXCLUDED.completed_today,
+        failed_today = CASE WHEN w.counted_on = EXCLUDED.counted_on THEN w.failed_today ELSE 0 END + EXCLUDED.failed_today,
+        counted_on = EXCLUDED.counted_on,
+        updated_at = now()
+"""
+
+# Recount a chunk of admins from `deliveries`. Terminal deliveries count as done
+# on the day they were last updated, which is when they reached that state.
+RECOUNT_SQL = """
+    WITH actual AS (
+        SELECT
+            admins.id AS admin_id,
+            count(d.id) FILTER (WHERE d.status = 'ASSIGNED') AS assigned,
+            count(d.id) FILTER (WHERE d.status = 'IN_TRANSIT') AS in_transit,
+            count(d.id) FILTER (WHERE d.status = 'COMPLETED') AS completed,
+            count(d.id) FILTER (WHERE d.status = 'FAILED') AS failed
+        FROM unnest(%(admin_ids)s::bigint[]) AS admins(id)
+        LEFT JOIN deliveries AS d
+            ON d.assigned_to_id = admins.id
+            AND (d.status IN ('ASSIGNED', 'IN_TRANSIT') OR (d.status IN ('COMPLETED', 'FAILED') AND d.updated_at >= %(day_start)s))
+        GROUP BY admins.id
+    )
+    INSERT INTO admin_workloads AS w (admin_id, assigned_count, in_transit_count, completed_today, failed_today, counted_on, updated_at)
+    SELECT admin_id, assigned, in_transit, completed, failed, %(today)s, now() FROM actual
+    ORDER BY admin_id
+    ON CONFLICT (admin_id) DO UPDATE SET
+        assigned_count = EXCLUDED.assigned_count,
+        in_transit_count = EXCLUDED.in_transit_count,
+        completed_today = EXCLUDED.completed_today,
+        failed_today = EXCLUDED.failed_today,
+        counted_on = EXCLUDED.counted_on,
+        updated_at = now()
+    WHERE (w.assigned_count, w.in_transit_count, w.completed_today, w.failed_today, w.counted_on)
+        IS DISTINCT FROM (EXCLUDED.assigned_count, EXCLUDED.in_transit_count, EXCLUDED.completed_today, EXCLUDED.failed_today, EXCLUDED.counted_on)
+"""
+
+# Pop the least-loaded admin and charge it one delivery, `ARGV[1]` times.
+# ZRANGE 0 0 and ZINCRBY are both O(log n) in the number of admins.
+PICK_SCRIPT = """
+local picked = {}
+for i = 1, tonumber(ARGV[1]) do
+    local least = redis.call('ZRANGE', KEYS[1], 0, 0)
+    if #least == 0 then
+        break
+    end
+    redis.call('ZINCRBY', KEYS[1], 1, least[1])
+    picked[i] = least[1]
+end
+return picked
+"""
+
+
+def workload_tracking_enabled():
+    return settings.DELIVERY_AUTO_DISPATCH != 'off'
+
+
+def rebuild_workload():
+    """
+    Reload the active load of every eligible admin from AdminWorkload and swap the heap in atomically.
+
+    Increments made while the count runs are lost, so this also runs
+    periodically to correct any drift. Returns the number of admins in the heap.
+    """
+    loads = dict.fromkeys(
+        AuthUser.objects.filter(role=UserRole.admin.value, is_active=True, is_deleted=False).values_list('id', flat=True), 0
+    )
+    loads.update(
+        AdminWorkload.objects.filter(admin_id__in=loads)
+        .annotate(load=F('assigned_count') + F('in_transit_count'))
+        .values_list('admin_id', 'load')
+    )
+    redis = get_redis_connection('default')
+    if not loads:
+        redis.delete(WORKLOAD_KEY)
+        return 0
+    staging_key = f"{WORKLOAD_KEY}:rebuild"
+    pipe = redis.pipeline()
+    pipe.delete(staging_key)
+    pipe.zadd(staging_key, loads)
+    pipe.rename(staging_key, WORKLOAD_KEY)
+    pipe.execute()
+    return len(loads)
+
+
+def pick_admins(count):
+    """
+    Reserve `count` admins for new assignments, least loaded first, and return their ids.
+
+    Each pick already counts towards the admin's load, so a batch is spread
+    evenly. Returns an empty list when there is no eligible admin.
+    """
+    redis = get_redis_connection('default')
+    if not redis.exists(WORKLOAD_KEY) and not rebuild_workload():
+        return []
+    return [int(admin_id) for admin_id in redis.eval(PICK_SCRIPT, 1, WORKLOAD_KEY, count)]
+
+
+def _apply(deltas):
+    try:
+        pipe = get_redis_connection('default').pipeline(transaction=False)
+        for admin_id, delta in deltas.items():
+            # XX: admins that are not eligible (or a heap not built yet) are left alone
+            pipe.zadd(WORKLOAD_KEY, {admin_id: delta}, xx=True, incr=True)
+        pipe.execute()
+    except RedisError:
+        pass  # The periodic rebuild corrects the drift
+
+
+def adjust_workload(deltas, on_commit=True):
+    """Add `{admin_id: delta}` to the heap, by default once the current transaction commits."""
+    deltas = {admin_id: delta for admin_id, delta in deltas.items() if admin_id and delta}
+    if not deltas or not workload_tracking_enabled():
+        return
+    if on_commit:
+        transaction.on_commit(lambda: _apply(deltas))
+    else:
+        _apply(deltas)
+
+
+def record_transitions(changes, charge_heap=True):
+    """
+    Account `(admin_id, old_status, new_status)` changes in the admin workload counters.
+
+    The AdminWorkload rows are updated with one statement inside the caller's
+    transaction, so they commit or roll back with the transitions themselves.
+    The Redis dispatch heap follows on commit unless `charge_heap` is False,
+    for callers that already charged it when picking the admins.
+    """
+    counters = {}
+    heap = {}
+    for admin_id, old_status, new_status in changes:
+        if not admin_id:
+            continue
+        deltas = counters.setdefault(admin_id, dict.fromkeys(COUNTER_COLUMNS.values(), 0))
+        if old_status in ACTIVE_STATUSES:
+            deltas[COUNTER_COLUMNS[old_status]] -= 1
+        if new_status in COUNTER_COLUMNS:
+            deltas[COUNTER_COLUMNS[new_status]] += 1
+        heap[admin_id] = heap.get(admin_id, 0) + (new_status in ACTIVE_STATUSES) - (old_status in ACTIVE_STATUSES)
+
+    if not counters:
+        return
+    admin_ids = list(counters)
+    with connection.cursor() as cursor:
+        cursor.execute(UPSERT_COUNTERS_SQL, [
+            timezone.localdate(),
+            admin_ids,
+            *([counters[admin_id][column] for admin_id in admin_ids] for column in COUNTER_COLUMNS.values()),
+        ])
+    if charge_heap:
+        adjust_workload(heap)
+
+
+def reconcile_workloads():
+    """
+    Recount the AdminWorkload rows of every admin from `deliveries`, a chunk of admins at a time.
+
+    Each chunk locks its counter rows before counting, so a transition committing
+    meanwhile is either seen by the count or applies its delta after the repair.
+    Returns the number of admins whose counters had drifted.
+    """
+    today = timezone.localdate()
+    day_start = timezone.make_aware(datetime.combine(today, time.min))
+    admins = AuthUser.objects.filter(role=UserRole.admin.value).order_by('id')
+    repaired = 0
+    after = 0
+    while True:
+        admin_ids = list(admins.filter(id__gt=after).values_list('id', flat=True)[:settings.ADMIN_WORKLOAD_RECONCILE_CHUNK_SIZE])
+        if not admin_ids:
+            return repaired
+        after = admin_ids[-1]
+
+        with transaction.atomic():
+            list(AdminWorkload.objects.select_for_update().filter(admin_id__in=admin_ids).order_by('admin_id').values_list('admin_id'))
+            with connection.cursor() as cursor:
+                cursor.execute(RECOUNT_SQL, {'admin_ids': admin_ids, 'day_start': day_start, 'today': today})
+                repaired += cursor.rowcount
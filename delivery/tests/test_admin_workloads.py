@@ -0,0 +1,117 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from datetime import datetime, timedelta
+
+from delivery.models import AdminWorkload, Delivery
+from delivery.services.transitions import bulk_transition_deliveries, transition_delivery
+from delivery.services.workload import reconcile_workloads
+from delivery_auth.models import AuthUser
+
+
+class AdminWorkloadsTestCase(TestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.client = APIClient()
+
+        # Create super admin user
+        self.super_admin = AuthUser.objects.create_user(
+            email='superadmin@test.com',
+            password='testpass123',
+            role='super_admin',
+            first_name='Super',
+            last_name='Admin'
+        )
+
+        # Create admin user
+        self.admin_user = AuthUser.objects.create_user(
+            email='admin@test.com',
+            password='testpass123',
+            role='admin',
+            first_name='Admin',
+            last_name='User'
+        )
+
+        # Create partner user
+        self.partner_user = AuthUser.objects.create_user(
+            email='partner@test.com',
+            password='testpass123',
+            role='partner',
+            first_name='Partner',
+            last_name='User'
+        )
+
+        delivery_date = datetime.now().date() + timedelta(days=7)
+        self.deliveries = Delivery.objects.bulk_create([
+            Delivery(product_name=f'Parcel {i}', delivery_date=delivery_date, created_by=self.partner_user)
+            for i in range(3)
+        ])
+        self.url = reverse('admin_workloads')
+
+    def counters(self):
+        workload = AdminWorkload.objects.get(admin=self.admin_user)
+        return workload.assigned_count, workload.in_transit_count, workload.completed_today, workload.failed_today
+
+    def test_transitions_update_counters(self):
+        """Test every transition moves the admin's counters in the same transaction"""
+        for delivery in self.deliveries:
+            transition_delivery(delivery.id, 'ASSIGNED', assigned_to_id=self.admin_user.id)
+        self.assertEqual(self.counters(), (3, 0, 0, 0))
+
+        bulk_transition_deliveries([(delivery.id, 'IN_TRANSIT') for delivery in self.deliveries])
+        self.assertEqual(self.counters(), (0, 3, 0, 0))
+
+        transition_delivery(self.deliveries[0].id, 'COMPLETED')
+        transition_delivery(self.deliveries[1].id, 'FAILED')
+        self.assertEqual(self.counters(), (0, 1, 1, 1))
+
+    def test_reconcile_repairs_drift(self):
+        """Test reconciliation recounts drifted counters from deliveries"""
+        transition_delivery(self.deliveries[0].id, 'ASSIGNED', assigned_to_id=self.admin_user.id)
+        Delivery.objects.filter(pk=self.deliveries[1].pk).update(status='IN_TRANSIT', assigned_to=self.admin_user)
+        AdminWorkload.objects.filter(admin=self.admin_user).update(assigned_count=42)
+
+        repaired = reconcile_workloads()
+
+        self.assertEqual(repaired, 1)
+        self.assertEqual(self.counters(), (1, 1, 0, 0))
+        self.assertEqual(reconcile_workloads(), 0)
+
+    def test_admin_reads_own_workload(self):
+        """Test an admin reads their own counters"""
+        transition_delivery(self.deliveries[0].id, 'ASSIGNED', assigned_to_id=self.admin_user.id)
+        self.client.force_authenticate(user=self.admin_user)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['assigned_count'], 1)
+
+    def test_stale_daily_counters_read_as_zero(self):
+        """Test completed/failed counts from a previous day are not reported as today's"""
+        AdminWorkload.objects.create(admin=self.admin_user, completed_today=5, counted_on=datetime.now().date() - timedelta(days=1))
+        self.client.force_authenticate(user=self.admin_user)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.data['completed_today'], 0)
+
+    def test_super_admin_lists_workloads(self):
+        """Test super admins see the workload of every admin"""
+        transition_delivery(self.deliveries[0].id, 'ASSIGNED', assigned_to_id=self.admin_user.id)
+        self.client.force_authenticate(user=self.super_admin)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['admin'], self.admin_user.id)
+
+    def test_partner_forbidden(self):
+        """Test partners have no workload to read"""
+        self.client.force_authenticate(user=self.partner_user)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,110 @@
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from datetime import datetime, timedelta
+
+from delivery.models import Delivery
+from delivery.services.dispatch import dispatch_deliveries
+from delivery.services.transitions import transition_delivery
+from delivery_auth.models import AuthUser
+from notification.models import Notification
+
+
+class AutoDispatchTestCase(TestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.client = APIClient()
+
+        # Create admin users
+        self.admin_user = AuthUser.objects.create_user(
+            email='admin@test.com',
+            password='testpass123',
+            role='admin',
+            first_name='Admin',
+            last_name='User'
+        )
+        self.other_admin = AuthUser.objects.create_user(
+            email='admin2@test.com',
+            password='testpass123',
+            role='admin',
+            first_name='Other',
+            last_name='Admin'
+        )
+
+        # Create partner user
+        self.partner_user = AuthUser.objects.create_user(
+            email='partner@test.com',
+            password='testpass123',
+            role='partner',
+            first_name='Partner',
+            last_name='User'
+        )
+
+        today = datetime.now().date()
+        self.later = Delivery.objects.create(product_name='Later', delivery_date=today + timedelta(days=3), created_by=self.partner_user)
+        self.sooner = Delivery.objects.create(product_name='Sooner', delivery_date=today + timedelta(days=1), created_by=self.partner_user)
+
+    @patch('delivery.services.dispatch.pick_admins')
+    def test_dispatch_assigns_picked_admins(self, pick_admins):
+        """Test waiting deliveries are assigned in delivery date order to the admins picked from the heap"""
+        pick_admins.return_value = [self.admin_user.id, self.other_admin.id]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            assigned = dispatch_deliveries()
+
+        self.assertEqual(assigned, 2)
+        pick_admins.assert_called_once_with(2)
+        self.sooner.refresh_from_db()
+        self.later.refresh_from_db()
+        self.assertEqual((self.sooner.status, self.sooner.assigned_to_id), ('ASSIGNED', self.admin_user.id))
+        self.assertEqual(self.later.assigned_to_id, self.other_admin.id)
+        self.assertEqual(Notification.objects.get(delivery=self.later).message, 'Your delivery for Later has been assigned to Other Admin')
+
+    @patch('delivery.services.dispatch.pick_admins')
+    def test_dispatch_only_given_deliveries(self, pick_admins):
+        """Test dispatching by id leaves other deliveries alone"""
+        pick_admins.return_value = [self.admin_user.id]
+
+        dispatch_deliveries(delivery_ids=[self.later.id])
+
+        self.sooner.refresh_from_db()
+        self.assertEqual(self.sooner.status, 'CREATED')
+
+    @patch('delivery.services.dispatch.pick_admins', return_value=[])
+    def test_dispatch_without_admins(self, pick_admins):
+        """Test nothing is assigned when there is no eligible admin"""
+        self.assertEqual(dispatch_deliveries(), 0)
+        self.assertFalse(Delivery.objects.filter(status='ASSIGNED').exists())
+
+    @override_settings(DELIVERY_AUTO_DISPATCH='on_create')
+    @patch('delivery.services.dispatch.pick_admins')
+    def test_dispatch_on_create(self, pick_admins):
+        """Test a new delivery is dispatched once its request commits"""
+        pick_admins.return_value = [self.other_admin.id]
+        self.client.force_authenticate(user=self.partner_user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('request_deliveries'), {
+                'delivery_date': (datetime.now().date() + timedelta(days=2)).strftime('%Y-%m-%d'),
+                'product_name': 'Fresh',
+            }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        delivery = Delivery.objects.get(pk=response.data['data']['id'])
+        self.assertEqual((delivery.status, delivery.assigned_to_id), ('ASSIGNED', self.other_admin.id))
+
+    @patch('delivery.services.workload.adjust_workload')
+    def test_transitions_keep_workload_in_sync(self, adjust_workload):
+        """Test assignment charges the admin and a terminal status releases the load"""
+        transition_delivery(self.sooner.id, 'ASSIGNED', assigned_to_id=self.admin_user.id)
+        transition_delivery(self.sooner.id, 'IN_TRANSIT')
+        transition_delivery(self.sooner.id, 'COMPLETED')
+
+        self.assertEqual([call.args[0] for call in adjust_workload.call_args_list], [
+            {self.admin_user.id: 1},
+            {self.admin_user.id: 0},
+            {self.admin_user.id: -1},
+        ])
@@ -0,0 +1,103 @@
+import fakeredis
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from datetime import datetime, timedelta
+from redis.exceptions import ConnectionError as RedisConnectionError
+from unittest.mock import patch
+
+from delivery.services import idempotency
+from delivery_auth.models import AuthUser
+from utils.bloom_filter import RedisBloomFilter
+
+LEDGER_READ = 'FROM "idempotency_keys"'
+
+
+class RedisBloomFilterTestCase(TestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.redis = fakeredis.FakeRedis()
+        patcher = patch('utils.bloom_filter.get_redis_connection', return_value=self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.bloom_filter = RedisBloomFilter(name='test:bloom', capacity=1000, error_rate=0.001, period=3600)
+
+    def test_added_items_may_be_contained(self):
+        """Test added items are reported as maybe seen and others as not seen"""
+        self.bloom_filter.add_many(f'1:key-{index}' for index in range(100))
+        self.bloom_filter.add('2:other')
+
+        self.assertTrue(self.bloom_filter.might_contain('1:key-7'))
+        self.assertTrue(self.bloom_filter.might_contain('2:other'))
+        self.assertFalse(self.bloom_filter.might_contain('1:key-100'))
+        self.assertEqual(self.bloom_filter.might_contain_many(['1:key-1', '1:key-500', '2:other', '3:new']), {'1:key-1', '2:other'})
+        self.assertEqual(self.bloom_filter.might_contain_many([]), set())
+
+    def test_generation_rotation(self):
+        """Test items are still found one period later and forgotten after two"""
+        with patch('utils.bloom_filter.time.time', return_value=10_000):
+            self.bloom_filter.add('1:old')
+        with patch('utils.bloom_filter.time.time', return_value=10_000 + 3600):
+            self.assertTrue(self.bloom_filter.might_contain('1:old'))
+            self.bloom_filter.add('1:recent')
+        with patch('utils.bloom_filter.time.time', return_value=10_000 + 2 * 3600):
+            self.assertEqual(self.bloom_filter.might_contain_many(['1:old', '1:recent']), {'1:recent'})
+        self.assertLessEqual(self.redis.ttl('test:bloom:3'), 2 * 3600)
+
+    def test_redis_errors_answer_maybe(self):
+        """Test an unavailable Redis makes every item a maybe and adding a no-op"""
+        with patch('utils.bloom_filter.get_redis_connection', side_effect=RedisConnectionError):
+            self.bloom_filter.add('1:key')
+            self.assertEqual(self.bloom_filter.might_contain_many(['1:key', '1:other']), {'1:key', '1:other'})
+
+
+@override_settings(IDEMPOTENCY_BLOOM_FILTER_ENABLED=True, IDEMPOTENCY_BLOOM_FILTER_CAPACITY=1000)
+class IdempotencyBloomFilterTestCase(TestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.client = APIClient()
+
+        # Create partner user
+        self.partner_user = AuthUser.objects.create_user(
+            email='partner@test.com',
+            password='testpass123',
+            role='partner',
+            first_name='Partner',
+            last_name='User'
+        )
+
+        self.redis = fakeredis.FakeRedis()
+        for patcher in [
+            patch('utils.bloom_filter.get_redis_connection', return_value=self.redis),
+            patch.object(idempotency, '_bloom_filter', None),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.url = reverse('request_deliveries')
+        self.valid_data = {
+            'delivery_date': (datetime.now().date() + timedelta(days=7)).strftime('%Y-%m-%d'),
+            'product_name': 'Test Product',
+        }
+
+    def test_request_checks_ledger_only_for_maybe_seen_keys(self):
+        """Test a fresh key skips the ledger read and a repeated one is caught by it"""
+        self.client.force_authenticate(user=self.partner_user)
+
+        with CaptureQueriesContext(connection) as queries, self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, self.valid_data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertFalse([query for query in queries.captured_queries if LEDGER_READ in query['sql']])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, self.valid_data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertTrue([query for query in queries.captured_queries if LEDGER_READ in query['sql']])
+
+        # Without Redis every key is a maybe, so duplicates are still found in the ledger
+        with patch('utils.bloom_filter.get_redis_connection', side_effect=RedisConnectionError):
+            response = self.client.post(self.url, self.valid_data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
@@ -0,0 +1,154 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from datetime import datetime, timedelta
+
+from delivery.models import Delivery
+from delivery_auth.models import AuthUser
+from notification.models import Notification
+
+
+class BulkAssignDeliveriesTestCase(TestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.client = APIClient()
+
+        # Create super admin user
+        self.super_admin = AuthUser.objects.create_user(
+            email='superadmin@test.com',
+            password='testpass123',
+            role='super_admin',
+            first_name='Super',
+            last_name='Admin'
+        )
+
+        # Create admin users
+        self.admin_user = AuthUser.objects.create_user(
+            email='admin@test.com',
+            password='testpass123',
+            role='admin',
+            first_name='Admin',
+            last_name='User'
+        )
+        self.other_admin = AuthUser.objects.create_user(
+            email='admin2@test.com',
+            password='testpass123',
+            role='admin',
+            first_name='Other',
+            last_name='Admin'
+        )
+
+        # Create partner user
+        self.partner_user = AuthUser.objects.create_user(
+            email='partner@test.com',
+            password='testpass123',
+            role='partner',
+            first_name='Partner',
+            last_name='User'
+        )
+
+        delivery_date = datetime.now().date() + timedelta(days=7)
+        self.deliveries = Delivery.objects.bulk_create([
+            Delivery(product_name=f'Parcel {i}', status='CREATED', delivery_date=delivery_date, created_by=self.partner_user)
+            for i in range(4)
+        ])
+
+        self.url = reverse('bulk_assign_deliveries')
+
+    def test_bulk_assign_success(self):
+        """Test deliveries are assigned to several admins and every creator is notified"""
+        self.client.force_authenticate(user=self.super_admin)
+
+        payload = [
+            {'id': self.deliveries[0].id, 'assigned_to': self.admin_user.id},
+            {'id': self.deliveries[1].id, 'assigned_to': self.admin_user.id},
+            {'id': self.deliveries[2].id, 'assigned_to': self.other_admin.id},
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(self.url, payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data['summary'], {'assigned': 3, 'failed': 0})
+        self.deliveries[2].refresh_from_db()
+        self.assertEqual((self.deliveries[2].status, self.deliveries[2].assigned_to_id), ('ASSIGNED', self.other_admin.id))
+        notification = Notification.objects.get(delivery=self.deliveries[2])
+        self.assertEqual(notification.message, 'Your delivery for Parcel 2 has been assigned to Other Admin')
+        self.assertEqual(Notification.objects.filter(notification_type='delivery_assigned').count(), 3)
+
+    def test_bulk_assign_mixed_results(self):
+        """Test non-admins, unknown users, assigned and missing deliveries fail per item"""
+        Delivery.objects.filter(pk=self.deliveries[1].pk).update(status='ASSIGNED', assigned_to=self.admin_user)
+        self.client.force_authenticate(user=self.super_admin)
+
+        payload = [
+            {'id': self.deliveries[0].id, 'assigned_to': self.partner_user.id},
+            {'id': self.deliveries[0].id, 'assigned_to': 999999},
+            {'id': self.deliveries[1].id, 'assigned_to': self.admin_user.id},
+            {'id': 999999, 'assigned_to': self.admin_user.id},
+            {'id': self.deliveries[3].id, 'assigned_to': self.admin_user.id},
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(self.url, payload, format='json')
+
+        messages = [result.get('message') for result in response.data['results']]
+        self.assertEqual(messages[0], 'User is not an admin')
+        self.assertEqual(messages[1], 'User not found')
+        self.assertIn('Invalid transition from ASSIGNED to ASSIGNED', messages[2])
+        self.assertEqual(messages[3], 'Delivery not found')
+        self.assertEqual(response.data['results'][4]['result'], 'assigned')
+        self.assertEqual(Notification.objects.count(), 1)
+
+    def test_bulk_assign_keeps_existing_assignee(self):
+        """Test a CREATED delivery that already has an assignee is not moved to another admin"""
+        Delivery.objects.filter(pk=self.deliveries[0].pk).update(assigned_to=self.admin_user)
+        self.client.force_authenticate(user=self.super_admin)
+
+        response = self.client.patch(self.url, [{'id': self.deliveries[0].id, 'assigned_to': self.other_admin.id}], format='json')
+
+        self.assertEqual(response.data['summary'], {'assigned': 0, 'failed': 1})
+        self.assertEqual(response.data['results'][0]['message'], 'Delivery is already assigned to an admin')
+        self.deliveries[0].refresh_from_db()
+        self.assertEqual((self.deliveries[0].status, self.deliveries[0].assigned_to_id), ('CREATED', self.admin_user.id))
+
+    def test_bulk_assign_query_count_is_constant(self):
+        """Test the number of queries does not grow with the number of deliveries"""
+        self.client.force_authenticate(user=self.super_admin)
+        delivery_date = datetime.now().date() + timedelta(days=7)
+        deliveries = Delivery.objects.bulk_create([
+            Delivery(product_name=f'Bulk {i}', status='CREATED', delivery_date=delivery_date, created_by=self.partner_user)
+            for i in range(200)
+        ])
+
+        payload = [{'id': delivery.id, 'assigned_to': self.admin_user.id} for delivery in deliveries]
+        # admins, savepoint, conditional UPDATE, workload counters, release; notifications run after commit
+        with self.assertNumQueries(5):
+            response = self.client.patch(self.url, payload, format='json')
+
+        self.assertEqual(response.data['summary'], {'assigned': 200, 'failed': 0})
+
+    def test_bulk_assign_not_a_list(self):
+        """Test a non-list body is rejected"""
+        self.client.force_authenticate(user=self.super_admin)
+
+        response = self.client.patch(self.url, {'id': self.deliveries[0].id, 'assigned_to': self.admin_user.id}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_assign_rejects_boolean_ids(self):
+        """Test true is not taken for the id 1"""
+        self.client.force_authenticate(user=self.super_admin)
+
+        response = self.client.patch(self.url, [{'id': True, 'assigned_to': self.admin_user.id}, {'id': self.deliveries[0].id, 'assigned_to': True}], format='json')
+
+        self.assertEqual(response.data['summary'], {'assigned': 0, 'failed': 2})
+        self.assertEqual({result['message'] for result in response.data['results']}, {'Each item needs an integer id and assigned_to'})
+
+    def test_bulk_assign_partner_forbidden(self):
+        """Test only super admins can bulk assign deliveries"""
+        self.client.force_authenticate(user=self.partner_user)
+
+        response = self.client.patch(self.url, [{'id': self.deliveries[0].id, 'assigned_to': self.admin_user.id}], format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(Delivery.objects.filter(status='ASSIGNED').exists())
@@ -0,0 +1,159 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from datetime import datetime, timedelta
+
+from delivery.models import Delivery
+from delivery_auth.models import AuthUser
+from notification.models import Notification
+
+
+class BulkUpdateDeliveryStatusTestCase(TestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.client = APIClient()
+
+        # Create admin user
+        self.admin_user = AuthUser.objects.create_user(
+            email='admin@test.com',
+            password='testpass123',
+            role='admin',
+            first_name='Admin',
+            last_name='User'
+        )
+
+        # Create partner user
+        self.partner_user = AuthUser.objects.create_user(
+            email='partner@test.com',
+            password='testpass123',
+            role='partner',
+            first_name='Partner',
+            last_name='User'
+        )
+
+        delivery_date = datetime.now().date() + timedelta(days=7)
+        self.assigned = [
+            Delivery.objects.create(
+                product_name=f'Parcel {i}',
+                status='ASSIGNED',
+                delivery_date=delivery_date,
+                created_by=self.partner_user,
+                assigned_to=self.admin_user
+            )
+            for i in range(3)
+        ]
+        self.in_transit = Delivery.objects.create(
+            product_name='Parcel in transit',
+            status='IN_TRANSIT',
+            delivery_date=delivery_date,
+            created_by=self.partner_user,
+            assigned_to=self.admin_user
+        )
+        self.completed = Delivery.objects.create(
+            product_name='Parcel completed',
+            status='COMPLETED',
+            delivery_date=delivery_date,
+            created_by=self.partner_user,
+            assigned_to=self.admin_user
+        )
+
+        # Create another admin user
+        self.other_admin = AuthUser.objects.create_user(
+            email='other@test.com',
+            password='testpass123',
+            role='admin',
+            first_name='Other',
+            last_name='Admin'
+        )
+
+        self.url = reverse('bulk_update_deliveries')
+
+    def test_bulk_update_success(self):
+        """Test every valid transition is applied and notified"""
+        self.client.force_authenticate(user=self.admin_user)
+
+        payload = [{'id': delivery.id, 'status': 'IN_TRANSIT'} for delivery in self.assigned]
+        payload.append({'id': self.in_transit.id, 'status': 'COMPLETED'})
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(self.url, payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data['summary'], {'updated': 4, 'failed': 0})
+        self.assertEqual(Delivery.objects.filter(status='IN_TRANSIT').count(), 3)
+        self.in_transit.refresh_from_db()
+        self.assertEqual((self.in_transit.status, self.in_transit.version), ('COMPLETED', 1))
+        self.assertEqual(Notification.objects.filter(recipient=self.partner_user).count(), 4)
+        self.assertEqual(Notification.objects.get(delivery=self.in_transit).notification_type, 'delivery_completed')
+
+    def test_bulk_update_mixed_results(self):
+        """Test invalid, terminal, unknown and repeated items fail without blocking the others"""
+        self.client.force_authenticate(user=self.admin_user)
+
+        payload = [
+            {'id': self.assigned[0].id, 'status': 'IN_TRANSIT'},
+            {'id': self.assigned[0].id, 'status': 'IN_TRANSIT'},
+            {'id': self.assigned[1].id, 'status': 'COMPLETED'},
+            {'id': self.completed.id, 'status': 'FAILED'},
+            {'id': 999999, 'status': 'IN_TRANSIT'},
+            {'status': 'IN_TRANSIT'},
+            {'id': True, 'status': 'IN_TRANSIT'},
+        ]
+        response = self.client.patch(self.url, payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual([r['result'] for r in response.data['results']], ['updated'] + ['failed'] * 6)
+        self.assertEqual(response.data['results'][6]['message'], 'Each item needs an integer id and a status')
+        self.assertIn('more than once', response.data['results'][1]['message'])
+        self.assertIn('Invalid transition from ASSIGNED to COMPLETED', response.data['results'][2]['message'])
+        self.assertIn('terminal state', response.data['results'][3]['message'])
+        self.assertEqual(response.data['results'][4]['message'], 'Delivery not found')
+        self.assigned[1].refresh_from_db()
+        self.assertEqual(self.assigned[1].status, 'ASSIGNED')
+
+    def test_bulk_update_query_count_is_constant(self):
+        """Test the number of queries does not grow with the number of items"""
+        self.client.force_authenticate(user=self.admin_user)
+        delivery_date = datetime.now().date() + timedelta(days=7)
+        deliveries = Delivery.objects.bulk_create([
+            Delivery(product_name=f'Bulk {i}', status='ASSIGNED', delivery_date=delivery_date, created_by=self.partner_user, assigned_to=self.admin_user)
+            for i in range(200)
+        ])
+
+        payload = [{'id': delivery.id, 'status': 'IN_TRANSIT'} for delivery in deliveries]
+        # savepoint, locked read, one UPDATE for the single (from, to) group, workload counters, release;
+        # notifications run after commit
+        with self.assertNumQueries(5):
+            response = self.client.patch(self.url, payload, format='json')
+
+        self.assertEqual(response.data['summary'], {'updated': 200, 'failed': 0})
+
+    def test_bulk_update_not_a_list(self):
+        """Test a non-list body is rejected"""
+        self.client.force_authenticate(user=self.admin_user)
+
+        response = self.client.patch(self.url, {'id': self.assigned[0].id, 'status': 'IN_TRANSIT'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_update_unauthenticated(self):
+        """Test unauthenticated users cannot update deliveries"""
+        response = self.client.patch(self.url, [{'id': self.assigned[0].id, 'status': 'IN_TRANSIT'}], format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_bulk_update_restricted_to_own_deliveries(self):
+        """Test partners cannot bulk update and admins only update the deliveries assigned to them"""
+        payload = [{'id': self.assigned[0].id, 'status': 'IN_TRANSIT'}]
+
+        self.client.force_authenticate(user=self.partner_user)
+        response = self.client.patch(self.url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(user=self.other_admin)
+        response = self.client.patch(self.url, payload, format='json')
+        self.assertEqual(response.data['summary'], {'updated': 0, 'failed': 1})
+        self.assertEqual(response.data['results'][0]['message'], 'Delivery not found')
+
+        self.assigned[0].refresh_from_db()
+        self.assertEqual(self.assigned[0].status, 'ASSIGNED')
@@ -0,0 +1,143 @@
+import threading
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from datetime import datetime, timedelta
+
+from delivery.models import Delivery
+from delivery.services.transitions import claim_deliveries
+from delivery_auth.models import AuthUser
+from notification.models import Notification
+
+
+class ClaimDeliveriesTestCase(TestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.client = APIClient()
+
+        # Create admin user
+        self.admin_user = AuthUser.objects.create_user(
+            email='admin@test.com',
+            password='testpass123',
+            role='admin',
+            first_name='Admin',
+            last_name='User'
+        )
+
+        # Create partner user
+        self.partner_user = AuthUser.objects.create_user(
+            email='partner@test.com',
+            password='testpass123',
+            role='partner',
+            first_name='Partner',
+            last_name='User'
+        )
+
+        today = datetime.now().date()
+        self.late = Delivery.objects.create(product_name='Late', delivery_date=today + timedelta(days=9), delivery_address='1 Lakeside, Pokhara', created_by=self.partner_user)
+        self.soon = Delivery.objects.create(product_name='Soon', delivery_date=today + timedelta(days=1), delivery_address='2 Thamel, Kathmandu', created_by=self.partner_user)
+        self.middle = Delivery.objects.create(product_name='Middle', delivery_date=today + timedelta(days=5), delivery_address='3 Patan, Lalitpur', created_by=self.partner_user)
+        self.assigned = Delivery.objects.create(product_name='Taken', status='ASSIGNED', delivery_date=today, assigned_to=self.admin_user, created_by=self.partner_user)
+
+        self.url = reverse('claim_deliveries')
+
+    def test_claim_earliest_first(self):
+        """Test deliveries are claimed in delivery date order and assigned to the caller"""
+        self.client.force_authenticate(user=self.admin_user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, {'count': 2}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['id'] for item in response.data['data']], [self.soon.id, self.middle.id])
+        self.soon.refresh_from_db()
+        self.assertEqual((self.soon.status, self.soon.assigned_to_id), ('ASSIGNED', self.admin_user.id))
+        self.assertEqual(Notification.objects.filter(notification_type='delivery_assigned').count(), 2)
+
+    def test_claim_by_area(self):
+        """Test the area filter only claims matching addresses"""
+        self.client.force_authenticate(user=self.admin_user)
+
+        response = self.client.post(self.url, {'count': 5, 'area': 'pokhara'}, format='json')
+
+        self.assertEqual([item['id'] for item in response.data['data']], [self.late.id])
+
+    def test_claim_by_area_wildcards_match_literally(self):
+        """Test LIKE wildcards in the area only match addresses containing them"""
+        self.client.force_authenticate(user=self.admin_user)
+        percent = Delivery.objects.create(product_name='Percent', delivery_date=datetime.now().date(), delivery_address='4 100% Road, Bhaktapur', created_by=self.partner_user)
+
+        for area in ['%', '_', '\\']:
+            response = self.client.post(self.url, {'count': 5, 'area': area}, format='json')
+            self.assertEqual([item['id'] for item in response.data['data']], [percent.id] if area == '%' else [])
+
+        self.assertEqual(Delivery.objects.filter(status='CREATED').count(), 3)
+
+    def test_claim_never_returns_claimed_deliveries(self):
+        """Test claiming again only returns what is left"""
+        self.client.force_authenticate(user=self.admin_user)
+
+        self.client.post(self.url, {'count': 2}, format='json')
+        response = self.client.post(self.url, {'count': 5}, format='json')
+
+        self.assertEqual([item['id'] for item in response.data['data']], [self.late.id])
+        response = self.client.post(self.url, {'count': 5}, format='json')
+        self.assertEqual(response.data['data'], [])
+
+    def test_claim_invalid_count(self):
+        """Test count must be between 1 and the maximum"""
+        self.client.force_authenticate(user=self.admin_user)
+
+        response = self.client.post(self.url, {'count': 500}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_claim_non_admin_forbidden(self):
+        """Test partner users cannot claim deliveries"""
+        self.client.force_authenticate(user=self.partner_user)
+
+        response = self.client.post(self.url, {'count': 1}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ConcurrentClaimDeliveriesTestCase(TransactionTestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.admins = [
+            AuthUser.objects.create_user(email=f'admin{i}@test.com', password='testpass123', role='admin')
+            for i in range(4)
+        ]
+        delivery_date = datetime.now().date() + timedelta(days=1)
+        Delivery.objects.bulk_create([Delivery(product_name=f'Parcel {i}', delivery_date=delivery_date) for i in range(40)])
+
+    def test_concurrent_claims_do_not_overlap(self):
+        """Test admins claiming at the same time never get the same delivery"""
+        claimed = {}
+        barrier = threading.Barrier(len(self.admins))
+
+        def claimer(admin):
+            barrier.wait()
+            claimed[admin.id] = []
+            try:
+                while True:
+                    deliveries = claim_deliveries(admin.id, 3)
+                    if not deliveries:
+                        break
+                    claimed[admin.id].extend(delivery.id for delivery in deliveries)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=claimer, args=(admin,)) for admin in self.admins]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        all_claimed = [pk for ids in claimed.values() for pk in ids]
+        self.assertEqual(len(all_claimed), 40)
+        self.assertEqual(len(set(all_claimed)), 40)
+        self.assertFalse(Delivery.objects.filter(status='CREATED').exists())
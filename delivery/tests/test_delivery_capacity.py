@@ -0,0 +1,185 @@
+import json
+import threading
+
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from datetime import datetime, timedelta
+
+from delivery.models import Delivery, DeliveryCapacity, IdempotencyKey
+from delivery.services.capacity import reserve_capacity, set_capacity
+from delivery.services.ingestion import write_entries
+from delivery_auth.models import AuthUser
+from utils.geohash import encode
+
+
+class DeliveryCapacityTestCase(TestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.client = APIClient()
+
+        # Create super admin user
+        self.super_admin = AuthUser.objects.create_user(
+            email='superadmin@test.com',
+            password='testpass123',
+            role='super_admin',
+            first_name='Super',
+            last_name='Admin'
+        )
+
+        # Create partner user
+        self.partner_user = AuthUser.objects.create_user(
+            email='partner@test.com',
+            password='testpass123',
+            role='partner',
+            first_name='Partner',
+            last_name='User'
+        )
+
+        self.today = datetime.now().date()
+        self.busy_day = self.today + timedelta(days=3)
+        self.request_url = reverse('request_deliveries')
+        self.capacity_url = reverse('delivery_capacities')
+        self.available_url = reverse('available_delivery_dates')
+
+        # Kathmandu and Pokhara fall in different zones
+        self.kathmandu = (27.7172, 85.3240)
+        self.pokhara = (28.2096, 83.9586)
+
+    def request_delivery(self, product_name, coordinates=None):
+        data = {'delivery_date': self.busy_day.isoformat(), 'product_name': product_name}
+        if coordinates:
+            data['latitude'], data['longitude'] = coordinates
+        return self.client.post(self.request_url, data, format='json')
+
+    def test_set_capacity_counts_existing_deliveries(self):
+        """Test a new capacity starts from the deliveries already requested and can be changed"""
+        Delivery.objects.create(product_name='Early', delivery_date=self.busy_day, created_by=self.partner_user)
+        self.client.force_authenticate(user=self.super_admin)
+
+        response = self.client.post(self.capacity_url, {'delivery_date': self.busy_day.isoformat(), 'capacity': 5}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data['data']['capacity'], response.data['data']['booked']), (5, 1))
+
+        response = self.client.post(self.capacity_url, {'delivery_date': self.busy_day.isoformat(), 'capacity': 8}, format='json')
+        self.assertEqual((response.data['data']['capacity'], response.data['data']['booked']), (8, 1))
+        self.assertEqual(DeliveryCapacity.objects.count(), 1)
+
+        response = self.client.post(self.capacity_url, {'delivery_date': self.busy_day.isoformat(), 'capacity': 8, 'zone': 'ktm'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.client.force_authenticate(user=self.partner_user)
+        response = self.client.post(self.capacity_url, {'delivery_date': self.busy_day.isoformat(), 'capacity': 100}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_request_rejected_when_date_is_full(self):
+        """Test requests beyond the capacity are rejected and can be retried once capacity is raised"""
+        set_capacity(self.busy_day, 2)
+        self.client.force_authenticate(user=self.partner_user)
+
+        self.assertEqual(self.request_delivery('One').status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.request_delivery('Two').status_code, status.HTTP_201_CREATED)
+        response = self.request_delivery('Three')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data['message'], f'No delivery capacity left for {self.busy_day}')
+        self.assertEqual(IdempotencyKey.objects.filter(user=self.partner_user).count(), 2)
+
+        set_capacity(self.busy_day, 3)
+        self.assertEqual(self.request_delivery('Three').status_code, status.HTTP_201_CREATED)
+        self.assertEqual(DeliveryCapacity.objects.get().booked, 3)
+
+    def test_zone_capacity(self):
+        """Test a full zone only rejects deliveries located in it"""
+        set_capacity(self.busy_day, 1, zone=encode(*self.kathmandu, precision=4))
+        self.client.force_authenticate(user=self.partner_user)
+
+        self.assertEqual(self.request_delivery('Kathmandu 1', self.kathmandu).status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.request_delivery('Kathmandu 2', self.kathmandu).status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(self.request_delivery('Pokhara', self.pokhara).status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.request_delivery('Unlocated').status_code, status.HTTP_201_CREATED)
+
+    def test_batch_request_partially_admitted(self):
+        """Test a batch only creates as many deliveries as the date has room for"""
+        set_capacity(self.busy_day, 2)
+        self.client.force_authenticate(user=self.partner_user)
+        other_day = (self.busy_day + timedelta(days=1)).isoformat()
+        items = [{'delivery_date': self.busy_day.isoformat(), 'product_name': f'Product {i}'} for i in range(3)]
+        items.append({'delivery_date': other_day, 'product_name': 'Elsewhere'})
+
+        response = self.client.post(reverse('request_deliveries_batch'), items, format='json')
+
+        self.assertEqual([r['result'] for r in response.data['results']], ['created', 'created', 'invalid', 'created'])
+        self.assertIn('No delivery capacity left', response.data['results'][2]['errors']['delivery_date'][0])
+        self.assertEqual(IdempotencyKey.objects.filter(user=self.partner_user).count(), 3)
+        self.assertEqual(DeliveryCapacity.objects.get().booked, 2)
+
+    def test_async_entry_full(self):
+        """Test the ingest writer answers entries for a full date with `full`"""
+        set_capacity(self.busy_day, 1)
+        fields = json.dumps({'delivery_date': self.busy_day.isoformat(), 'product_name': 'Queued'})
+        entries = [
+            {'ticket': f't{i}', 'user_id': str(self.partner_user.id), 'key': f'key-{i}', 'fields': fields}
+            for i in range(2)
+        ]
+
+        results = write_entries(entries)
+
+        self.assertEqual(results['t0'][0], 'created')
+        self.assertEqual(results['t1'], ('full', None))
+        self.assertFalse(IdempotencyKey.objects.filter(key='key-1').exists())
+
+    def test_available_dates(self):
+        """Test full dates are left out and limited dates report the places left"""
+        set_capacity(self.today, 0)
+        set_capacity(self.busy_day, 10)
+        set_capacity(self.busy_day, 4, zone=encode(*self.kathmandu, precision=4))
+        self.client.force_authenticate(user=self.partner_user)
+
+        response = self.client.get(self.available_url, {'days': 7})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['data']), 6)
+        self.assertNotIn(self.today, [item['delivery_date'] for item in response.data['data']])
+        by_date = {item['delivery_date']: item['remaining'] for item in response.data['data']}
+        self.assertEqual((by_date[self.busy_day], by_date[self.today + timedelta(days=1)]), (10, None))
+
+        response = self.client.get(self.available_url, {'days': 7, 'lat': self.kathmandu[0], 'lon': self.kathmandu[1]})
+        self.assertEqual({item['delivery_date']: item['remaining'] for item in response.data['data']}[self.busy_day], 4)
+
+        for params in [{'start': 'soon'}, {'days': 0}, {'days': 1000}, {'lat': 27.7}]:
+            self.assertEqual(self.client.get(self.available_url, params).status_code, status.HTTP_400_BAD_REQUEST, params)
+
+
+class ConcurrentDeliveryCapacityTestCase(TransactionTestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.partner_user = AuthUser.objects.create_user(email='partner@test.com', password='testpass123', role='partner')
+        self.delivery_date = datetime.now().date() + timedelta(days=1)
+        set_capacity(self.delivery_date, 5)
+
+    def test_concurrent_bookings_never_exceed_capacity(self):
+        """Test partners booking the same day at once never get more places than it has"""
+        admitted = []
+        barrier = threading.Barrier(12)
+
+        def booker(index):
+            barrier.wait()
+            try:
+                with transaction.atomic():
+                    if reserve_capacity([(self.delivery_date, None)])[0]:
+                        Delivery.objects.create(product_name=f'Parcel {index}', delivery_date=self.delivery_date, created_by=self.partner_user)
+                        admitted.append(index)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=booker, args=(index,)) for index in range(12)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(admitted), 5)
+        self.assertEqual(Delivery.objects.filter(delivery_date=self.delivery_date).count(), 5)
+        self.assertEqual(DeliveryCapacity.objects.get().booked, 5)
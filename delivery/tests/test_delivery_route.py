@@ -0,0 +1,125 @@
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from datetime import datetime, timedelta
+
+from delivery.models import Delivery
+from delivery.services import routing
+from delivery_auth.models import AuthUser
+
+
+class DeliveryRouteTestCase(TestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.client = APIClient()
+
+        # Create admin users
+        self.admin_user = AuthUser.objects.create_user(
+            email='admin@test.com',
+            password='testpass123',
+            role='admin',
+            first_name='Admin',
+            last_name='User'
+        )
+        self.other_admin = AuthUser.objects.create_user(
+            email='other@test.com',
+            password='testpass123',
+            role='admin',
+            first_name='Other',
+            last_name='Admin'
+        )
+
+        # Create partner user
+        self.partner_user = AuthUser.objects.create_user(
+            email='partner@test.com',
+            password='testpass123',
+            role='partner',
+            first_name='Partner',
+            last_name='User'
+        )
+
+        self.delivery_date = datetime.now().date() + timedelta(days=1)
+
+        # Stops along a street running east, requested out of order
+        self.third = self.create_delivery('Third', 27.70, 85.330)
+        self.first = self.create_delivery('First', 27.70, 85.310)
+        self.fourth = self.create_delivery('Fourth', 27.70, 85.340, status='IN_TRANSIT')
+        self.second = self.create_delivery('Second', 27.70, 85.320)
+        self.unlocated = self.create_delivery('Unlocated', None, None)
+        self.create_delivery('Done', 27.70, 85.315, status='COMPLETED')
+        self.create_delivery('Tomorrow', 27.70, 85.315, delivery_date=self.delivery_date + timedelta(days=1))
+        self.create_delivery('Not mine', 27.70, 85.315, assigned_to=self.other_admin)
+
+        self.url = reverse('delivery_route')
+        self.params = {'delivery_date': self.delivery_date.isoformat()}
+
+    def create_delivery(self, product_name, latitude, longitude, status='ASSIGNED', delivery_date=None, assigned_to=None):
+        return Delivery.objects.create(
+            product_name=product_name,
+            delivery_date=delivery_date or self.delivery_date,
+            status=status,
+            latitude=latitude,
+            longitude=longitude,
+            assigned_to=assigned_to or self.admin_user,
+            created_by=self.partner_user,
+        )
+
+    def test_route_visiting_order(self):
+        """Test the admin's active deliveries for the day come back in visiting order from the start point"""
+        self.client.force_authenticate(user=self.admin_user)
+
+        response = self.client.get(self.url, {**self.params, 'lat': 27.70, 'lon': 85.350})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        stops = response.data['data']['stops']
+        self.assertEqual([stop['id'] for stop in stops], [self.fourth.id, self.third.id, self.second.id, self.first.id])
+        self.assertEqual([stop['stop'] for stop in stops], [1, 2, 3, 4])
+        self.assertEqual([item['id'] for item in response.data['data']['unrouted']], [self.unlocated.id])
+        # 4 legs of about 0.985 km along the parallel
+        self.assertAlmostEqual(response.data['data']['distance_km'], 3.94, places=1)
+
+    def test_route_without_start_is_shortest_path(self):
+        """Test without a start point the route runs from one end of the street to the other"""
+        self.client.force_authenticate(user=self.admin_user)
+
+        response = self.client.get(self.url, self.params)
+
+        ids = [stop['id'] for stop in response.data['data']['stops']]
+        self.assertIn(ids, ([self.first.id, self.second.id, self.third.id, self.fourth.id], [self.fourth.id, self.third.id, self.second.id, self.first.id]))
+        self.assertAlmostEqual(response.data['data']['distance_km'], 2.955, places=1)
+
+    def test_route_cached_until_deliveries_change(self):
+        """Test the route is computed once and again after a delivery in it changes"""
+        self.client.force_authenticate(user=self.admin_user)
+
+        with mock.patch('delivery.services.routing.sequence_stops', wraps=routing.sequence_stops) as sequence_stops:
+            self.client.get(self.url, self.params)
+            self.client.get(self.url, self.params)
+            self.assertEqual(sequence_stops.call_count, 1)
+
+            self.unlocated.latitude, self.unlocated.longitude = 27.70, 85.325
+            self.unlocated.save()
+            response = self.client.get(self.url, self.params)
+            self.assertEqual(sequence_stops.call_count, 2)
+
+        self.assertEqual(len(response.data['data']['stops']), 5)
+        self.assertEqual(response.data['data']['unrouted'], [])
+
+    def test_route_invalid_parameters(self):
+        """Test a malformed date or a lone coordinate is rejected"""
+        self.client.force_authenticate(user=self.admin_user)
+
+        for params in [{'delivery_date': 'tomorrow'}, {**self.params, 'lat': 27.7}, {**self.params, 'lat': 27.7, 'lon': 190}]:
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
+
+    def test_route_non_admin_forbidden(self):
+        """Test only admins can get a route"""
+        self.client.force_authenticate(user=self.partner_user)
+
+        response = self.client.get(self.url, self.params)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
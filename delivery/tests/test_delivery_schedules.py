@@ -0,0 +1,146 @@
+from datetime import date
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from delivery.models import Delivery, DeliveryCapacity, DeliverySchedule, IdempotencyKey
+from delivery.services.capacity import set_capacity
+from delivery.services.schedules import expand_schedules
+from delivery_auth.models import AuthUser
+
+
+class DeliverySchedulesTestCase(TestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.client = APIClient()
+
+        # Create partner user
+        self.partner_user = AuthUser.objects.create_user(
+            email='partner@test.com',
+            password='testpass123',
+            role='partner',
+            first_name='Partner',
+            last_name='User'
+        )
+
+        # Create admin user (non-partner)
+        self.admin_user = AuthUser.objects.create_user(
+            email='admin@test.com',
+            password='testpass123',
+            role='admin',
+            first_name='Admin',
+            last_name='User'
+        )
+
+        self.url = reverse('delivery_schedules')
+        # A Monday
+        self.today = date(2026, 3, 2)
+
+    def create_schedule(self, **kwargs):
+        data = {
+            'partner': self.partner_user,
+            'product_name': 'Bread',
+            'delivery_address': '123 Test St',
+            'weekdays': [0, 2, 4],
+            'start_date': self.today,
+        }
+        data.update(kwargs)
+        return DeliverySchedule.objects.create(**data)
+
+    def test_create_schedule_success(self):
+        """Test partner can create a schedule"""
+        self.client.force_authenticate(user=self.partner_user)
+
+        response = self.client.post(self.url, {'weekdays': [4, 0, 0], 'start_date': '2026-03-02', 'product_name': 'Bread'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['data']['weekdays'], [0, 4])
+        self.assertEqual(DeliverySchedule.objects.get().partner, self.partner_user)
+
+    def test_create_schedule_invalid_weekday(self):
+        """Test weekdays outside 0-6 are rejected"""
+        self.client.force_authenticate(user=self.partner_user)
+
+        response = self.client.post(self.url, {'weekdays': [7], 'start_date': '2026-03-02'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('weekdays', response.data)
+
+    def test_create_schedule_non_partner_forbidden(self):
+        """Test non-partner user cannot create schedules"""
+        self.client.force_authenticate(user=self.admin_user)
+
+        response = self.client.post(self.url, {'weekdays': [0], 'start_date': '2026-03-02'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_expand_schedules_creates_deliveries(self):
+        """Test expansion creates one delivery per matching weekday up to the horizon"""
+        schedule = self.create_schedule()
+
+        with self.settings(DELIVERY_SCHEDULE_HORIZON_DAYS=13):
+            created = expand_schedules(today=self.today)
+
+        dates = list(Delivery.objects.filter(created_by=self.partner_user).order_by('delivery_date').values_list('delivery_date', flat=True))
+        self.assertEqual(created, 6)
+        self.assertEqual([d.weekday() for d in dates], [0, 2, 4, 0, 2, 4])
+        schedule.refresh_from_db()
+        self.assertEqual(schedule.expanded_until, date(2026, 3, 15))
+
+    def test_expand_schedules_rerun_is_noop(self):
+        """Test re-running the expansion does not create duplicates"""
+        schedule = self.create_schedule()
+
+        with self.settings(DELIVERY_SCHEDULE_HORIZON_DAYS=13):
+            expand_schedules(today=self.today)
+            # Pretend the previous run crashed before recording its progress
+            DeliverySchedule.objects.filter(pk=schedule.pk).update(expanded_until=None)
+            created = expand_schedules(today=self.today)
+
+        self.assertEqual(created, 0)
+        self.assertEqual(Delivery.objects.filter(created_by=self.partner_user).count(), 6)
+
+    def test_expand_schedules_interval_weeks(self):
+        """Test every other week is skipped with interval_weeks=2"""
+        self.create_schedule(weekdays=[0], interval_weeks=2)
+
+        with self.settings(DELIVERY_SCHEDULE_HORIZON_DAYS=27):
+            expand_schedules(today=self.today)
+
+        dates = list(Delivery.objects.order_by('delivery_date').values_list('delivery_date', flat=True))
+        self.assertEqual(dates, [date(2026, 3, 2), date(2026, 3, 16)])
+
+    def test_expand_schedules_respects_capacity(self):
+        """Test expansion skips dates without capacity left and books the ones it fills"""
+        self.create_schedule()
+        set_capacity(date(2026, 3, 4), 0)
+        set_capacity(date(2026, 3, 6), 1)
+
+        with self.settings(DELIVERY_SCHEDULE_HORIZON_DAYS=6):
+            created = expand_schedules(today=self.today)
+
+        dates = list(Delivery.objects.order_by('delivery_date').values_list('delivery_date', flat=True))
+        self.assertEqual(created, 2)
+        self.assertEqual(dates, [date(2026, 3, 2), date(2026, 3, 6)])
+        self.assertEqual(DeliveryCapacity.objects.get(delivery_date=date(2026, 3, 6)).booked, 1)
+        self.assertEqual(IdempotencyKey.objects.filter(user=self.partner_user).count(), 2)
+        self.assertEqual(DeliverySchedule.objects.get().expanded_until, date(2026, 3, 3))
+
+    def test_expand_schedules_retries_dates_without_capacity(self):
+        """Test a date refused for capacity is created by a later run once the capacity is raised"""
+        schedule = self.create_schedule()
+        set_capacity(date(2026, 3, 4), 0)
+
+        with self.settings(DELIVERY_SCHEDULE_HORIZON_DAYS=6):
+            expand_schedules(today=self.today)
+            self.assertEqual(expand_schedules(today=self.today), 0)
+            set_capacity(date(2026, 3, 4), 1)
+            created = expand_schedules(today=self.today)
+
+        dates = list(Delivery.objects.order_by('delivery_date').values_list('delivery_date', flat=True))
+        self.assertEqual(created, 1)
+        self.assertEqual(dates, [date(2026, 3, 2), date(2026, 3, 4), date(2026, 3, 6)])
+        schedule.refresh_from_db()
+        self.assertEqual(schedule.expanded_until, date(2026, 3, 8))
@@ -0,0 +1,95 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from datetime import date
+
+from delivery.models import Delivery
+from delivery.services.transitions import assign_delivery
+from delivery_auth.models import AuthUser
+
+
+class DeliverySearchTestCase(TestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.client = APIClient()
+
+        # Create admin user
+        self.admin_user = AuthUser.objects.create_user(
+            email='admin@test.com',
+            password='testpass123',
+            role='admin',
+            first_name='Ramesh',
+            last_name='Thapa'
+        )
+
+        # Create partner user
+        self.partner_user = AuthUser.objects.create_user(
+            email='partner@test.com',
+            password='testpass123',
+            role='partner',
+            first_name='Sita',
+            last_name='Sharma'
+        )
+
+        self.laptop = Delivery.objects.create(
+            product_name='Laptop Dell XPS 15',
+            delivery_date=date(2026, 11, 5),
+            delivery_address='Thamel Marg, Kathmandu',
+            created_by=self.partner_user
+        )
+        self.phone = Delivery.objects.create(
+            product_name='Phone charger',
+            delivery_date=date(2026, 11, 6),
+            delivery_address='Lakeside, Pokhara',
+            created_by=self.partner_user
+        )
+        self.bag = Delivery.objects.create(
+            product_name='Laptop bag',
+            delivery_date=date(2026, 11, 7),
+            delivery_address='Laptop Street, Kathmandu',
+            created_by=self.partner_user
+        )
+
+        self.url = reverse('list_deliveries')
+        self.client.force_authenticate(user=self.partner_user)
+
+    def search(self, term, **params):
+        response = self.client.get(self.url, {'role': 'partner', 'search': term, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item['product_name'] for item in response.data['results']]
+
+    def test_search_matches_document(self):
+        """Test substrings of any field, words in any order and dates all match"""
+        self.assertEqual(self.search('LAPT'), ['Laptop bag', 'Laptop Dell XPS 15'])
+        self.assertEqual(self.search('kathmandu dell'), ['Laptop Dell XPS 15'])
+        self.assertEqual(self.search('2026-11-06'), ['Phone charger'])
+        self.assertEqual(self.search('created'), ['Laptop bag', 'Phone charger', 'Laptop Dell XPS 15'])
+        self.assertEqual(self.search('100%'), [])
+
+    def test_search_follows_names(self):
+        """Test the document picks up assignments and renamed partners and admins"""
+        self.assertEqual(self.search('thapa'), [])
+
+        assign_delivery(self.phone.id, self.admin_user.id)
+        self.assertEqual(self.search('thapa'), ['Phone charger'])
+
+        self.admin_user.last_name = 'Gurung'
+        self.admin_user.save()
+        self.assertEqual(self.search('thapa'), [])
+        self.assertEqual(self.search('ramesh gurung'), ['Phone charger'])
+
+        self.partner_user.first_name = 'Gita'
+        self.partner_user.save()
+        self.assertEqual(len(self.search('gita')), 3)
+
+    def test_search_ranked(self):
+        """Test ranked results put product name matches before address matches"""
+        self.assertEqual(self.search('laptop', rank='true'), ['Laptop bag', 'Laptop Dell XPS 15'])
+
+        self.assertEqual(self.search('street', rank='true'), ['Laptop bag'])
+        self.laptop.delivery_address = 'Laptop Street, Kathmandu'
+        self.laptop.save()
+        self.bag.product_name = 'Bag'
+        self.bag.save()
+        self.assertEqual(self.search('laptop', rank='true'), ['Laptop Dell XPS 15', 'Bag'])
@@ -0,0 +1,134 @@
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from datetime import datetime, timedelta
+
+from delivery.models import Delivery, DeliveryStatusEvent
+from delivery.services.history import add_partitions
+from delivery_auth.models import AuthUser
+
+
+class DeliveryTimelineTestCase(TestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.client = APIClient()
+
+        # Create super admin user
+        self.super_admin = AuthUser.objects.create_user(
+            email='superadmin@test.com',
+            password='testpass123',
+            role='super_admin',
+            first_name='Super',
+            last_name='Admin'
+        )
+
+        # Create admin user
+        self.admin_user = AuthUser.objects.create_user(
+            email='admin@test.com',
+            password='testpass123',
+            role='admin',
+            first_name='Admin',
+            last_name='User'
+        )
+
+        # Create partner users
+        self.partner_user = AuthUser.objects.create_user(
+            email='partner@test.com',
+            password='testpass123',
+            role='partner',
+            first_name='Partner',
+            last_name='User'
+        )
+        self.other_partner = AuthUser.objects.create_user(
+            email='other@test.com',
+            password='testpass123',
+            role='partner',
+            first_name='Other',
+            last_name='Partner'
+        )
+
+        delivery_date = datetime.now().date() + timedelta(days=1)
+        self.delivery = Delivery.objects.create(product_name='Tracked', delivery_date=delivery_date, created_by=self.partner_user)
+        self.others = [
+            Delivery.objects.create(product_name=f'Other {i}', delivery_date=delivery_date, created_by=self.partner_user)
+            for i in range(2)
+        ]
+        self.url = reverse('delivery_timeline', kwargs={'pk': self.delivery.id})
+
+    def test_every_transition_path_is_logged(self):
+        """Test single, bulk and claimed transitions each append one event with who made them"""
+        self.client.force_authenticate(user=self.super_admin)
+        self.client.patch(reverse('assign_deliveries', kwargs={'pk': self.delivery.id}), {'assigned_to': self.admin_user.id}, format='json')
+        self.client.patch(reverse('bulk_assign_deliveries'), [{'id': self.others[0].id, 'assigned_to': self.admin_user.id}], format='json')
+
+        self.client.force_authenticate(user=self.admin_user)
+        self.client.post(reverse('claim_deliveries'), {'count': 5}, format='json')
+        self.client.patch(reverse('update_deliveries', kwargs={'pk': self.delivery.id}), {'status': 'IN_TRANSIT'}, format='json')
+        self.client.patch(reverse('bulk_update_deliveries'), [{'id': self.delivery.id, 'status': 'COMPLETED'}, {'id': self.others[1].id, 'status': 'COMPLETED'}], format='json')
+
+        events = DeliveryStatusEvent.objects.order_by('id').values_list('delivery_id', 'old_status', 'new_status', 'assigned_to_id', 'changed_by_id')
+        self.assertEqual(list(events), [
+            (self.delivery.id, 'CREATED', 'ASSIGNED', self.admin_user.id, self.super_admin.id),
+            (self.others[0].id, 'CREATED', 'ASSIGNED', self.admin_user.id, self.super_admin.id),
+            (self.others[1].id, 'CREATED', 'ASSIGNED', self.admin_user.id, self.admin_user.id),
+            (self.delivery.id, 'ASSIGNED', 'IN_TRANSIT', self.admin_user.id, self.admin_user.id),
+            (self.delivery.id, 'IN_TRANSIT', 'COMPLETED', self.admin_user.id, self.admin_user.id),
+        ])
+
+    def test_timeline(self):
+        """Test the creator, the assignee and super admins see the events in order; other partners do not"""
+        self.client.force_authenticate(user=self.super_admin)
+        self.client.patch(reverse('assign_deliveries', kwargs={'pk': self.delivery.id}), {'assigned_to': self.admin_user.id}, format='json')
+        self.client.force_authenticate(user=self.admin_user)
+        self.client.patch(reverse('update_deliveries', kwargs={'pk': self.delivery.id}), {'status': 'IN_TRANSIT'}, format='json')
+        # Rejected transitions leave no trace
+        self.client.patch(reverse('update_deliveries', kwargs={'pk': self.delivery.id}), {'status': 'CREATED'}, format='json')
+
+        for user in (self.partner_user, self.admin_user, self.super_admin):
+            self.client.force_authenticate(user=user)
+            response = self.client.get(self.url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data['data']['status'], 'IN_TRANSIT')
+            self.assertEqual([(event['old_status'], event['new_status']) for event in response.data['data']['events']], [('CREATED', 'ASSIGNED'), ('ASSIGNED', 'IN_TRANSIT')])
+
+        self.client.force_authenticate(user=self.other_partner)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_events_stored_in_monthly_partitions(self):
+        """Test partitions exist ahead of time, so events never fall into the default partition"""
+        self.assertEqual(add_partitions(), 0)
+        self.assertEqual(add_partitions(months_ahead=3), 1)
+
+        self.client.force_authenticate(user=self.super_admin)
+        self.client.patch(reverse('assign_deliveries', kwargs={'pk': self.delivery.id}), {'assigned_to': self.admin_user.id}, format='json')
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT tableoid::regclass::text FROM delivery_status_events")
+            partition = cursor.fetchone()[0]
+        self.assertEqual(partition, f"delivery_status_events_{timezone.now():%Y_%m}")
+
+    def test_add_partitions_moves_rows_out_of_default_partition(self):
+        """Test a month whose rows fell into the default partition still gets its partition, with the rows moved in"""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO delivery_status_events (delivery_id, old_status, new_status, created_at) "
+                "VALUES (%s, 'CREATED', 'ASSIGNED', date_trunc('month', now()) + interval '4 months 1 day') RETURNING created_at",
+                [self.delivery.id],
+            )
+            created_at = cursor.fetchone()[0]
+            cursor.execute("SELECT tableoid::regclass::text FROM delivery_status_events")
+            self.assertEqual(cursor.fetchone()[0], 'delivery_status_events_default')
+
+            self.assertEqual(add_partitions(months_ahead=4), 2)
+
+            cursor.execute("SELECT tableoid::regclass::text FROM delivery_status_events")
+            self.assertEqual(cursor.fetchall(), [(f"delivery_status_events_{created_at:%Y_%m}",)])
+            cursor.execute("SELECT count(*) FROM delivery_status_events_default")
+            self.assertEqual(cursor.fetchone()[0], 0)
+            cursor.execute("SELECT pg_get_expr(relpartbound, oid) FROM pg_class WHERE relname = 'delivery_status_events_default'")
+            self.assertEqual(cursor.fetchone()[0], 'DEFAULT')
+
+        self.assertEqual(DeliveryStatusEvent.objects.filter(delivery_id=self.delivery.id).count(), 1)
@@ -0,0 +1,137 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from datetime import datetime, timedelta
+
+from delivery.models import Delivery
+from delivery.services.transitions import TransitionError, transition_delivery
+from delivery_auth.models import AuthUser
+from notification.models import Notification
+
+
+class DeliveryTransitionsTestCase(TestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.client = APIClient()
+
+        # Create super admin user
+        self.super_admin = AuthUser.objects.create_user(
+            email='superadmin@test.com',
+            password='testpass123',
+            role='super_admin',
+            first_name='Super',
+            last_name='Admin'
+        )
+
+        # Create admin user
+        self.admin_user = AuthUser.objects.create_user(
+            email='admin@test.com',
+            password='testpass123',
+            role='admin',
+            first_name='Admin',
+            last_name='User'
+        )
+
+        # Create partner user
+        self.partner_user = AuthUser.objects.create_user(
+            email='partner@test.com',
+            password='testpass123',
+            role='partner',
+            first_name='Partner',
+            last_name='User'
+        )
+
+        self.delivery = Delivery.objects.create(
+            product_name='Laptop',
+            status='CREATED',
+            delivery_date=datetime.now().date() + timedelta(days=7),
+            delivery_address='123 Main St',
+            created_by=self.partner_user
+        )
+
+    def test_transition_bumps_version(self):
+        """Test a valid transition updates the status and the version in one statement"""
+        delivery, old_status = transition_delivery(self.delivery.id, 'ASSIGNED', assigned_to_id=self.admin_user.id)
+
+        self.assertEqual(old_status, 'CREATED')
+        self.assertEqual(delivery.status, 'ASSIGNED')
+        self.assertEqual(delivery.version, 1)
+        self.delivery.refresh_from_db()
+        self.assertEqual(self.delivery.assigned_to_id, self.admin_user.id)
+
+    def test_transition_from_wrong_state_leaves_row_untouched(self):
+        """Test an invalid transition raises and does not change the delivery"""
+        with self.assertRaises(TransitionError) as context:
+            transition_delivery(self.delivery.id, 'COMPLETED')
+
+        self.assertEqual(context.exception.status_code, 400)
+        self.assertIn('Invalid transition from CREATED to COMPLETED', context.exception.message)
+        self.delivery.refresh_from_db()
+        self.assertEqual((self.delivery.status, self.delivery.version), ('CREATED', 0))
+
+    def test_assigned_requires_assignee(self):
+        """Test moving to ASSIGNED without an assignee is rejected"""
+        with self.assertRaises(TransitionError) as context:
+            transition_delivery(self.delivery.id, 'ASSIGNED')
+
+        self.assertEqual(context.exception.message, 'assigned_to is required when status is ASSIGNED')
+
+    def test_stale_version_conflict(self):
+        """Test an update with an outdated version is rejected with 409"""
+        self.client.force_authenticate(user=self.super_admin)
+        assign_url = reverse('assign_deliveries', kwargs={'pk': self.delivery.id})
+        self.client.patch(assign_url, {'assigned_to': self.admin_user.id}, format='json')
+
+        update_url = reverse('update_deliveries', kwargs={'pk': self.delivery.id})
+        response = self.client.patch(update_url, {'status': 'IN_TRANSIT', 'version': 0}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.delivery.refresh_from_db()
+        self.assertEqual(self.delivery.status, 'ASSIGNED')
+
+        response = self.client.patch(update_url, {'status': 'IN_TRANSIT', 'version': 1}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['version'], 2)
+
+    def test_boolean_version_rejected(self):
+        """Test true is not taken for version 1"""
+        self.client.force_authenticate(user=self.super_admin)
+
+        response = self.client.patch(reverse('assign_deliveries', kwargs={'pk': self.delivery.id}), {'assigned_to': self.admin_user.id, 'version': False}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['message'], 'version must be an integer')
+
+        self.client.patch(reverse('assign_deliveries', kwargs={'pk': self.delivery.id}), {'assigned_to': self.admin_user.id}, format='json')
+        response = self.client.patch(reverse('update_deliveries', kwargs={'pk': self.delivery.id}), {'status': 'IN_TRANSIT', 'version': True}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['message'], 'version must be an integer')
+        self.delivery.refresh_from_db()
+        self.assertEqual(self.delivery.status, 'ASSIGNED')
+
+    def test_assign_delivery_success(self):
+        """Test a CREATED delivery is assigned and its creator notified"""
+        self.client.force_authenticate(user=self.super_admin)
+        url = reverse('assign_deliveries', kwargs={'pk': self.delivery.id})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(url, {'assigned_to': self.admin_user.id}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['status'], 'ASSIGNED')
+        self.assertEqual(response.data['data']['assigned_to'], self.admin_user.id)
+        self.assertTrue(Notification.objects.filter(delivery=self.delivery, notification_type='delivery_assigned').exists())
+
+    def test_reassign_rejected(self):
+        """Test an already assigned delivery cannot be assigned again"""
+        self.client.force_authenticate(user=self.super_admin)
+        url = reverse('assign_deliveries', kwargs={'pk': self.delivery.id})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(url, {'assigned_to': self.admin_user.id}, format='json')
+            response = self.client.patch(url, {'assigned_to': self.admin_user.id}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('Invalid transition from ASSIGNED to ASSIGNED', response.data['message'])
+        self.assertEqual(Notification.objects.filter(delivery=self.delivery).count(), 1)
@@ -0,0 +1,110 @@
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from datetime import datetime, timedelta
+
+from delivery.models import Delivery
+from delivery_auth.models import AuthUser
+from utils.gazetteer import Gazetteer
+from utils.geohash import encode
+
+GAZETTEER_SOURCE = (
+    "key,latitude,longitude\n"
+    "\"Thamel Marg, Kathmandu\",27.7154,85.3123\n"
+    "44600,27.7172,85.3240\n"
+    "Lakeside Pokhara,28.2096,83.9586\n"
+    "Durbar Square; Patan,27.6727,85.3253\n"
+    "Nowhere,north,east\n"
+    "44600,0,0\n"
+)
+
+
+class GeocodingTestCase(TestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.client = APIClient()
+
+        # Create partner user
+        self.partner_user = AuthUser.objects.create_user(
+            email='partner@test.com',
+            password='testpass123',
+            role='partner',
+            first_name='Partner',
+            last_name='User'
+        )
+
+        handle, source_path = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(handle, 'w') as file:
+            file.write(GAZETTEER_SOURCE)
+        self.addCleanup(os.remove, source_path)
+
+        self.gazetteer_path = f"{source_path}.gazetteer"
+        stdout = StringIO()
+        call_command('build_gazetteer', source_path, self.gazetteer_path, stdout=stdout)
+        self.addCleanup(os.remove, self.gazetteer_path)
+        self.build_output = stdout.getvalue()
+
+        self.delivery_date = (datetime.now().date() + timedelta(days=2)).strftime('%Y-%m-%d')
+
+    def test_build_sorted_gazetteer(self):
+        """Test the built file is sorted, normalized and skips invalid rows and repeated keys"""
+        with open(self.gazetteer_path, 'rb') as file:
+            keys = [line.split(b'\t')[0] for line in file]
+
+        self.assertEqual(keys, [b'44600', b'durbar square patan', b'lakeside pokhara', b'thamel marg kathmandu'])
+        self.assertIn('Wrote 4 entries', self.build_output)
+        self.assertIn('1 rows skipped', self.build_output)
+
+    def test_lookup(self):
+        """Test exact keys, address tails and postcodes resolve and unknown addresses do not"""
+        gazetteer = Gazetteer(self.gazetteer_path)
+        self.addCleanup(gazetteer.close)
+
+        self.assertEqual(gazetteer.get('lakeside pokhara'), (28.2096, 83.9586))
+        self.assertEqual(gazetteer.lookup('THAMEL MARG,  Kathmandu'), (27.7154, 85.3123))
+        self.assertEqual(gazetteer.lookup('12 Chhetrapati, Thamel Marg, Kathmandu'), (27.7154, 85.3123))
+        self.assertEqual(gazetteer.lookup('House 7, Kathmandu 44600'), (27.7172, 85.3240))
+        self.assertIsNone(gazetteer.lookup('Unknown Street, Biratnagar'))
+        for key in ('', '0', 'zzz', 'lakeside'):
+            self.assertIsNone(gazetteer.get(key))
+
+    def test_request_geocodes_address(self):
+        """Test a delivery requested without coordinates is placed from its address"""
+        self.client.force_authenticate(user=self.partner_user)
+        url = reverse('request_deliveries')
+
+        with override_settings(DELIVERY_GAZETTEER_PATH=self.gazetteer_path):
+            self.client.post(url, {'delivery_date': self.delivery_date, 'product_name': 'Found', 'delivery_address': 'Lakeside, Pokhara'}, format='json')
+            self.client.post(url, {'delivery_date': self.delivery_date, 'product_name': 'Pinned', 'delivery_address': 'Lakeside, Pokhara', 'latitude': 1, 'longitude': 2}, format='json')
+            response = self.client.post(url, {'delivery_date': self.delivery_date, 'product_name': 'Lost', 'delivery_address': 'Somewhere else'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        found = Delivery.objects.get(product_name='Found')
+        self.assertEqual((found.latitude, found.longitude, found.geohash), (28.2096, 83.9586, encode(28.2096, 83.9586)))
+        self.assertEqual(Delivery.objects.get(product_name='Pinned').latitude, 1)
+        self.assertIsNone(Delivery.objects.get(product_name='Lost').latitude)
+
+    def test_backfill_command(self):
+        """Test the backfill fills only deliveries with a resolvable address and no coordinates"""
+        found = Delivery.objects.create(product_name='Found', delivery_date=self.delivery_date, delivery_address='Durbar Square, Patan', created_by=self.partner_user)
+        postcode = Delivery.objects.create(product_name='Postcode', delivery_date=self.delivery_date, delivery_address='Ward 3, 44600', created_by=self.partner_user)
+        lost = Delivery.objects.create(product_name='Lost', delivery_date=self.delivery_date, delivery_address='Somewhere else', created_by=self.partner_user)
+        pinned = Delivery.objects.create(product_name='Pinned', delivery_date=self.delivery_date, delivery_address='Lakeside Pokhara', latitude=1, longitude=2, created_by=self.partner_user)
+
+        stdout = StringIO()
+        with override_settings(DELIVERY_GAZETTEER_PATH=self.gazetteer_path):
+            call_command('geocode_deliveries', '--chunk-size', '2', stdout=stdout)
+
+        self.assertIn('Geocoded 2 of 3 deliveries', stdout.getvalue())
+        for delivery in (found, postcode, lost, pinned):
+            delivery.refresh_from_db()
+        self.assertEqual((found.latitude, found.geohash), (27.6727, encode(27.6727, 85.3253)))
+        self.assertEqual(postcode.longitude, 85.3240)
+        self.assertIsNone(lost.latitude)
+        self.assertEqual(pinned.latitude, 1)
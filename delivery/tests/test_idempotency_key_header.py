@@ -0,0 +1,121 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from datetime import datetime, timedelta
+
+from delivery.models import Delivery
+from delivery_auth.models import AuthUser
+from notification.models import Notification
+
+
+class IdempotencyKeyHeaderTestCase(TestCase):
+    def setUp(self):
+        """Set up test data"""
+        cache.clear()
+        self.client = APIClient()
+
+        # Create super admin user
+        self.super_admin = AuthUser.objects.create_user(
+            email='superadmin@test.com',
+            password='testpass123',
+            role='super_admin',
+            first_name='Super',
+            last_name='Admin'
+        )
+
+        # Create admin user
+        self.admin_user = AuthUser.objects.create_user(
+            email='admin@test.com',
+            password='testpass123',
+            role='admin',
+            first_name='Admin',
+            last_name='User'
+        )
+
+        # Create partner user
+        self.partner_user = AuthUser.objects.create_user(
+            email='partner@test.com',
+            password='testpass123',
+            role='partner',
+            first_name='Partner',
+            last_name='User'
+        )
+
+        self.delivery = Delivery.objects.create(
+            product_name='Laptop',
+            status='CREATED',
+            delivery_date=datetime.now().date() + timedelta(days=7),
+            delivery_address='123 Main St',
+            created_by=self.partner_user
+        )
+
+        self.url = reverse('assign_deliveries', kwargs={'pk': self.delivery.id})
+
+    def authenticate(self, user):
+        token = RefreshToken.for_user(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_retry_is_replayed_from_cache(self):
+        """Test a retried PATCH returns the original response without running the view again"""
+        self.authenticate(self.super_admin)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response1 = self.client.patch(self.url, {'assigned_to': self.admin_user.id}, format='json', HTTP_IDEMPOTENCY_KEY='assign-1')
+            response2 = self.client.patch(self.url, {'assigned_to': self.admin_user.id}, format='json', HTTP_IDEMPOTENCY_KEY='assign-1')
+
+        self.assertEqual(response1.status_code, status.HTTP_200_OK)
+        self.assertEqual(response2.status_code, status.HTTP_200_OK)
+        self.assertEqual(response2['Idempotent-Replayed'], 'true')
+        self.assertEqual(response1.content, response2.content)
+        self.assertEqual(Notification.objects.filter(delivery=self.delivery).count(), 1)
+
+    def test_key_reused_with_different_body(self):
+        """Test reusing a key for a different payload is rejected"""
+        self.authenticate(self.super_admin)
+
+        self.client.patch(self.url, {'assigned_to': self.admin_user.id}, format='json', HTTP_IDEMPOTENCY_KEY='assign-1')
+        response = self.client.patch(self.url, {'assigned_to': self.super_admin.id}, format='json', HTTP_IDEMPOTENCY_KEY='assign-1')
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+    def test_keys_are_scoped_per_user(self):
+        """Test two users can use the same key independently"""
+        url = reverse('request_deliveries')
+        data = {'delivery_date': (datetime.now().date() + timedelta(days=3)).strftime('%Y-%m-%d'), 'product_name': 'Phone'}
+        other_partner = AuthUser.objects.create_user(email='other@test.com', password='testpass123', role='partner', first_name='Other', last_name='Partner')
+
+        self.authenticate(self.partner_user)
+        response1 = self.client.post(url, data, format='json', HTTP_IDEMPOTENCY_KEY='order-1')
+        self.authenticate(other_partner)
+        response2 = self.client.post(url, data, format='json', HTTP_IDEMPOTENCY_KEY='order-1')
+
+        self.assertEqual(response1.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response2.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(response2.has_header('Idempotent-Replayed'))
+
+    @override_settings(IDEMPOTENCY_KEY_WAIT_TIMEOUT=0)
+    def test_in_flight_request_conflict(self):
+        """Test a duplicate that gives up waiting on an in-flight request gets a 409"""
+        self.authenticate(self.super_admin)
+        response = self.client.patch(self.url, {'assigned_to': self.admin_user.id}, format='json', HTTP_IDEMPOTENCY_KEY='assign-1')
+        fingerprint = cache.get(f'idempotency:{self.super_admin.id}:assign-1')['fingerprint']
+        cache.set(f'idempotency:{self.super_admin.id}:assign-2', {'state': 'in_flight', 'fingerprint': fingerprint})
+
+        response = self.client.patch(self.url, {'assigned_to': self.admin_user.id}, format='json', HTTP_IDEMPOTENCY_KEY='assign-2')
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    def test_request_without_header_is_untouched(self):
+        """Test requests without the header keep the existing behaviour"""
+        url = reverse('request_deliveries')
+        data = {'delivery_date': (datetime.now().date() + timedelta(days=3)).strftime('%Y-%m-%d'), 'product_name': 'Phone'}
+        self.authenticate(self.partner_user)
+
+        self.client.post(url, data, format='json')
+        response = self.client.post(url, data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertFalse(response.has_header('Idempotent-Replayed'))
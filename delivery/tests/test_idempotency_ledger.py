@@ -0,0 +1,62 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from datetime import datetime, timedelta
+
+from delivery.celery_tasks import purge_idempotency_keys
+from delivery.models import IdempotencyKey
+from delivery_auth.models import AuthUser
+
+
+class IdempotencyLedgerTestCase(TestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.client = APIClient()
+
+        # Create partner user
+        self.partner_user = AuthUser.objects.create_user(
+            email='partner@test.com',
+            password='testpass123',
+            role='partner',
+            first_name='Partner',
+            last_name='User'
+        )
+
+        self.url = reverse('request_deliveries')
+        self.valid_data = {
+            'delivery_date': (datetime.now().date() + timedelta(days=7)).strftime('%Y-%m-%d'),
+            'product_name': 'Test Product',
+        }
+
+    def test_request_writes_ledger_entry(self):
+        """Test a created delivery records its key in the ledger"""
+        self.client.force_authenticate(user=self.partner_user)
+
+        response = self.client.post(self.url, self.valid_data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(IdempotencyKey.objects.filter(user=self.partner_user).count(), 1)
+
+    def test_purge_removes_expired_keys_only(self):
+        """Test the purge task deletes keys past the TTL and keeps fresh ones"""
+        IdempotencyKey.objects.create(user=self.partner_user, key='fresh')
+        expired = IdempotencyKey.objects.create(user=self.partner_user, key='expired')
+        IdempotencyKey.objects.filter(pk=expired.pk).update(created_at=timezone.now() - timedelta(days=31))
+
+        with override_settings(IDEMPOTENCY_LEDGER_TTL_DAYS=30, IDEMPOTENCY_LEDGER_PURGE_CHUNK_SIZE=1):
+            purge_idempotency_keys()
+
+        self.assertEqual(list(IdempotencyKey.objects.values_list('key', flat=True)), ['fresh'])
+
+    def test_request_allowed_again_after_purge(self):
+        """Test a payload can be requested again once its key has expired"""
+        self.client.force_authenticate(user=self.partner_user)
+
+        self.client.post(self.url, self.valid_data, format='json')
+        IdempotencyKey.objects.update(created_at=timezone.now() - timedelta(days=31))
+        purge_idempotency_keys()
+        response = self.client.post(self.url, self.valid_data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
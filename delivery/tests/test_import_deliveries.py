@@ -0,0 +1,148 @@
+import json
+import os
+import tempfile
+from datetime import date
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from delivery.models import AdminWorkload, Delivery, DeliveryCapacity, DeliveryStatusEvent
+from delivery.services.capacity import set_capacity
+from delivery_auth.models import AuthUser
+
+
+class ImportDeliveriesTestCase(TestCase):
+    def setUp(self):
+        """Set up test data"""
+        # Create partner user
+        self.partner_user = AuthUser.objects.create_user(
+            email='partner@test.com',
+            password='testpass123',
+            role='partner',
+            first_name='Partner',
+            last_name='User'
+        )
+
+        # Create admin user
+        self.admin_user = AuthUser.objects.create_user(
+            email='admin@test.com',
+            password='testpass123',
+            role='admin',
+            first_name='Admin',
+            last_name='User'
+        )
+
+    def write_file(self, suffix, content):
+        handle, path = tempfile.mkstemp(suffix=suffix)
+        with os.fdopen(handle, 'w') as file:
+            file.write(content)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def run_import(self, path, *args):
+        stdout, stderr = StringIO(), StringIO()
+        call_command('import_deliveries', path, *args, stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_import_csv(self):
+        """Test valid CSV rows are imported and invalid rows reported"""
+        path = self.write_file('.csv', (
+            "product_name,status,delivery_date,delivery_address,created_by,assigned_to\n"
+            f"Laptop,CREATED,2026-03-01,\"1 Main St, Kathmandu\",{self.partner_user.id},\n"
+            f"Phone,ASSIGNED,2026-03-02,2 Main St,{self.partner_user.id},{self.admin_user.id}\n"
+            f"Tablet,PENDING,2026-03-03,3 Main St,{self.partner_user.id},\n"
+            f"Watch,CREATED,2026-03-04,4 Main St,{self.admin_user.id},\n"
+        ))
+
+        stdout, stderr = self.run_import(path, '--chunk-size', '2')
+
+        self.assertIn('Imported 2 deliveries', stdout)
+        self.assertIn("invalid status 'PENDING'", stderr)
+        self.assertIn('is not a partner user', stderr)
+        phone = Delivery.objects.get(product_name='Phone')
+        self.assertEqual(phone.assigned_to, self.admin_user)
+        self.assertEqual(Delivery.objects.get(product_name='Laptop').delivery_address, '1 Main St, Kathmandu')
+
+    def test_import_ndjson_skips_duplicates(self):
+        """Test re-importing the same file and repeated keys create nothing twice"""
+        rows = [
+            {'product_name': 'Laptop', 'delivery_date': '2026-03-01', 'created_by': self.partner_user.id, 'idempotency_key': 'order-1'},
+            {'product_name': 'Laptop', 'delivery_date': '2026-03-01', 'created_by': self.partner_user.id, 'idempotency_key': 'order-1'},
+            {'product_name': 'Phone', 'delivery_date': '2026-03-02', 'created_by': self.partner_user.id},
+        ]
+        path = self.write_file('.ndjson', '\n'.join(json.dumps(row) for row in rows) + '\nnot json\n')
+
+        stdout, stderr = self.run_import(path)
+        self.assertIn('Imported 2 deliveries', stdout)
+        self.assertIn('not a JSON object', stderr)
+
+        stdout, _ = self.run_import(path)
+        self.assertIn('Imported 0 deliveries', stdout)
+        self.assertEqual(Delivery.objects.filter(created_by=self.partner_user).count(), 2)
+
+    def test_import_respects_capacity(self):
+        """Test rows beyond a date's capacity are rejected, booked rows counted, and retried once it is raised"""
+        set_capacity(date(2026, 3, 1), 2)
+        rows = [
+            {'product_name': f'Parcel {index}', 'delivery_date': '2026-03-01', 'created_by': self.partner_user.id, 'idempotency_key': f'order-{index}'}
+            for index in range(3)
+        ]
+        rows.append({'product_name': 'Elsewhere', 'delivery_date': '2026-03-02', 'created_by': self.partner_user.id})
+        path = self.write_file('.ndjson', '\n'.join(json.dumps(row) for row in rows) + '\n')
+
+        stdout, stderr = self.run_import(path, '--chunk-size', '3')
+        self.assertIn('Imported 3 deliveries', stdout)
+        self.assertIn('1 without capacity', stdout)
+        self.assertIn('line 3: no delivery capacity left for 2026-03-01', stderr)
+        self.assertEqual(DeliveryCapacity.objects.get().booked, 2)
+
+        set_capacity(date(2026, 3, 1), 3)
+        stdout, _ = self.run_import(path)
+        self.assertIn('Imported 1 deliveries', stdout)
+        self.assertEqual(Delivery.objects.filter(delivery_date=date(2026, 3, 1)).count(), 3)
+        self.assertEqual(DeliveryCapacity.objects.get().booked, 3)
+
+    def test_import_rejects_wrong_types_and_inconsistent_status(self):
+        """Test rows with non-string fields or a status not matching their assignee are rejected one by one"""
+        partner, admin = self.partner_user.id, self.admin_user.id
+        rows = [
+            {'product_name': 'Laptop', 'status': ['CREATED'], 'delivery_date': '2026-03-01', 'created_by': partner},
+            {'product_name': 42, 'delivery_date': '2026-03-01', 'created_by': partner},
+            {'product_name': 'Phone', 'delivery_date': '2026-03-01', 'created_by': partner, 'idempotency_key': {'id': 1}},
+            {'product_name': 'Tablet', 'status': 'IN_TRANSIT', 'delivery_date': '2026-03-01', 'created_by': partner},
+            {'product_name': 'Watch', 'status': 'CREATED', 'delivery_date': '2026-03-01', 'created_by': partner, 'assigned_to': admin},
+            {'product_name': 'Camera', 'delivery_date': '2026-03-01', 'created_by': partner},
+        ]
+        path = self.write_file('.ndjson', '\n'.join(json.dumps(row) for row in rows) + '\n')
+
+        stdout, stderr = self.run_import(path)
+
+        self.assertIn('Imported 1 deliveries', stdout)
+        self.assertIn('5 invalid', stdout)
+        self.assertIn('line 1: status must be a string', stderr)
+        self.assertIn('line 2: product_name must be a string', stderr)
+        self.assertIn('line 3: idempotency_key must be a string', stderr)
+        self.assertIn('line 4: status IN_TRANSIT requires assigned_to', stderr)
+        self.assertIn('line 5: status CREATED cannot have assigned_to', stderr)
+
+    def test_import_active_rows_update_workload_and_timeline(self):
+        """Test deliveries imported as assigned or in transit count in the admin workload and are logged"""
+        path = self.write_file('.csv', (
+            "product_name,status,delivery_date,delivery_address,created_by,assigned_to\n"
+            f"Laptop,ASSIGNED,2026-03-01,1 Main St,{self.partner_user.id},{self.admin_user.id}\n"
+            f"Phone,IN_TRANSIT,2026-03-01,2 Main St,{self.partner_user.id},{self.admin_user.id}\n"
+            f"Tablet,COMPLETED,2026-03-01,3 Main St,{self.partner_user.id},{self.admin_user.id}\n"
+            f"Watch,CREATED,2026-03-01,4 Main St,{self.partner_user.id},\n"
+        ))
+
+        self.run_import(path)
+
+        workload = AdminWorkload.objects.get(admin=self.admin_user)
+        self.assertEqual((workload.assigned_count, workload.in_transit_count, workload.completed_today), (1, 1, 0))
+        events = DeliveryStatusEvent.objects.order_by('new_status').values_list('delivery__product_name', 'old_status', 'new_status')
+        self.assertEqual(list(events), [
+            ('Laptop', 'CREATED', 'ASSIGNED'),
+            ('Tablet', 'CREATED', 'COMPLETED'),
+            ('Phone', 'CREATED', 'IN_TRANSIT'),
+        ])
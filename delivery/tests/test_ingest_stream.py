@@ -0,0 +1,86 @@
+import fakeredis
+from django.test import TestCase, override_settings
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from delivery.models import Delivery
+from delivery.services.ingestion import DEAD_LETTER_STREAM, GROUP, STREAM, drain_stream, enqueue_delivery, get_ticket, write_entries
+from delivery_auth.models import AuthUser
+
+
+@override_settings(DELIVERY_INGEST_DRAIN_SECONDS=0, DELIVERY_INGEST_MAX_WAIT_MS=10, DELIVERY_INGEST_RECLAIM_IDLE_MS=0)
+class IngestStreamTestCase(TestCase):
+    def setUp(self):
+        """Set up test data"""
+        # Create partner user
+        self.partner_user = AuthUser.objects.create_user(
+            email='partner@test.com',
+            password='testpass123',
+            role='partner',
+            first_name='Partner',
+            last_name='User'
+        )
+
+        self.redis = fakeredis.FakeRedis()
+        patcher = patch('delivery.services.ingestion.get_redis_connection', return_value=self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.delivery_date = datetime.now().date() + timedelta(days=7)
+
+    def enqueue(self, key, product_name='Test Product'):
+        return enqueue_delivery(self.partner_user.id, key, {'delivery_date': self.delivery_date, 'product_name': product_name})
+
+    def test_enqueue_and_drain(self):
+        """Test queued requests are written by the consumer group and their tickets resolved"""
+        first, second = self.enqueue('key-1', 'Laptop'), self.enqueue('key-2', 'Phone')
+        self.assertEqual(get_ticket(first)['status'], 'pending')
+
+        self.assertEqual(drain_stream(), 2)
+
+        ticket = get_ticket(first)
+        self.assertEqual(ticket['status'], 'created')
+        self.assertEqual(Delivery.objects.get(pk=ticket['delivery_id']).product_name, 'Laptop')
+        self.assertEqual(get_ticket(second)['status'], 'created')
+        self.assertEqual(self.redis.xlen(STREAM), 0)
+        self.assertEqual(self.redis.xpending(STREAM, GROUP)['pending'], 0)
+
+    def test_reclaim_pending_entries(self):
+        """Test entries read by a consumer that died before acknowledging them are reclaimed"""
+        ticket = self.enqueue('key-1')
+        self.redis.xgroup_create(STREAM, GROUP, id='0')
+        self.redis.xreadgroup(GROUP, 'crashed-worker', {STREAM: '>'})
+
+        self.assertEqual(drain_stream(), 1)
+
+        self.assertEqual(get_ticket(ticket)['status'], 'created')
+        self.assertEqual(self.redis.xpending(STREAM, GROUP)['pending'], 0)
+
+    def test_poison_entry_dead_lettered(self):
+        """Test an entry that cannot be written is dead-lettered without holding back its batch"""
+        good = self.enqueue('key-1', 'Laptop')
+        bad = self.enqueue('key-2', 'x' * 300)
+        other = self.enqueue('key-3', 'Phone')
+
+        self.assertEqual(drain_stream(), 2)
+
+        self.assertEqual(get_ticket(good)['status'], 'created')
+        self.assertEqual(get_ticket(other)['status'], 'created')
+        self.assertEqual(get_ticket(bad)['status'], 'error')
+        dead = self.redis.xrange(DEAD_LETTER_STREAM)
+        self.assertEqual(len(dead), 1)
+        self.assertEqual(dead[0][1][b'ticket'].decode(), bad)
+        self.assertIn(b'DataError', dead[0][1][b'error'])
+        self.assertEqual(self.redis.xpending(STREAM, GROUP)['pending'], 0)
+        self.assertEqual(Delivery.objects.count(), 2)
+
+    def test_replay_after_commit_resolves_delivery(self):
+        """Test an entry committed before its ticket was answered resolves to its delivery when replayed"""
+        ticket = self.enqueue('key-1')
+        # The previous consumer committed the delivery and died before answering the ticket
+        entry = {key.decode(): value.decode() for key, value in self.redis.xrange(STREAM)[0][1].items()}
+        delivery_id = write_entries([entry])[ticket][1]
+
+        drain_stream()
+
+        self.assertEqual(get_ticket(ticket), {'status': 'created', 'user_id': str(self.partner_user.id), 'delivery_id': str(delivery_id)})
+        self.assertEqual(Delivery.objects.count(), 1)
@@ -1,10 +1,14 @@
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 from datetime import datetime, timedelta
 
 from delivery.models import Delivery
+from delivery.serializers.delivery import DeliverySerializer
+from delivery.services.transitions import assign_delivery
 from delivery_auth.models import AuthUser
 
 
@@ -104,4 +108,85 @@ class ListDeliveriesTestCase(TestCase):
         """Test listing deliveries without authentication"""
         response = self.client.get(self.url, {'role': 'partner'})
 
-        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_list_deliveries_cursor_pages(self):
+        """Test cursor pages walk newest first without overlap, ignore new deliveries and lead back"""
+        for index in range(3):
+            Delivery.objects.create(product_name=f'Extra {index}', delivery_date=datetime.now().date(), created_by=self.partner_user)
+        self.client.force_authenticate(user=self.partner_user)
+
+        first = self.client.get(self.url, {'role': 'partner', 'cursor': '', 'per_page': 2})
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertNotIn('count', first.data)
+        self.assertIsNone(first.data['previous'])
+        self.assertEqual([item['product_name'] for item in first.data['results']], ['Extra 2', 'Extra 1'])
+
+        # A delivery created meanwhile does not shift the following pages
+        Delivery.objects.create(product_name='Newest', delivery_date=datetime.now().date(), created_by=self.partner_user)
+        second = self.client.get(first.data['next'])
+        self.assertEqual([item['product_name'] for item in second.data['results']], ['Extra 0', 'Phone'])
+        third = self.client.get(second.data['next'])
+        self.assertEqual([item['product_name'] for item in third.data['results']], ['Laptop'])
+        self.assertIsNone(third.data['next'])
+
+        back = self.client.get(third.data['previous'])
+        self.assertEqual(back.data['results'], second.data['results'])
+        back = self.client.get(back.data['previous'])
+        self.assertEqual([item['product_name'] for item in back.data['results']], ['Extra 2', 'Extra 1'])
+        self.assertIsNotNone(back.data['previous'])
+
+        response = self.client.get(self.url, {'role': 'partner', 'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_deliveries_cached_count(self):
+        """Test the unfiltered total is counted once and follows new and assigned deliveries"""
+        self.client.force_authenticate(user=self.partner_user)
+        self.assertEqual(self.client.get(self.url, {'role': 'partner'}).data['count'], 2)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'role': 'partner'})
+        self.assertEqual((response.data['count'], response.data['count_is_exact']), (2, True))
+        self.assertFalse([query for query in queries.captured_queries if 'COUNT(' in query['sql']])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('request_deliveries'), {'delivery_date': (datetime.now().date() + timedelta(days=3)).isoformat(), 'product_name': 'Tablet'}, format='json')
+        self.assertEqual(self.client.get(self.url, {'role': 'partner'}).data['count'], 3)
+
+        self.client.force_authenticate(user=self.admin_user)
+        self.assertEqual(self.client.get(self.url, {'role': 'admin'}).data['count'], 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            assign_delivery(Delivery.objects.get(product_name='Tablet').id, self.admin_user.id)
+        self.assertEqual(self.client.get(self.url, {'role': 'admin'}).data['count'], 2)
+
+    def test_list_deliveries_estimated_search_count(self):
+        """Test a search expected to match many rows reports an estimate until its last page"""
+        self.client.force_authenticate(user=self.partner_user)
+
+        with override_settings(PAGINATION_EXACT_COUNT_THRESHOLD=0):
+            first = self.client.get(self.url, {'role': 'partner', 'search': 'User', 'per_page': 1})
+            last = self.client.get(first.data['next'])
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertFalse(first.data['count_is_exact'])
+        self.assertIsNotNone(first.data['next'])
+        self.assertEqual((last.data['count'], last.data['count_is_exact']), (2, True))
+        self.assertIsNone(last.data['next'])
+        self.assertIsNotNone(last.data['previous'])
+
+    def test_list_deliveries_rows_match_delivery_serializer(self):
+        """Test list rows are read as projected columns and match the delivery serializer"""
+        self.client.force_authenticate(user=self.partner_user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'role': 'partner'})
+            cursor_page = self.client.get(self.url, {'role': 'partner', 'cursor': ''})
+
+        expected = DeliverySerializer(Delivery.objects.order_by('-created_at'), many=True).data
+        self.assertEqual(response.data['results'], expected)
+        self.assertEqual(cursor_page.data['results'], expected)
+        listed = [query['sql'] for query in queries.captured_queries if 'FROM "deliveries"' in query['sql'] and 'COUNT(' not in query['sql']]
+        self.assertEqual(len(listed), 2)
+        for sql in listed:
+            self.assertNotIn('"password"', sql)
+            self.assertNotIn('"search_text"', sql)
@@ -0,0 +1,129 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from datetime import datetime, timedelta
+
+from delivery.models import Delivery
+from delivery_auth.models import AuthUser
+from utils.geohash import encode
+
+
+class NearbyDeliveriesTestCase(TestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.client = APIClient()
+
+        # Create admin user
+        self.admin_user = AuthUser.objects.create_user(
+            email='admin@test.com',
+            password='testpass123',
+            role='admin',
+            first_name='Admin',
+            last_name='User'
+        )
+
+        # Create partner users
+        self.partner_user = AuthUser.objects.create_user(
+            email='partner@test.com',
+            password='testpass123',
+            role='partner',
+            first_name='Partner',
+            last_name='User'
+        )
+        self.other_partner = AuthUser.objects.create_user(
+            email='other@test.com',
+            password='testpass123',
+            role='partner',
+            first_name='Other',
+            last_name='Partner'
+        )
+
+        self.delivery_date = datetime.now().date() + timedelta(days=3)
+
+        # Around Kathmandu Durbar Square (27.7045, 85.3076)
+        self.near = self.create_delivery('Near', 27.7050, 85.3080)
+        self.close = self.create_delivery('Close', 27.7100, 85.3150)
+        self.far = self.create_delivery('Far', 27.6710, 85.4298)  # Bhaktapur, about 12.6 km away
+        self.other = self.create_delivery('Other', 27.7046, 85.3077, created_by=self.other_partner)
+        self.completed = self.create_delivery('Completed', 27.7045, 85.3076, status='COMPLETED')
+        self.without_coordinates = Delivery.objects.create(product_name='Nowhere', delivery_date=self.delivery_date, created_by=self.partner_user)
+
+        self.url = reverse('nearby_deliveries')
+
+    def create_delivery(self, product_name, latitude, longitude, status='CREATED', created_by=None):
+        return Delivery.objects.create(
+            product_name=product_name,
+            delivery_date=self.delivery_date,
+            status=status,
+            latitude=latitude,
+            longitude=longitude,
+            geohash=encode(latitude, longitude),
+            created_by=created_by or self.partner_user,
+        )
+
+    def test_radius_search_nearest_first(self):
+        """Test a radius search returns deliveries within the radius ordered by distance"""
+        self.client.force_authenticate(user=self.admin_user)
+
+        response = self.client.get(self.url, {'lat': 27.7045, 'lon': 85.3076, 'radius_km': 2})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['id'] for item in response.data['results']], [self.other.id, self.near.id, self.close.id])
+        self.assertLess(response.data['results'][0]['distance_km'], response.data['results'][2]['distance_km'])
+        self.assertAlmostEqual(response.data['results'][2]['distance_km'], 0.951, places=2)
+
+        response = self.client.get(self.url, {'lat': 27.7045, 'lon': 85.3076, 'radius_km': 15, 'limit': 10})
+        self.assertEqual(response.data['results'][-1]['id'], self.far.id)
+        self.assertEqual(response.data['count'], 4)
+
+    def test_bounding_box_search(self):
+        """Test a bounding box search returns the deliveries inside it with the requested status"""
+        self.client.force_authenticate(user=self.admin_user)
+
+        response = self.client.get(self.url, {'min_lat': 27.70, 'min_lon': 85.30, 'max_lat': 27.706, 'max_lon': 85.31, 'status': 'CREATED,COMPLETED'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item['id'] for item in response.data['results']], [self.near.id, self.other.id, self.completed.id])
+        self.assertNotIn('distance_km', response.data['results'][0])
+
+    def test_partner_sees_own_deliveries(self):
+        """Test partners only find deliveries they created"""
+        self.client.force_authenticate(user=self.other_partner)
+
+        response = self.client.get(self.url, {'lat': 27.7045, 'lon': 85.3076, 'radius_km': 20})
+
+        self.assertEqual([item['id'] for item in response.data['results']], [self.other.id])
+
+    def test_request_computes_geohash(self):
+        """Test coordinates given on request are stored with their geohash and must come as a pair"""
+        self.client.force_authenticate(user=self.partner_user)
+        request_url = reverse('request_deliveries')
+        payload = {'delivery_date': self.delivery_date.strftime('%Y-%m-%d'), 'product_name': 'Pinned', 'latitude': 27.7172, 'longitude': 85.324}
+
+        response = self.client.post(request_url, payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        delivery = Delivery.objects.get(product_name='Pinned')
+        self.assertEqual(delivery.geohash, encode(27.7172, 85.324))
+
+        response = self.client.post(request_url, {**payload, 'product_name': 'Half', 'longitude': None}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalid_parameters(self):
+        """Test missing, mixed or out of range parameters are rejected"""
+        self.client.force_authenticate(user=self.admin_user)
+
+        for params in [
+            {},
+            {'lat': 27.7, 'lon': 85.3},
+            {'lat': 27.7, 'lon': 85.3, 'radius_km': 1, 'min_lat': 27.6},
+            {'lat': 'north', 'lon': 85.3, 'radius_km': 1},
+            {'lat': 95, 'lon': 85.3, 'radius_km': 1},
+            {'lat': 27.7, 'lon': 85.3, 'radius_km': 500},
+            {'lat': 27.7, 'lon': 85.3, 'radius_km': 1, 'limit': 0},
+            {'lat': 27.7, 'lon': 85.3, 'radius_km': 1, 'status': 'LOST'},
+            {'min_lat': 27.8, 'min_lon': 85.3, 'max_lat': 27.7, 'max_lon': 85.4},
+        ]:
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
@@ -0,0 +1,119 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from datetime import datetime, timedelta
+
+from delivery.services.sweeper import sweep_stale
+from delivery_auth.models import AuthUser
+
+# Most deliveries are terminal, as in production; every 20th is waiting, assigned or on its way
+SEED_SQL = """
+    INSERT INTO deliveries (
+        product_name, status, delivery_date, delivery_address, created_by_id, assigned_to_id,
+        created_at, updated_at, is_deleted, extras
+    )
+    SELECT
+        'Parcel ' || n,
+        CASE n %% 20 WHEN 0 THEN 'CREATED' WHEN 1 THEN 'ASSIGNED' WHEN 2 THEN 'IN_TRANSIT' ELSE 'COMPLETED' END,
+        current_date + 2 - n %% 400,
+        'Ward ' || n %% 32 || ', Kathmandu',
+        (%(partners)s::bigint[])[1 + n %% cardinality(%(partners)s::bigint[])],
+        CASE WHEN n %% 20 = 0 THEN NULL ELSE (%(admins)s::bigint[])[1 + n %% cardinality(%(admins)s::bigint[])] END,
+        now() - n * interval '1 minute', now() - n * interval '1 minute', false, '{}'
+    FROM generate_series(1, %(rows)s) AS n
+"""
+
+
+class QueryPlanTestCase(TestCase):
+    """EXPLAIN the statements the delivery endpoints and jobs run, and fail on sequential scans of `deliveries`."""
+
+    def setUp(self):
+        """Set up test data"""
+        self.client = APIClient()
+
+        # Create admin user
+        self.admin_user = AuthUser.objects.create_user(
+            email='admin@test.com',
+            password='testpass123',
+            role='admin',
+            first_name='Admin',
+            last_name='User'
+        )
+
+        # Create partner user
+        self.partner_user = AuthUser.objects.create_user(
+            email='partner@test.com',
+            password='testpass123',
+            role='partner',
+            first_name='Partner',
+            last_name='User'
+        )
+
+        partners = AuthUser.objects.bulk_create([AuthUser(email=f'partner{index}@test.com', role='partner', first_name='Partner', last_name=str(index)) for index in range(39)])
+        admins = AuthUser.objects.bulk_create([AuthUser(email=f'admin{index}@test.com', role='admin', first_name='Admin', last_name=str(index)) for index in range(19)])
+        with connection.cursor() as cursor:
+            cursor.execute(SEED_SQL, {
+                'partners': [self.partner_user.id] + [user.id for user in partners],
+                'admins': [self.admin_user.id] + [user.id for user in admins],
+                'rows': 20000,
+            })
+            cursor.execute("ANALYZE deliveries")
+            cursor.execute("ANALYZE auth_user")
+
+    def sequential_scans(self, queries):
+        """Return the statements among `queries` whose plan reads `deliveries` sequentially."""
+        found = []
+        with connection.cursor() as cursor:
+            for query in queries:
+                sql = query['sql']
+                if 'deliveries' not in sql or not sql.lstrip().upper().startswith(('SELECT', 'WITH', 'UPDATE', 'INSERT', 'DELETE')):
+                    continue
+                cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}")
+                nodes = [cursor.fetchone()[0][0]['Plan']]
+                while nodes:
+                    node = nodes.pop()
+                    if node['Node Type'] == 'Seq Scan' and node.get('Relation Name') == 'deliveries':
+                        found.append(sql)
+                        break
+                    nodes.extend(node.get('Plans', []))
+        return found
+
+    def assertIndexed(self, queries):
+        scans = self.sequential_scans(queries)
+        self.assertEqual(scans, [], f"{len(scans)} statements scan deliveries sequentially:\n" + "\n\n".join(scans))
+
+    def test_list_plans(self):
+        """Test partner and admin lists, their cursor pages and searches are index scans"""
+        url = reverse('list_deliveries')
+        with CaptureQueriesContext(connection) as queries:
+            self.client.force_authenticate(user=self.partner_user)
+            self.client.get(url, {'role': 'partner'})
+            self.client.get(url, {'role': 'partner', 'page': 20})
+            first = self.client.get(url, {'role': 'partner', 'cursor': ''})
+            self.client.get(first.data['next'])
+            self.client.get(url, {'role': 'partner', 'search': 'parcel 1234'})
+            self.client.get(url, {'role': 'partner', 'search': 'ward 7', 'rank': 'true'})
+            self.client.force_authenticate(user=self.admin_user)
+            self.client.get(url, {'role': 'admin', 'page': 5})
+
+        self.assertIndexed(queries.captured_queries)
+
+    def test_admin_work_plans(self):
+        """Test the admin route and claiming work are index scans"""
+        self.client.force_authenticate(user=self.admin_user)
+        tomorrow = datetime.now().date() + timedelta(days=1)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('delivery_route'), {'delivery_date': tomorrow.isoformat()})
+            self.client.post(reverse('claim_deliveries'), {'count': 5}, format='json')
+
+        self.assertIndexed(queries.captured_queries)
+
+    def test_sweeper_plans(self):
+        """Test the stale sweep reads and updates overdue deliveries through an index"""
+        with CaptureQueriesContext(connection) as queries:
+            sweep_stale(chunk_size=100)
+
+        self.assertIndexed(queries.captured_queries)
@@ -0,0 +1,101 @@
+import json
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from delivery.models import Delivery
+from delivery.services.ingestion import write_entries
+from delivery_auth.models import AuthUser
+
+
+class RequestDeliveriesAsyncTestCase(TestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.client = APIClient()
+
+        # Create partner user
+        self.partner_user = AuthUser.objects.create_user(
+            email='partner@test.com',
+            password='testpass123',
+            role='partner',
+            first_name='Partner',
+            last_name='User'
+        )
+
+        self.url = reverse('request_deliveries') + '?mode=async'
+        self.delivery_date = (datetime.now().date() + timedelta(days=7)).strftime('%Y-%m-%d')
+        self.valid_data = {
+            'delivery_date': self.delivery_date,
+            'product_name': 'Test Product',
+            'delivery_address': '123 Test St',
+        }
+
+    def entry(self, ticket, key, product_name='Test Product'):
+        fields = {'delivery_date': self.delivery_date, 'product_name': product_name}
+        return {'ticket': ticket, 'user_id': str(self.partner_user.id), 'key': key, 'fields': json.dumps(fields)}
+
+    @patch('delivery.views.request_deliveries.enqueue_delivery')
+    def test_async_request_accepted(self, mock_enqueue):
+        """Test an async request is queued and answered with a ticket"""
+        mock_enqueue.return_value = 'ticket-1'
+        self.client.force_authenticate(user=self.partner_user)
+
+        response = self.client.post(self.url, self.valid_data, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['ticket'], 'ticket-1')
+        self.assertEqual(mock_enqueue.call_args.args[0], self.partner_user.id)
+        self.assertFalse(Delivery.objects.exists())
+
+    @patch('delivery.views.request_deliveries.enqueue_delivery')
+    def test_async_request_invalid_not_queued(self, mock_enqueue):
+        """Test invalid requests are rejected before reaching the stream"""
+        self.client.force_authenticate(user=self.partner_user)
+
+        response = self.client.post(self.url, {'product_name': 'No date'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        mock_enqueue.assert_not_called()
+
+    def test_write_entries_group_commit(self):
+        """Test the writer creates a batch at once and reports duplicates"""
+        results = write_entries([
+            self.entry('t1', 'key-1', 'Laptop'),
+            self.entry('t2', 'key-2', 'Phone'),
+            self.entry('t3', 'key-1', 'Laptop'),
+        ])
+
+        self.assertEqual(results['t1'][0], 'created')
+        self.assertEqual(results['t2'][0], 'created')
+        self.assertEqual(results['t3'], ('duplicate', None))
+        self.assertEqual(Delivery.objects.get(pk=results['t1'][1]).product_name, 'Laptop')
+
+        replay = write_entries([self.entry('t4', 'key-2', 'Phone')])
+        self.assertEqual(replay['t4'], ('duplicate', None))
+        self.assertEqual(Delivery.objects.filter(created_by=self.partner_user).count(), 2)
+
+    @patch('delivery.views.request_deliveries.get_ticket')
+    def test_ticket_status_created(self, mock_get_ticket):
+        """Test a processed ticket resolves to its delivery id"""
+        mock_get_ticket.return_value = {'status': 'created', 'user_id': str(self.partner_user.id), 'delivery_id': '42'}
+        self.client.force_authenticate(user=self.partner_user)
+
+        response = self.client.get(reverse('request_deliveries_status', kwargs={'ticket': 'ticket-1'}))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], 'created')
+        self.assertEqual(response.data['delivery_id'], 42)
+
+    @patch('delivery.views.request_deliveries.get_ticket')
+    def test_ticket_of_other_user_not_found(self, mock_get_ticket):
+        """Test a ticket cannot be read by another partner"""
+        mock_get_ticket.return_value = {'status': 'pending', 'user_id': '9999'}
+        self.client.force_authenticate(user=self.partner_user)
+
+        response = self.client.get(reverse('request_deliveries_status', kwargs={'ticket': 'ticket-1'}))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data['message'], 'Ticket not found')
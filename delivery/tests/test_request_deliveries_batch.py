@@ -0,0 +1,95 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from datetime import datetime, timedelta
+
+from delivery.models import Delivery
+from delivery_auth.models import AuthUser
+
+
+class RequestDeliveriesBatchTestCase(TestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.client = APIClient()
+
+        # Create partner user
+        self.partner_user = AuthUser.objects.create_user(
+            email='partner@test.com',
+            password='testpass123',
+            role='partner',
+            first_name='Partner',
+            last_name='User'
+        )
+
+        # Create admin user (non-partner)
+        self.admin_user = AuthUser.objects.create_user(
+            email='admin@test.com',
+            password='testpass123',
+            role='admin',
+            first_name='Admin',
+            last_name='User'
+        )
+
+        self.url = reverse('request_deliveries_batch')
+        self.single_url = reverse('request_deliveries')
+
+        delivery_date = (datetime.now().date() + timedelta(days=7)).strftime('%Y-%m-%d')
+        self.items = [
+            {'delivery_date': delivery_date, 'product_name': f'Product {i}', 'delivery_address': f'{i} Test St'}
+            for i in range(3)
+        ]
+
+    def test_batch_request_success(self):
+        """Test every valid item is created in one call"""
+        self.client.force_authenticate(user=self.partner_user)
+
+        response = self.client.post(self.url, self.items, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data['summary'], {'created': 3, 'duplicate': 0, 'invalid': 0})
+        self.assertEqual([r['result'] for r in response.data['results']], ['created'] * 3)
+        self.assertEqual(Delivery.objects.filter(created_by=self.partner_user).count(), 3)
+        self.assertEqual(response.data['results'][0]['data']['created_by_full_name'], 'Partner User')
+
+    def test_batch_request_mixed_results(self):
+        """Test invalid, in-batch duplicate and previously created items are reported per item"""
+        self.client.force_authenticate(user=self.partner_user)
+
+        # Created earlier through the single-item endpoint
+        self.client.post(self.single_url, self.items[0], format='json')
+
+        payload = [self.items[0], self.items[1], self.items[1], {'product_name': 'No date'}]
+        response = self.client.post(self.url, payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual([r['result'] for r in response.data['results']], ['duplicate', 'created', 'duplicate', 'invalid'])
+        self.assertIn('delivery_date', response.data['results'][3]['errors'])
+        self.assertEqual(Delivery.objects.filter(created_by=self.partner_user).count(), 2)
+
+    def test_batch_request_replayed(self):
+        """Test sending the same batch twice creates nothing the second time"""
+        self.client.force_authenticate(user=self.partner_user)
+
+        self.client.post(self.url, self.items, format='json')
+        response = self.client.post(self.url, self.items, format='json')
+
+        self.assertEqual(response.data['summary'], {'created': 0, 'duplicate': 3, 'invalid': 0})
+        self.assertEqual(Delivery.objects.filter(created_by=self.partner_user).count(), 3)
+
+    def test_batch_request_not_a_list(self):
+        """Test a non-list body is rejected"""
+        self.client.force_authenticate(user=self.partner_user)
+
+        response = self.client.post(self.url, self.items[0], format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['message'], 'Request body must be a non-empty list of deliveries')
+
+    def test_batch_request_non_partner_forbidden(self):
+        """Test non-partner user cannot request deliveries"""
+        self.client.force_authenticate(user=self.admin_user)
+
+        response = self.client.post(self.url, self.items, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,84 @@
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from datetime import datetime, timedelta
+
+from delivery.celery_tasks import sweep_stale_deliveries
+from delivery.models import Delivery, DeliveryStatusEvent
+from delivery.services import sweeper
+from delivery_auth.models import AuthUser
+from notification.models import Notification
+
+
+@override_settings(DELIVERY_STALE_GRACE_DAYS=1, DELIVERY_SWEEP_PAUSE_MS=0)
+class StaleSweeperTestCase(TestCase):
+    def setUp(self):
+        """Set up test data"""
+        # Create admin user
+        self.admin_user = AuthUser.objects.create_user(
+            email='admin@test.com',
+            password='testpass123',
+            role='admin',
+            first_name='Admin',
+            last_name='User'
+        )
+
+        # Create partner user
+        self.partner_user = AuthUser.objects.create_user(
+            email='partner@test.com',
+            password='testpass123',
+            role='partner',
+            first_name='Partner',
+            last_name='User'
+        )
+
+        self.today = datetime.now().date()
+        overdue = self.today - timedelta(days=3)
+        self.lost = [self.create_delivery(f'Lost {i}', 'IN_TRANSIT', overdue) for i in range(3)]
+        self.forgotten = self.create_delivery('Forgotten', 'ASSIGNED', overdue)
+        # Within the grace day
+        self.late = self.create_delivery('Late', 'IN_TRANSIT', self.today - timedelta(days=1))
+        self.waiting = self.create_delivery('Waiting', 'ASSIGNED', self.today)
+        self.done = self.create_delivery('Done', 'COMPLETED', overdue)
+
+    def create_delivery(self, product_name, status, delivery_date):
+        return Delivery.objects.create(
+            product_name=product_name,
+            status=status,
+            delivery_date=delivery_date,
+            assigned_to=self.admin_user,
+            created_by=self.partner_user,
+        )
+
+    def test_sweep_fails_in_transit_and_flags_assigned(self):
+        """Test overdue IN_TRANSIT deliveries fail like any transition and overdue ASSIGNED ones are flagged"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(sweeper.sweep_stale(today=self.today), (3, 1))
+
+        for delivery in self.lost:
+            delivery.refresh_from_db()
+            self.assertEqual((delivery.status, delivery.version), ('FAILED', 1))
+        self.assertEqual(DeliveryStatusEvent.objects.filter(new_status='FAILED', changed_by__isnull=True).count(), 3)
+        self.assertEqual(Notification.objects.filter(notification_type='delivery_failed').count(), 3)
+
+        self.forgotten.refresh_from_db()
+        self.assertEqual((self.forgotten.status, self.forgotten.extras), ('ASSIGNED', {'stale_flagged_on': self.today.isoformat()}))
+        for delivery in (self.late, self.waiting, self.done):
+            version, extras = delivery.version, delivery.extras
+            delivery.refresh_from_db()
+            self.assertEqual((delivery.version, delivery.extras), (version, extras))
+
+        # Nothing is left to do on the next run
+        self.assertEqual(sweeper.sweep_stale(today=self.today), (0, 0))
+
+    def test_sweep_in_primary_key_chunks(self):
+        """Test the sweep walks the overdue rows in id order, one locked UPDATE per chunk"""
+        with patch('delivery.services.sweeper.fail_overdue_deliveries', wraps=sweeper.fail_overdue_deliveries) as fail:
+            failed, _ = sweeper.sweep_stale(today=self.today, chunk_size=2)
+
+        self.assertEqual(failed, 3)
+        self.assertEqual([call.args[0] for call in fail.call_args_list], [[self.lost[0].id, self.lost[1].id], [self.lost[2].id]])
+
+    def test_beat_task(self):
+        """Test the beat task reports what it did"""
+        self.assertEqual(sweep_stale_deliveries(), 'Failed 3 and flagged 1 stale deliveries')
@@ -0,0 +1,100 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from datetime import datetime, timedelta
+
+from delivery.models import Delivery
+from delivery_auth.models import AuthUser
+
+
+class TrackDeliveryTestCase(TestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.client = APIClient()
+        self.addCleanup(cache.clear)
+
+        # Create admin user
+        self.admin_user = AuthUser.objects.create_user(
+            email='admin@test.com',
+            password='testpass123',
+            role='admin',
+            first_name='Admin',
+            last_name='User'
+        )
+
+        # Create partner user
+        self.partner_user = AuthUser.objects.create_user(
+            email='partner@test.com',
+            password='testpass123',
+            role='partner',
+            first_name='Partner',
+            last_name='User'
+        )
+
+        self.delivery = Delivery.objects.create(
+            product_name='Secret Parcel',
+            delivery_date=datetime.now().date() + timedelta(days=1),
+            delivery_address='12 Thamel Marg, Kathmandu',
+            status='ASSIGNED',
+            assigned_to=self.admin_user,
+            created_by=self.partner_user,
+        )
+        self.url = reverse('track_delivery', kwargs={'tracking_code': self.delivery.tracking_code})
+
+    def test_tracking_code_generated(self):
+        """Test every delivery gets its own 16 character tracking code"""
+        other = Delivery.objects.create(product_name='Other', delivery_date=self.delivery.delivery_date, created_by=self.partner_user)
+
+        self.assertRegex(self.delivery.tracking_code, r'^[0-9A-F]{16}$')
+        self.assertNotEqual(self.delivery.tracking_code, other.tracking_code)
+
+    def test_track_without_authentication(self):
+        """Test anyone with the code sees the status and timestamps but nothing about the people involved"""
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data['data']), {'tracking_code', 'status', 'delivery_date', 'created_at', 'updated_at'})
+        self.assertEqual(response.data['data']['status'], 'ASSIGNED')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=30')
+        self.assertTrue(response['ETag'])
+
+        # Codes are case insensitive
+        response = self.client.get(reverse('track_delivery', kwargs={'tracking_code': self.delivery.tracking_code.lower()}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_cached_lookup_and_not_modified(self):
+        """Test repeated lookups are served from the cache and a matching ETag gets 304"""
+        etag = self.client.get(self.url)['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_transition_invalidates_tracking(self):
+        """Test a status change is visible on the next lookup and changes the ETag"""
+        etag = self.client.get(self.url)['ETag']
+
+        self.client.force_authenticate(user=self.admin_user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(reverse('update_deliveries', kwargs={'pk': self.delivery.id}), {'status': 'IN_TRANSIT'}, format='json')
+        self.client.force_authenticate(user=None)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['status'], 'IN_TRANSIT')
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_unknown_code_not_found(self):
+        """Test unknown codes are 404 and malformed ones never reach the database"""
+        response = self.client.get(reverse('track_delivery', kwargs={'tracking_code': '0' * 16}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('track_delivery', kwargs={'tracking_code': '0' * 16}))
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+            response = self.client.get(reverse('track_delivery', kwargs={'tracking_code': 'not-a-code'}))
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
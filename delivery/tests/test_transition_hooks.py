@@ -0,0 +1,128 @@
+from unittest.mock import patch
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from kombu.exceptions import OperationalError
+from rest_framework import status
+from rest_framework.test import APIClient
+from datetime import datetime, timedelta
+
+from delivery.models import Delivery
+from delivery.services import hooks
+from delivery.services.transitions import transition_delivery
+from delivery_auth.models import AuthUser
+from notification.models import Notification
+
+
+class TransitionHookRegistryTestCase(TestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.calls = []
+        patcher = patch.dict(hooks._hooks, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def event(self, old_status, new_status, delivery_id=1):
+        return hooks.transition_event(delivery_id, old_status, new_status, None, None, 'Parcel', None)
+
+    def test_invalid_edge_rejected(self):
+        """Test hooks can only be registered on edges of the state machine"""
+        with self.assertRaises(ImproperlyConfigured):
+            hooks.on_transition(('CREATED', 'COMPLETED'))(lambda events: None)
+
+    def test_hooks_get_their_edge_in_bulk(self):
+        """Test each hook is called once with the events of its edges and a failing hook does not stop the others"""
+        @hooks.on_transition(('CREATED', 'ASSIGNED'))
+        def broken(events):
+            raise RuntimeError('webhook down')
+
+        @hooks.on_transition(('CREATED', 'ASSIGNED'), ('IN_TRANSIT', 'FAILED'))
+        def record(events):
+            self.calls.append([event['delivery_id'] for event in events])
+
+        events = [self.event('CREATED', 'ASSIGNED', 1), self.event('IN_TRANSIT', 'FAILED', 2), self.event('CREATED', 'ASSIGNED', 3)]
+        with self.assertRaisesMessage(RuntimeError, 'webhook down'):
+            hooks.run_hooks(events)
+
+        self.assertEqual(self.calls, [[1, 3], [2]])
+
+
+class TransitionHookDispatchTestCase(TransactionTestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.client = APIClient()
+
+        # Create admin user
+        self.admin_user = AuthUser.objects.create_user(
+            email='admin@test.com',
+            password='testpass123',
+            role='admin',
+            first_name='Admin',
+            last_name='User'
+        )
+
+        # Create partner user
+        self.partner_user = AuthUser.objects.create_user(
+            email='partner@test.com',
+            password='testpass123',
+            role='partner',
+            first_name='Partner',
+            last_name='User'
+        )
+
+        delivery_date = datetime.now().date() + timedelta(days=1)
+        self.deliveries = [
+            Delivery.objects.create(
+                product_name=f'Parcel {i}', delivery_date=delivery_date, status='ASSIGNED',
+                assigned_to=self.admin_user, created_by=self.partner_user
+            )
+            for i in range(3)
+        ]
+
+    def test_request_sends_one_message_after_commit(self):
+        """Test a request's transitions reach the hook queue as one message once committed"""
+        self.client.force_authenticate(user=self.admin_user)
+        payload = [{'id': delivery.id, 'status': 'IN_TRANSIT'} for delivery in self.deliveries]
+
+        with patch('delivery.celery_tasks.run_transition_hooks.delay', wraps=hooks.run_hooks) as delay:
+            response = self.client.patch(reverse('bulk_update_deliveries'), payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(delay.call_count, 1)
+        events = delay.call_args.args[0]
+        self.assertEqual(sorted(event['delivery_id'] for event in events), [delivery.id for delivery in self.deliveries])
+        self.assertEqual({event['changed_by_id'] for event in events}, {self.admin_user.id})
+        self.assertEqual(Notification.objects.filter(recipient=self.partner_user, notification_type='status_changed').count(), 3)
+
+    def test_transitions_batched_until_scope_ends(self):
+        """Test commits inside one scope are sent together and rolled back transitions never are"""
+        with patch('delivery.celery_tasks.run_transition_hooks.delay') as delay:
+            with hooks.collect():
+                transition_delivery(self.deliveries[0].id, 'IN_TRANSIT')
+                transition_delivery(self.deliveries[1].id, 'IN_TRANSIT')
+                try:
+                    with transaction.atomic():
+                        transition_delivery(self.deliveries[2].id, 'IN_TRANSIT')
+                        raise RuntimeError('roll back')
+                except RuntimeError:
+                    pass
+                self.assertEqual(delay.call_count, 0)
+
+        delay.assert_called_once()
+        self.assertEqual([event['delivery_id'] for event in delay.call_args.args[0]], [self.deliveries[0].id, self.deliveries[1].id])
+
+    def test_unreachable_broker_does_not_fail_request(self):
+        """Test committed transitions are still reported as done when their hooks cannot be queued"""
+        self.client.force_authenticate(user=self.admin_user)
+        payload = [{'id': delivery.id, 'status': 'IN_TRANSIT'} for delivery in self.deliveries]
+
+        with patch('delivery.celery_tasks.run_transition_hooks.delay', side_effect=OperationalError('broker down')) as delay, \
+                self.assertLogs('delivery.services.hooks', level='ERROR') as logs:
+            response = self.client.patch(reverse('bulk_update_deliveries'), payload, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(delay.call_count, 1)
+        self.assertIn('Could not queue transition hooks', logs.output[0])
+        self.assertEqual(Delivery.objects.filter(status='IN_TRANSIT').count(), 3)
@@ -1,13 +1,34 @@
 from django.urls import path
 
-from delivery.views.assign_deliveries import AssignDeliveries
+from delivery.views.admin_workloads import AdminWorkloads
+from delivery.views.assign_deliveries import AssignDeliveries, BulkAssignDeliveries
+from delivery.views.claim_deliveries import ClaimDeliveries
+from delivery.views.delivery_capacity import AvailableDeliveryDates, DeliveryCapacities
+from delivery.views.delivery_route import DeliveryRoute
+from delivery.views.delivery_schedules import DeliverySchedules
+from delivery.views.delivery_timeline import DeliveryTimeline
 from delivery.views.deliveries_list import ListDeliveries
-from delivery.views.request_deliveries import RequestDeliveries
-from delivery.views.update_status import UpdateDeliveryStatus
+from delivery.views.nearby_deliveries import NearbyDeliveries
+from delivery.views.request_deliveries import RequestDeliveries, RequestDeliveriesBatch, DeliveryRequestStatus
+from delivery.views.track_delivery import TrackDelivery
+from delivery.views.update_status import UpdateDeliveryStatus, BulkUpdateDeliveryStatus
 
 urlpatterns = [
     path('request/', RequestDeliveries.as_view(), name='request_deliveries'),
+    path('request/batch/', RequestDeliveriesBatch.as_view(), name='request_deliveries_batch'),
+    path('request/status/<str:ticket>/', DeliveryRequestStatus.as_view(), name='request_deliveries_status'),
     path('list/', ListDeliveries.as_view(), name='list_deliveries'),
+    path('nearby/', NearbyDeliveries.as_view(), name='nearby_deliveries'),
     path('assign/<int:pk>/', AssignDeliveries.as_view(), name='assign_deliveries'),
+    path('assign/bulk/', BulkAssignDeliveries.as_view(), name='bulk_assign_deliveries'),
+    path('claim/', ClaimDeliveries.as_view(), name='claim_deliveries'),
+    path('route/', DeliveryRoute.as_view(), name='delivery_route'),
     path('update/<int:pk>/', UpdateDeliveryStatus.as_view(), name='update_deliveries'),
+    path('update/bulk/', BulkUpdateDeliveryStatus.as_view(), name='bulk_update_deliveries'),
+    path('workload/', AdminWorkloads.as_view(), name='admin_workloads'),
+    path('schedules/', DeliverySchedules.as_view(), name='delivery_schedules'),
+    path('capacity/', DeliveryCapacities.as_view(), name='delivery_capacities'),
+    path('capacity/available/', AvailableDeliveryDates.as_view(), name='available_delivery_dates'),
+    path('timeline/<int:pk>/', DeliveryTimeline.as_view(), name='delivery_timeline'),
+    path('track/<str:tracking_code>/', TrackDelivery.as_view(), name='track_delivery'),
 ]
\ No newline at end of file
@@ -0,0 +1,54 @@
+from django.utils import timezone
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status, permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from delivery.models import AdminWorkload
+from delivery.serializers.admin_workload import AdminWorkloadSerializer
+from utils.pagination import CustomPagination
+
+
+class AdminWorkloads(APIView):
+    """
+    API view to read admin workload counters.
+
+    Admins see their own counters, super admins see every admin's. The numbers come
+    from the maintained AdminWorkload rows, so a read never counts deliveries.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = AdminWorkloadSerializer
+    pagination_class = CustomPagination
+
+    @swagger_auto_schema(
+        operation_id="admin_workloads",
+        operation_description="Admins get their own workload, super admins a paginated list of all admins.",
+        responses={
+            status.HTTP_200_OK: openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                example={"admin": 5, "assigned_count": 3, "in_transit_count": 1, "completed_today": 12, "failed_today": 0}
+            ),
+            status.HTTP_403_FORBIDDEN: openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "message": openapi.Schema(type=openapi.TYPE_STRING, example="Only admins have a workload")
+                }
+            ),
+        },
+        tags=["Delivery"]
+    )
+    def get(self, request, *args, **kwargs):
+        if request.user.role == 'super_admin':
+            queryset = AdminWorkload.objects.order_by('admin_id')
+            paginator = self.pagination_class()
+            page = paginator.paginate_queryset(queryset, request=request)
+            serializer = self.serializer_class(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
+
+        if request.user.role != 'admin':
+            return Response({"message": "Only admins have a workload"}, status=status.HTTP_403_FORBIDDEN)
+
+        workload = AdminWorkload.objects.filter(admin=request.user).first() or AdminWorkload(admin=request.user, counted_on=timezone.localdate())
+        serializer = self.serializer_class(workload)
+        return Response(serializer.data, status=status.HTTP_200_OK)
@@ -4,10 +4,9 @@ from rest_framework import status, permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from delivery.models import Delivery
 from delivery.serializers.delivery import DeliverySerializer
+from delivery.services.transitions import TransitionError, assign_delivery, bulk_assign_deliveries
 from delivery_auth.models import AuthUser
-from notification.services import NotificationService
 from utils.user_role_based_permissions import SuperAdminPermission
 
 
@@ -16,6 +15,8 @@ class AssignDeliveries(APIView):
     API view to assign a delivery to an admin user.
 
     Only super admins can assign deliveries to admin users.
+    Only CREATED deliveries can be assigned; the check and the write are one
+    conditional UPDATE, so two concurrent assignments cannot both succeed.
     """
     serializer_class = DeliverySerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -33,6 +34,11 @@ class AssignDeliveries(APIView):
                     description="ID of the admin user to assign the delivery to",
                     example=5
                 ),
+                "version": openapi.Schema(
+                    type=openapi.TYPE_INTEGER,
+                    description="Expected current version of the delivery (optional)",
+                    example=0
+                ),
             }
         ),
         responses={
@@ -80,6 +86,15 @@ class AssignDeliveries(APIView):
                     )
                 }
             ),
+            status.HTTP_409_CONFLICT: openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "message": openapi.Schema(
+                        type=openapi.TYPE_STRING,
+                        example="Delivery was modified by another request, reload it and try again"
+                    )
+                }
+            ),
         },
         tags=["Delivery"]
     )
@@ -89,32 +104,123 @@ class AssignDeliveries(APIView):
         if not assigned_to_id:
             return Response({"message": "assigned_to field is required"}, status=status.HTTP_400_BAD_REQUEST)
 
-        try:
-            delivery = Delivery.objects.get(pk=pk)
-        except Delivery.DoesNotExist:
-            return Response({"message": "Delivery not found"}, status=status.HTTP_404_NOT_FOUND)
+        expected_version = request.data.get('version')
+        if expected_version is not None and type(expected_version) is not int:
+            return Response({"message": "version must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
             auth_user = AuthUser.objects.get(id=assigned_to_id)
-        except AuthUser.DoesNotExist:
+        except (AuthUser.DoesNotExist, ValueError):
             return Response({"message": "User not found"}, status=status.HTTP_404_NOT_FOUND)
 
         if auth_user.role != 'admin':
             return Response({"message": "User is not an admin"}, status=status.HTTP_403_FORBIDDEN)
 
-        update_data = {
-            'assigned_to': assigned_to_id,
-            'status': 'ASSIGNED'
+        try:
+            # The creator is notified by a transition hook once this commits
+            delivery, _ = assign_delivery(pk, auth_user.id, expected_version=expected_version, changed_by_id=request.user.id)
+            delivery.assigned_to = auth_user
+        except TransitionError as e:
+            return Response({"message": e.message}, status=e.status_code)
+
+        serializer = self.serializer_class(delivery)
+        return Response({"message": "Delivery assigned to admin successfully", "data": serializer.data}, status=status.HTTP_200_OK)
+
+
+class BulkAssignDeliveries(APIView):
+    """
+    API view to assign many deliveries to one or more admin users at once.
+
+    The admins are checked with one query and the CREATED deliveries are assigned with
+    one conditional UPDATE, so the number of queries does not depend on the number
+    of deliveries. Notifications are sent in bulk by transition hooks after commit.
+    Only super admins can assign deliveries.
+    """
+    permission_classes = [SuperAdminPermission]
+    max_batch_size = 1000
+
+    @swagger_auto_schema(
+        operation_id="bulk_assign_delivery",
+        operation_description="Assign up to 1000 CREATED deliveries to admin users. "
+                              "Each item is reported as `assigned` or `failed`.",
+        request_body=openapi.Schema(
+            type=openapi.TYPE_ARRAY,
+            items=openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                required=["id", "assigned_to"],
+                properties={
+                    "id": openapi.Schema(type=openapi.TYPE_INTEGER, example=1),
+                    "assigned_to": openapi.Schema(type=openapi.TYPE_INTEGER, example=5),
+                }
+            )
+        ),
+        responses={
+            status.HTTP_207_MULTI_STATUS: openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "message": openapi.Schema(type=openapi.TYPE_STRING, example="Bulk Assignment Processed..."),
+                    "summary": openapi.Schema(type=openapi.TYPE_OBJECT, example={"assigned": 1, "failed": 1}),
+                    "results": openapi.Schema(
+                        type=openapi.TYPE_ARRAY,
+                        items=openapi.Schema(
+                            type=openapi.TYPE_OBJECT,
+                            example={"index": 0, "id": 1, "result": "assigned", "assigned_to": 5}
+                        )
+                    ),
+                }
+            ),
+            status.HTTP_400_BAD_REQUEST: openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "message": openapi.Schema(type=openapi.TYPE_STRING, example="Request body must be a non-empty list of assignments")
+                }
+            ),
+        },
+        tags=["Delivery"]
+    )
+    def patch(self, request, *args, **kwargs):
+        items = request.data
+
+        if not isinstance(items, list) or not items:
+            return Response({"message": "Request body must be a non-empty list of assignments"}, status=status.HTTP_400_BAD_REQUEST)
+
+        if len(items) > self.max_batch_size:
+            return Response({"message": f"A bulk assignment can contain at most {self.max_batch_size} deliveries"}, status=status.HTTP_400_BAD_REQUEST)
+
+        results = [None] * len(items)
+        admin_ids = {item['assigned_to'] for item in items if isinstance(item, dict) and type(item.get('assigned_to')) is int}
+        admins = {
+            admin['id']: admin
+            for admin in AuthUser.objects.filter(id__in=admin_ids).values('id', 'role', 'first_name', 'last_name')
         }
 
-        serializer = self.serializer_class(delivery, data=update_data, partial=True, context={'request': request})
-
-        if serializer.is_valid(raise_exception=True):
-            serializer.save()
-            NotificationService.create_delivery_notification(
-                delivery=delivery,
-                notification_type='delivery_assigned',
-                title='Delivery Assigned',
-                message=f"Your delivery for {delivery.product_name} has been assigned to {delivery.assigned_to.first_name} {delivery.assigned_to.last_name}")
-            return Response({"message": "Delivery assigned to admin successfully", "data": serializer.data}, status=status.HTTP_200_OK)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        assignments = {}
+        for index, item in enumerate(items):
+            if not isinstance(item, dict) or type(item.get('id')) is not int or type(item.get('assigned_to')) is not int:
+                results[index] = {"index": index, "result": "failed", "message": "Each item needs an integer id and assigned_to"}
+                continue
+            admin = admins.get(item['assigned_to'])
+            if admin is None:
+                results[index] = {"index": index, "id": item['id'], "result": "failed", "message": "User not found"}
+            elif admin['role'] != 'admin':
+                results[index] = {"index": index, "id": item['id'], "result": "failed", "message": "User is not an admin"}
+            elif item['id'] in assignments:
+                results[index] = {"index": index, "id": item['id'], "result": "failed", "message": "Delivery appears more than once in this request"}
+            else:
+                assignments[item['id']] = item['assigned_to']
+
+        assigned, errors = bulk_assign_deliveries(assignments, changed_by_id=request.user.id) if assignments else ({}, {})
+
+        for index, item in enumerate(items):
+            if results[index] is not None:
+                continue
+            if item['id'] in assigned:
+                results[index] = {"index": index, "id": item['id'], "result": "assigned", "assigned_to": item['assigned_to']}
+            else:
+                results[index] = {"index": index, "id": item['id'], "result": "failed", "message": errors[item['id']].message}
+
+        summary = {"assigned": 0, "failed": 0}
+        for result in results:
+            summary[result["result"]] += 1
+
+        return Response({"message": "Bulk Assignment Processed...🤗🤗", "summary": summary, "results": results}, status=status.HTTP_207_MULTI_STATUS)
@@ -0,0 +1,70 @@
+from django.db.models import prefetch_related_objects
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from delivery.serializers.delivery import DeliverySerializer
+from delivery.services.transitions import claim_deliveries
+from utils.user_role_based_permissions import AdminUserPermission
+
+
+class ClaimDeliveries(APIView):
+    """
+    API view for an admin to claim the next unassigned deliveries.
+
+    Couriers pull work themselves instead of waiting for a dispatcher. The oldest
+    CREATED deliveries (by delivery date) are assigned to the requesting admin;
+    concurrent claimers skip each other's rows, so no delivery is claimed twice.
+    """
+    permission_classes = [AdminUserPermission]
+    serializer_class = DeliverySerializer
+    max_claim_count = 50
+
+    @swagger_auto_schema(
+        operation_id="claim_deliveries",
+        operation_description="Claim up to `count` unassigned CREATED deliveries, earliest delivery date first. "
+                              "`area` only claims deliveries whose address contains it.",
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                "count": openapi.Schema(type=openapi.TYPE_INTEGER, description="Number of deliveries to claim (1-50)", example=5),
+                "area": openapi.Schema(type=openapi.TYPE_STRING, description="Part of the delivery address (optional)", example="Kathmandu"),
+            }
+        ),
+        responses={
+            status.HTTP_200_OK: openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "message": openapi.Schema(type=openapi.TYPE_STRING, example="Deliveries claimed successfully"),
+                    "data": openapi.Schema(
+                        type=openapi.TYPE_ARRAY,
+                        items=openapi.Schema(type=openapi.TYPE_OBJECT, example={"id": 1, "status": "ASSIGNED", "assigned_to": 5})
+                    ),
+                }
+            ),
+            status.HTTP_400_BAD_REQUEST: openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "message": openapi.Schema(type=openapi.TYPE_STRING, example="count must be an integer between 1 and 50")
+                }
+            ),
+        },
+        tags=["Delivery"]
+    )
+    def post(self, request, *args, **kwargs):
+        count = request.data.get('count', 1)
+        area = request.data.get('area')
+
+        if not isinstance(count, int) or isinstance(count, bool) or not 1 <= count <= self.max_claim_count:
+            return Response({"message": f"count must be an integer between 1 and {self.max_claim_count}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        if area is not None and not isinstance(area, str):
+            return Response({"message": "area must be a string"}, status=status.HTTP_400_BAD_REQUEST)
+
+        deliveries = claim_deliveries(request.user.id, count, area=area)
+
+        prefetch_related_objects(deliveries, 'created_by')
+        serializer = self.serializer_class(deliveries, many=True)
+        return Response({"message": "Deliveries claimed successfully" if deliveries else "No deliveries to claim", "data": serializer.data}, status=status.HTTP_200_OK)
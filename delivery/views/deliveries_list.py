@@ -1,13 +1,18 @@
-from django.db.models import Q
+from functools import partial
+
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status, permissions
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from delivery.models import Delivery
-from delivery.serializers.delivery import DeliverySerializer
-from utils.pagination import CustomPagination
+from delivery.serializers.delivery_row import DeliveryRowSerializer
+from delivery.services.list_counts import cached_count
+from delivery.services.search import search_deliveries
+from utils.counting import estimated_count
+from utils.pagination import CustomPagination, KeysetPagination
 
 
 class ListDeliveries(APIView):
@@ -18,11 +23,12 @@ class ListDeliveries(APIView):
     Partners can view deliveries they created.
     """
     permission_classes = [permissions.IsAuthenticated]
-    serializer_class = DeliverySerializer
+    serializer_class = DeliveryRowSerializer
     pagination_class = CustomPagination
+    keyset_pagination_class = KeysetPagination
 
     def get_queryset(self):
-        return Delivery.objects.select_related('assigned_to', 'created_by').all()
+        return Delivery.objects.all()
 
     @swagger_auto_schema(
         operation_id="list_deliveries",
@@ -47,6 +53,23 @@ class ListDeliveries(APIView):
                 required=False,
                 example='laptop'
             ),
+            openapi.Parameter(
+                'rank',
+                openapi.IN_QUERY,
+                description="With a search, 'true' lists the most relevant deliveries first instead of the most recent "
+                            "(page number pagination only).",
+                type=openapi.TYPE_STRING,
+                required=False,
+                enum=['true'],
+            ),
+            openapi.Parameter(
+                'cursor',
+                openapi.IN_QUERY,
+                description="Cursor pagination: send it empty for the first page, then follow the next/previous links. "
+                            "Pages cost the same at any depth and the response carries no count.",
+                type=openapi.TYPE_STRING,
+                required=False,
+            ),
             openapi.Parameter(
                 'page',
                 openapi.IN_QUERY,
@@ -73,6 +96,11 @@ class ListDeliveries(APIView):
                         description="Total number of deliveries",
                         example=25
                     ),
+                    "count_is_exact": openapi.Schema(
+                        type=openapi.TYPE_BOOLEAN,
+                        description="False when `count` is the planner's estimate for a large search",
+                        example=True
+                    ),
                     "next": openapi.Schema(
                         type=openapi.TYPE_STRING,
                         description="URL to next page",
@@ -89,10 +117,6 @@ class ListDeliveries(APIView):
                             type=openapi.TYPE_OBJECT,
                             properties={
                                 "id": openapi.Schema(type=openapi.TYPE_INTEGER, example=1),
-                                "idempotency_key": openapi.Schema(
-                                    type=openapi.TYPE_STRING,
-                                    example="abc123xyz"
-                                ),
                                 "product_name": openapi.Schema(
                                     type=openapi.TYPE_STRING,
                                     example="Laptop Dell XPS 15"
@@ -216,33 +240,36 @@ class ListDeliveries(APIView):
             elif role == 'partner':
                 queryset = queryset.filter(created_by=request.user)
 
+            # Order by most recent first
+            queryset = queryset.order_by('-created_at')
+
             # Apply search filters
             if search:
-                query = Q(product_name__icontains=search) | \
-                        Q(status__icontains=search) | \
-                        Q(delivery_date__icontains=search) | \
-                        Q(delivery_address__icontains=search) | \
-                        Q(assigned_to__first_name__icontains=search) | \
-                        Q(assigned_to__last_name__icontains=search) | \
-                        Q(created_by__first_name__icontains=search) | \
-                        Q(created_by__last_name__icontains=search)
-
-                queryset = queryset.filter(query)
+                queryset = search_deliveries(queryset, search, rank=request.query_params.get('rank') == 'true')
 
-            # Order by most recent first
-            queryset = queryset.order_by('-created_at')
+            # Read only the listed columns, as dicts rather than model instances
+            queryset = self.serializer_class.project(queryset)
 
             # Paginate results
-            paginator = self.pagination_class()
+            if self.keyset_pagination_class.requested(request):
+                paginator = self.keyset_pagination_class()
+            elif search:
+                # Searches are counted only when the planner expects few matches
+                paginator = self.pagination_class(count_strategy=estimated_count)
+            else:
+                paginator = self.pagination_class(count_strategy=partial(cached_count, role, request.user.id))
             page = paginator.paginate_queryset(queryset, request=request)
 
             if page is not None:
-                serializer = self.serializer_class(page, many=True, context={'request': request})
+                serializer = self.serializer_class(page)
                 return paginator.get_paginated_response(serializer.data)
 
             # If no pagination
-            serializer = self.serializer_class(queryset, many=True, context={'request': request})
+            serializer = self.serializer_class(queryset)
             return Response({"message": "Deliveries retrieved successfully", "data": serializer.data}, status=status.HTTP_200_OK)
 
+        except NotFound:
+            # Invalid page or cursor
+            raise
         except Exception as e:
             return Response({"message": "An error occurred while retrieving deliveries", "error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
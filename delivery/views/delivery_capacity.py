@@ -0,0 +1,129 @@
+from datetime import date
+
+from django.conf import settings
+from django.utils import timezone
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status, permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from delivery.models import DeliveryCapacity
+from delivery.serializers.delivery_capacity import DeliveryCapacitySerializer
+from delivery.services.capacity import ALL_ZONES, available_dates, delivery_zone, set_capacity
+from utils.geohash import encode
+from utils.pagination import CustomPagination
+from utils.user_role_based_permissions import SuperAdminPermission
+
+
+class DeliveryCapacities(APIView):
+    """
+    API view for super admins to list and set delivery capacity.
+
+    A capacity limits how many deliveries can be requested for a date, across all
+    zones or in one zone. Requests beyond it are rejected at creation time.
+    """
+    permission_classes = [SuperAdminPermission]
+    serializer_class = DeliveryCapacitySerializer
+    pagination_class = CustomPagination
+
+    @swagger_auto_schema(
+        operation_id="list_delivery_capacities",
+        operation_description="List capacities from today on, earliest date first.",
+        responses={status.HTTP_200_OK: DeliveryCapacitySerializer(many=True)},
+        tags=["Delivery"]
+    )
+    def get(self, request, *args, **kwargs):
+        queryset = DeliveryCapacity.objects.filter(delivery_date__gte=timezone.localdate()).order_by('delivery_date', 'zone')
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(queryset, request=request)
+        serializer = self.serializer_class(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    @swagger_auto_schema(
+        operation_id="set_delivery_capacity",
+        operation_description="Set the capacity of a date, or of one zone (a geohash prefix) on that date. "
+                              "A new limit starts from the deliveries already requested for it.",
+        request_body=DeliveryCapacitySerializer,
+        responses={
+            status.HTTP_200_OK: DeliveryCapacitySerializer,
+            status.HTTP_400_BAD_REQUEST: openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                example={"zone": ["zone must be empty or a geohash prefix of 4 characters"]}
+            ),
+        },
+        tags=["Delivery"]
+    )
+    def post(self, request, *args, **kwargs):
+        serializer = self.serializer_class(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        capacity = set_capacity(
+            serializer.validated_data['delivery_date'],
+            serializer.validated_data['capacity'],
+            zone=serializer.validated_data.get('zone', ALL_ZONES),
+        )
+        return Response({"message": "Delivery capacity saved", "data": self.serializer_class(capacity).data}, status=status.HTTP_200_OK)
+
+
+class AvailableDeliveryDates(APIView):
+    """
+    API view to find the dates a delivery can still be requested for.
+
+    Answered from the capacity rows alone, so it stays fast however many
+    deliveries are booked. Dates without a capacity are always available.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    default_days = 30
+
+    @swagger_auto_schema(
+        operation_id="available_delivery_dates",
+        operation_description="List the dates from `start` (default today) on which a delivery can be requested, "
+                              "with the places left (`null` when unlimited). Give `lat`/`lon` or `zone` to include zone limits.",
+        manual_parameters=[
+            openapi.Parameter('start', openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE, required=False, example='2026-02-05'),
+            openapi.Parameter('days', openapi.IN_QUERY, description="Number of days to look at (default 30)", type=openapi.TYPE_INTEGER, required=False),
+            openapi.Parameter('zone', openapi.IN_QUERY, type=openapi.TYPE_STRING, required=False, example='tuut'),
+            openapi.Parameter('lat', openapi.IN_QUERY, type=openapi.TYPE_NUMBER, required=False, example=27.7172),
+            openapi.Parameter('lon', openapi.IN_QUERY, type=openapi.TYPE_NUMBER, required=False, example=85.324),
+        ],
+        responses={
+            status.HTTP_200_OK: openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                example={"data": [{"delivery_date": "2026-02-05", "remaining": 12}, {"delivery_date": "2026-02-06", "remaining": None}]}
+            ),
+            status.HTTP_400_BAD_REQUEST: openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "message": openapi.Schema(type=openapi.TYPE_STRING, example="start must be a date in YYYY-MM-DD format")
+                }
+            ),
+        },
+        tags=["Delivery"]
+    )
+    def get(self, request, *args, **kwargs):
+        params = request.query_params
+        try:
+            start = date.fromisoformat(params['start']) if params.get('start') else timezone.localdate()
+        except ValueError:
+            return Response({"message": "start must be a date in YYYY-MM-DD format"}, status=status.HTTP_400_BAD_REQUEST)
+
+        max_days = settings.DELIVERY_AVAILABLE_DATES_MAX_DAYS
+        try:
+            days = int(params.get('days', self.default_days))
+        except ValueError:
+            days = 0
+        if not 1 <= days <= max_days:
+            return Response({"message": f"days must be an integer between 1 and {max_days}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        zone = params.get('zone', ALL_ZONES).lower()
+        if 'lat' in params or 'lon' in params:
+            try:
+                latitude, longitude = float(params['lat']), float(params['lon'])
+            except (KeyError, ValueError):
+                return Response({"message": "lat and lon must be given together as numbers"}, status=status.HTTP_400_BAD_REQUEST)
+            if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+                return Response({"message": "lat must be within [-90, 90] and lon within [-180, 180]"}, status=status.HTTP_400_BAD_REQUEST)
+            zone = delivery_zone(encode(latitude, longitude))
+
+        data = [{"delivery_date": delivery_date, "remaining": remaining} for delivery_date, remaining in available_dates(start, days, zone)]
+        return Response({"data": data}, status=status.HTTP_200_OK)
@@ -0,0 +1,84 @@
+from datetime import date
+
+from django.utils import timezone
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from delivery.serializers.delivery import DeliverySerializer
+from delivery.services.routing import plan_route
+from utils.user_role_based_permissions import AdminUserPermission
+
+
+class DeliveryRoute(APIView):
+    """
+    API view for an admin to get their deliveries for a day in visiting order.
+
+    The order is a short path through the stored coordinates of the admin's
+    ASSIGNED and IN_TRANSIT deliveries, starting from `lat`/`lon` when given.
+    It is cached until the set of deliveries or their coordinates change.
+    """
+    permission_classes = [AdminUserPermission]
+    serializer_class = DeliverySerializer
+
+    @swagger_auto_schema(
+        operation_id="delivery_route",
+        operation_description="Return the admin's active deliveries for `delivery_date` (default today) in an "
+                              "optimized visiting order. Deliveries without coordinates are listed in `unrouted`.",
+        manual_parameters=[
+            openapi.Parameter('delivery_date', openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE, required=False, example='2026-02-05'),
+            openapi.Parameter('lat', openapi.IN_QUERY, description="Starting latitude (optional)", type=openapi.TYPE_NUMBER, required=False, example=27.7172),
+            openapi.Parameter('lon', openapi.IN_QUERY, description="Starting longitude (optional)", type=openapi.TYPE_NUMBER, required=False, example=85.324),
+        ],
+        responses={
+            status.HTTP_200_OK: openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "message": openapi.Schema(type=openapi.TYPE_STRING, example="Route planned successfully"),
+                    "data": openapi.Schema(
+                        type=openapi.TYPE_OBJECT,
+                        example={"delivery_date": "2026-02-05", "distance_km": 18.4, "stops": [{"id": 3, "stop": 1}], "unrouted": []}
+                    ),
+                }
+            ),
+            status.HTTP_400_BAD_REQUEST: openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "message": openapi.Schema(type=openapi.TYPE_STRING, example="delivery_date must be a date in YYYY-MM-DD format")
+                }
+            ),
+        },
+        tags=["Delivery"]
+    )
+    def get(self, request):
+        params = request.query_params
+        try:
+            delivery_date = date.fromisoformat(params['delivery_date']) if params.get('delivery_date') else timezone.localdate()
+        except ValueError:
+            return Response({"message": "delivery_date must be a date in YYYY-MM-DD format"}, status=status.HTTP_400_BAD_REQUEST)
+
+        start = None
+        if 'lat' in params or 'lon' in params:
+            try:
+                start = (float(params['lat']), float(params['lon']))
+            except (KeyError, ValueError):
+                return Response({"message": "lat and lon must be given together as numbers"}, status=status.HTTP_400_BAD_REQUEST)
+            if not (-90 <= start[0] <= 90 and -180 <= start[1] <= 180):
+                return Response({"message": "lat must be within [-90, 90] and lon within [-180, 180]"}, status=status.HTTP_400_BAD_REQUEST)
+
+        stops, unrouted, distance_km = plan_route(request.user.id, delivery_date, start=start)
+
+        results = self.serializer_class(stops, many=True).data
+        for number, data in enumerate(results, start=1):
+            data['stop'] = number
+        return Response({
+            "message": "Route planned successfully",
+            "data": {
+                "delivery_date": delivery_date,
+                "distance_km": round(distance_km, 3),
+                "stops": results,
+                "unrouted": self.serializer_class(unrouted, many=True).data,
+            }
+        }, status=status.HTTP_200_OK)
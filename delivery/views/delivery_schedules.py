@@ -0,0 +1,67 @@
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from delivery.models import DeliverySchedule
+from delivery.serializers.delivery_schedule import DeliveryScheduleSerializer
+from utils.pagination import CustomPagination
+from utils.user_role_based_permissions import PartnerUserPermission
+
+
+class DeliverySchedules(APIView):
+    """
+    API view to list and create recurring delivery schedules.
+
+    Partners describe a delivery they need every week (or every few weeks) once,
+    and the deliveries are created ahead of time by the `expand_delivery_schedules` beat task.
+    """
+    permission_classes = [PartnerUserPermission]
+    serializer_class = DeliveryScheduleSerializer
+    pagination_class = CustomPagination
+
+    @swagger_auto_schema(
+        operation_id="list_delivery_schedules",
+        operation_description="List the recurring delivery schedules of the authenticated partner.",
+        responses={status.HTTP_200_OK: DeliveryScheduleSerializer(many=True)},
+        tags=["Delivery"]
+    )
+    def get(self, request, *args, **kwargs):
+        queryset = DeliverySchedule.objects.filter(partner=request.user, is_deleted=False).order_by('-created_at')
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(queryset, request=request)
+        serializer = self.serializer_class(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    @swagger_auto_schema(
+        operation_id="create_delivery_schedule",
+        operation_description="Create a recurring delivery schedule. "
+                              "`weekdays` uses 0 for Monday through 6 for Sunday.",
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            required=["weekdays", "start_date"],
+            properties={
+                "product_name": openapi.Schema(type=openapi.TYPE_STRING, example="Bread crates"),
+                "delivery_address": openapi.Schema(type=openapi.TYPE_STRING, example="123 Main St, Kathmandu"),
+                "weekdays": openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_INTEGER), example=[0, 1, 2, 3, 4]),
+                "interval_weeks": openapi.Schema(type=openapi.TYPE_INTEGER, example=1),
+                "start_date": openapi.Schema(type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE, example="2026-02-02"),
+                "end_date": openapi.Schema(type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE, example="2026-12-31"),
+            }
+        ),
+        responses={
+            status.HTTP_201_CREATED: DeliveryScheduleSerializer,
+            status.HTTP_400_BAD_REQUEST: openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                example={"weekdays": ["weekdays must be a non-empty list"]}
+            ),
+        },
+        tags=["Delivery"]
+    )
+    def post(self, request, *args, **kwargs):
+        serializer = self.serializer_class(data=request.data)
+        if serializer.is_valid(raise_exception=True):
+            serializer.save(partner=request.user)
+            return Response({"message": "Delivery Schedule Created...🤗🤗", "data": serializer.data}, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,71 @@
+from django.db.models import Q
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status, permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from delivery.models import Delivery
+from delivery.serializers.delivery_status_event import DeliveryStatusEventSerializer
+from delivery.services.history import delivery_timeline
+
+
+class DeliveryTimeline(APIView):
+    """
+    API view for the status history of one delivery, oldest transition first.
+
+    Reads the append-only `delivery_status_events` log, never the notifications.
+    Visible to the partner who requested the delivery, the admin it is assigned to
+    and super admins.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = DeliveryStatusEventSerializer
+
+    @swagger_auto_schema(
+        operation_id="delivery_timeline",
+        operation_description="Return every status transition of the delivery with who made it and when.",
+        responses={
+            status.HTTP_200_OK: openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "message": openapi.Schema(type=openapi.TYPE_STRING, example="Delivery timeline retrieved successfully"),
+                    "data": openapi.Schema(
+                        type=openapi.TYPE_OBJECT,
+                        example={
+                            "id": 12,
+                            "status": "IN_TRANSIT",
+                            "created_at": "2026-02-01T10:00:00Z",
+                            "events": [
+                                {"old_status": "CREATED", "new_status": "ASSIGNED", "assigned_to": 4, "changed_by": 1, "created_at": "2026-02-01T11:00:00Z"},
+                                {"old_status": "ASSIGNED", "new_status": "IN_TRANSIT", "assigned_to": 4, "changed_by": 4, "created_at": "2026-02-05T08:30:00Z"}
+                            ]
+                        }
+                    ),
+                }
+            ),
+            status.HTTP_404_NOT_FOUND: openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "message": openapi.Schema(type=openapi.TYPE_STRING, example="Delivery not found")
+                }
+            ),
+        },
+        tags=["Delivery"]
+    )
+    def get(self, request, pk):
+        deliveries = Delivery.objects.filter(pk=pk)
+        if request.user.role != 'super_admin':
+            deliveries = deliveries.filter(Q(created_by=request.user) | Q(assigned_to=request.user))
+        delivery = deliveries.only('id', 'status', 'created_at').first()
+        if delivery is None:
+            return Response({"message": "Delivery not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response({
+            "message": "Delivery timeline retrieved successfully",
+            "data": {
+                "id": delivery.id,
+                "status": delivery.status,
+                "created_at": delivery.created_at,
+                "events": self.serializer_class(delivery_timeline(delivery.id), many=True).data,
+            }
+        }, status=status.HTTP_200_OK)
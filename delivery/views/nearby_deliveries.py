@@ -0,0 +1,114 @@
+from django.conf import settings
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status, permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from delivery.models import Delivery
+from delivery.serializers.delivery import DeliverySerializer
+from delivery.services.geo import within_box, within_radius
+
+
+class NearbyDeliveries(APIView):
+    """
+    API view to find deliveries around a point or inside a bounding box.
+
+    Candidates come from the geohash index and are filtered exactly in memory,
+    so no PostGIS is needed. Partners only see deliveries they created.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = DeliverySerializer
+    default_statuses = ['CREATED', 'ASSIGNED', 'IN_TRANSIT']
+    default_limit = 100
+    max_limit = 500
+
+    @swagger_auto_schema(
+        operation_id="nearby_deliveries",
+        operation_description="Give `lat`, `lon` and `radius_km` for a radius search (nearest first), "
+                              "or `min_lat`, `min_lon`, `max_lat`, `max_lon` for a bounding box. "
+                              "Only deliveries with coordinates are returned.",
+        manual_parameters=[
+            openapi.Parameter('lat', openapi.IN_QUERY, type=openapi.TYPE_NUMBER, required=False, example=27.7172),
+            openapi.Parameter('lon', openapi.IN_QUERY, type=openapi.TYPE_NUMBER, required=False, example=85.3240),
+            openapi.Parameter('radius_km', openapi.IN_QUERY, type=openapi.TYPE_NUMBER, required=False, example=2),
+            openapi.Parameter('min_lat', openapi.IN_QUERY, type=openapi.TYPE_NUMBER, required=False),
+            openapi.Parameter('min_lon', openapi.IN_QUERY, type=openapi.TYPE_NUMBER, required=False),
+            openapi.Parameter('max_lat', openapi.IN_QUERY, type=openapi.TYPE_NUMBER, required=False),
+            openapi.Parameter('max_lon', openapi.IN_QUERY, type=openapi.TYPE_NUMBER, required=False),
+            openapi.Parameter(
+                'status',
+                openapi.IN_QUERY,
+                description="Comma separated statuses (default CREATED,ASSIGNED,IN_TRANSIT)",
+                type=openapi.TYPE_STRING,
+                required=False,
+                example='CREATED'
+            ),
+            openapi.Parameter('limit', openapi.IN_QUERY, description="At most 500 (default 100)", type=openapi.TYPE_INTEGER, required=False),
+        ],
+        responses={
+            status.HTTP_200_OK: openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "count": openapi.Schema(type=openapi.TYPE_INTEGER, example=1),
+                    "results": openapi.Schema(
+                        type=openapi.TYPE_ARRAY,
+                        items=openapi.Schema(type=openapi.TYPE_OBJECT, example={"id": 1, "status": "CREATED", "latitude": 27.71, "longitude": 85.32, "distance_km": 0.42})
+                    ),
+                }
+            ),
+            status.HTTP_400_BAD_REQUEST: openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "message": openapi.Schema(type=openapi.TYPE_STRING, example="Give lat, lon and radius_km, or min_lat, min_lon, max_lat and max_lon")
+                }
+            ),
+        },
+        tags=["Delivery"]
+    )
+    def get(self, request):
+        params = request.query_params
+        try:
+            point = [float(params[name]) for name in ('lat', 'lon', 'radius_km') if name in params]
+            box = [float(params[name]) for name in ('min_lat', 'min_lon', 'max_lat', 'max_lon') if name in params]
+            limit = int(params.get('limit', self.default_limit))
+        except ValueError:
+            return Response({"message": "Coordinates, radius_km and limit must be numbers"}, status=status.HTTP_400_BAD_REQUEST)
+
+        if (len(point) == 3) == (len(box) == 4) or (point and box):
+            return Response({"message": "Give lat, lon and radius_km, or min_lat, min_lon, max_lat and max_lon"}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not 1 <= limit <= self.max_limit:
+            return Response({"message": f"limit must be between 1 and {self.max_limit}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        latitudes, longitudes = ([point[0]], [point[1]]) if point else (box[0::2], box[1::2])
+        if not all(-90 <= value <= 90 for value in latitudes) or not all(-180 <= value <= 180 for value in longitudes):
+            return Response({"message": "Latitudes must be within [-90, 90] and longitudes within [-180, 180]"}, status=status.HTTP_400_BAD_REQUEST)
+
+        statuses = params['status'].split(',') if params.get('status') else self.default_statuses
+        if not set(statuses) <= set(Delivery.VALID_TRANSITIONS):
+            return Response({"message": f"Invalid status. Must be one of {', '.join(Delivery.VALID_TRANSITIONS)}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = Delivery.objects.filter(status__in=statuses)
+        if request.user.role == 'partner':
+            queryset = queryset.filter(created_by=request.user)
+
+        if point:
+            latitude, longitude, radius_km = point
+            if not 0 < radius_km <= settings.DELIVERY_NEARBY_MAX_RADIUS_KM:
+                return Response({"message": f"radius_km must be greater than 0 and at most {settings.DELIVERY_NEARBY_MAX_RADIUS_KM}"}, status=status.HTTP_400_BAD_REQUEST)
+            distances = dict(within_radius(queryset, latitude, longitude, radius_km, limit))
+        else:
+            min_lat, min_lon, max_lat, max_lon = box
+            if min_lat > max_lat or min_lon > max_lon:
+                return Response({"message": "min_lat and min_lon must not be greater than max_lat and max_lon"}, status=status.HTTP_400_BAD_REQUEST)
+            distances = dict.fromkeys(within_box(queryset, min_lat, min_lon, max_lat, max_lon, limit))
+
+        deliveries = Delivery.objects.select_related('assigned_to', 'created_by').in_bulk(list(distances))
+        results = []
+        for delivery_id, distance_km in distances.items():
+            data = self.serializer_class(deliveries[delivery_id]).data
+            if distance_km is not None:
+                data['distance_km'] = round(distance_km, 3)
+            results.append(data)
+        return Response({"count": len(results), "results": results}, status=status.HTTP_200_OK)
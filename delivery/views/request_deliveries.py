@@ -1,3 +1,4 @@
+from django.db import transaction
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status
@@ -6,6 +7,11 @@ from rest_framework.views import APIView
 
 from delivery.models import Delivery
 from delivery.serializers.delivery import DeliverySerializer
+from delivery.services.capacity import reserve_capacity
+from delivery.services.dispatch import dispatch_on_commit
+from delivery.services.idempotency import claim_keys, find_used_keys, release_keys
+from delivery.services.ingestion import enqueue_delivery, get_ticket
+from delivery.services.list_counts import count_created
 from utils.idempotency_key import generate_idempotency_key
 from utils.user_role_based_permissions import PartnerUserPermission
 
@@ -22,7 +28,19 @@ class RequestDeliveries(APIView):
 
     @swagger_auto_schema(
         operation_id="request_delivery",
-        operation_description="Create a new delivery request by an authorized partner user.",
+        operation_description="Create a new delivery request by an authorized partner user. "
+                              "With `mode=async` the validated request is queued and answered with 202 and a ticket id; "
+                              "poll `request/status/<ticket>/` for the created delivery id.",
+        manual_parameters=[
+            openapi.Parameter(
+                'mode',
+                openapi.IN_QUERY,
+                description="Use 'async' to queue the request instead of writing it synchronously.",
+                type=openapi.TYPE_STRING,
+                required=False,
+                enum=['async'],
+            ),
+        ],
         request_body=openapi.Schema(
             type=openapi.TYPE_OBJECT,
             required=["delivery_date"],
@@ -85,6 +103,13 @@ class RequestDeliveries(APIView):
                     ),
                 }
             ),
+            status.HTTP_202_ACCEPTED: openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "message": openapi.Schema(type=openapi.TYPE_STRING, example="Delivery Request Accepted..."),
+                    "ticket": openapi.Schema(type=openapi.TYPE_STRING, example="5f0c8f8e6d0e4c3f9a3c1b2a7d9e8f10"),
+                }
+            ),
             status.HTTP_400_BAD_REQUEST: openapi.Schema(
                 type=openapi.TYPE_OBJECT,
                 properties={
@@ -111,12 +136,202 @@ class RequestDeliveries(APIView):
     def post(self, request, *args, **kwargs):
         idempotency_key = generate_idempotency_key(user_id=request.user.id, payload=request.data)
 
-        existing_delivery = Delivery.objects.filter(idempotency_key=idempotency_key).first()
-
-        if existing_delivery:
+        if find_used_keys(request.user.id, [idempotency_key]):
             return Response({"message": "Duplicate request detected...👿👿", }, status=status.HTTP_409_CONFLICT)
         serializer = self.serializer_class(data=request.data)
         if serializer.is_valid(raise_exception=True):
-            serializer.save(created_by=request.user, idempotency_key=idempotency_key)
+            if request.query_params.get('mode') == 'async':
+                # Written later in a group commit by delivery.celery_tasks.drain_delivery_ingest_stream
+                ticket = enqueue_delivery(request.user.id, idempotency_key, serializer.validated_data)
+                return Response({"message": "Delivery Request Accepted...🤗🤗", "ticket": ticket}, status=status.HTTP_202_ACCEPTED)
+            with transaction.atomic():
+                if not claim_keys(request.user.id, [idempotency_key]):
+                    # A concurrent request with the same payload won the race
+                    return Response({"message": "Duplicate request detected...👿👿", }, status=status.HTTP_409_CONFLICT)
+                delivery_date = serializer.validated_data['delivery_date']
+                if not reserve_capacity([(delivery_date, serializer.validated_data.get('geohash'))])[0]:
+                    # Give the idempotency key back so the same request can be retried later
+                    transaction.set_rollback(True)
+                    return Response({"message": f"No delivery capacity left for {delivery_date}"}, status=status.HTTP_409_CONFLICT)
+                serializer.save(created_by=request.user)
+                dispatch_on_commit([serializer.instance.id])
+                count_created([request.user.id])
             return Response({"message": "Delivery Request Success...🤗🤗", "data": serializer.data}, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class RequestDeliveriesBatch(APIView):
+    """
+        API view to create many delivery requests in one call.
+
+        Every item is validated with `DeliverySerializer` and keyed with the same
+        idempotency key the single-item endpoint would produce. All keys are checked
+        against the idempotency ledger at once and the new deliveries are written
+        with a single `bulk_create`.
+    """
+    permission_classes = [PartnerUserPermission]
+    serializer_class = DeliverySerializer
+    max_batch_size = 1000
+
+    @swagger_auto_schema(
+        operation_id="request_delivery_batch",
+        operation_description="Create up to 1000 delivery requests at once. "
+                              "Each item is reported as `created`, `duplicate` or `invalid` "
+                              "(which includes dates without delivery capacity left).",
+        request_body=openapi.Schema(
+            type=openapi.TYPE_ARRAY,
+            items=openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                required=["delivery_date"],
+                properties={
+                    "delivery_date": openapi.Schema(type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE, example="2026-02-05"),
+                    "product_name": openapi.Schema(type=openapi.TYPE_STRING, example="Laptop"),
+                    "delivery_address": openapi.Schema(type=openapi.TYPE_STRING, example="123 Main St, Kathmandu"),
+                }
+            )
+        ),
+        responses={
+            status.HTTP_207_MULTI_STATUS: openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "message": openapi.Schema(type=openapi.TYPE_STRING, example="Batch Delivery Request Processed..."),
+                    "summary": openapi.Schema(
+                        type=openapi.TYPE_OBJECT,
+                        example={"created": 2, "duplicate": 1, "invalid": 0}
+                    ),
+                    "results": openapi.Schema(
+                        type=openapi.TYPE_ARRAY,
+                        items=openapi.Schema(
+                            type=openapi.TYPE_OBJECT,
+                            example={"index": 0, "result": "created", "data": {"id": 1, "status": "CREATED"}}
+                        )
+                    ),
+                }
+            ),
+            status.HTTP_400_BAD_REQUEST: openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "message": openapi.Schema(type=openapi.TYPE_STRING, example="Request body must be a non-empty list of deliveries")
+                }
+            ),
+        },
+        tags=["Delivery"]
+    )
+    def post(self, request, *args, **kwargs):
+        items = request.data
+
+        if not isinstance(items, list) or not items:
+            return Response({"message": "Request body must be a non-empty list of deliveries"}, status=status.HTTP_400_BAD_REQUEST)
+
+        if len(items) > self.max_batch_size:
+            return Response({"message": f"A batch can contain at most {self.max_batch_size} deliveries"}, status=status.HTTP_400_BAD_REQUEST)
+
+        results = [None] * len(items)
+        pending = {}
+
+        # One list serializer validates every item while building its fields only once
+        serializer = self.serializer_class(data=items, many=True)
+        has_errors = not serializer.is_valid()
+        item_errors = serializer.errors if has_errors else {}
+        if isinstance(item_errors, list):
+            item_errors = dict(enumerate(item_errors))
+
+        for index, item in enumerate(items):
+            errors = item_errors.get(index)
+            if errors:
+                results[index] = {"index": index, "result": "invalid", "errors": errors}
+                continue
+
+            idempotency_key = generate_idempotency_key(user_id=request.user.id, payload=item)
+            if idempotency_key in pending:
+                # Same payload sent twice in one batch
+                results[index] = {"index": index, "result": "duplicate"}
+                continue
+            pending[idempotency_key] = index
+
+        used_keys = find_used_keys(request.user.id, pending)
+
+        candidates = []
+        for idempotency_key, index in pending.items():
+            if idempotency_key in used_keys:
+                results[index] = {"index": index, "result": "duplicate"}
+                continue
+            candidates.append((idempotency_key, index))
+
+        new_deliveries = []
+        with transaction.atomic():
+            claimed_keys = claim_keys(request.user.id, [idempotency_key for idempotency_key, _ in candidates])
+            claimed = []
+            for idempotency_key, index in candidates:
+                if idempotency_key not in claimed_keys:
+                    results[index] = {"index": index, "result": "duplicate"}
+                    continue
+                validated_data = serializer.child.run_validation(items[index]) if has_errors else serializer.validated_data[index]
+                claimed.append((idempotency_key, index, validated_data))
+
+            admitted = reserve_capacity([(data['delivery_date'], data.get('geohash')) for _, _, data in claimed])
+            for (idempotency_key, index, validated_data), is_admitted in zip(claimed, admitted):
+                if is_admitted:
+                    new_deliveries.append((index, Delivery(**{**validated_data, 'created_by': request.user})))
+                else:
+                    results[index] = {"index": index, "result": "invalid", "errors": {"delivery_date": [f"No delivery capacity left for {validated_data['delivery_date']}"]}}
+            release_keys(request.user.id, [idempotency_key for (idempotency_key, _, _), is_admitted in zip(claimed, admitted) if not is_admitted])
+            Delivery.objects.bulk_create([delivery for _, delivery in new_deliveries])
+            dispatch_on_commit([delivery.id for _, delivery in new_deliveries])
+            count_created([request.user.id] * len(new_deliveries))
+
+        created_data = self.serializer_class([delivery for _, delivery in new_deliveries], many=True).data
+        for (index, _), data in zip(new_deliveries, created_data):
+            results[index] = {"index": index, "result": "created", "data": data}
+
+        summary = {"created": 0, "duplicate": 0, "invalid": 0}
+        for result in results:
+            summary[result["result"]] += 1
+
+        return Response({"message": "Batch Delivery Request Processed...🤗🤗", "summary": summary, "results": results}, status=status.HTTP_207_MULTI_STATUS)
+
+
+class DeliveryRequestStatus(APIView):
+    """
+        API view to resolve an asynchronous delivery request ticket.
+
+        Returns `pending` until the ingest writer has processed the request, then
+        `created` with the delivery id, `duplicate` if the same request was already made,
+        `full` if the delivery date had no capacity left by then, or `error` if the
+        request could not be written (it is kept in the dead-letter stream).
+    """
+    permission_classes = [PartnerUserPermission]
+
+    @swagger_auto_schema(
+        operation_id="request_delivery_status",
+        operation_description="Resolve a ticket returned by `request/?mode=async`.",
+        responses={
+            status.HTTP_200_OK: openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "ticket": openapi.Schema(type=openapi.TYPE_STRING, example="5f0c8f8e6d0e4c3f9a3c1b2a7d9e8f10"),
+                    "status": openapi.Schema(type=openapi.TYPE_STRING, enum=['pending', 'created', 'duplicate', 'full', 'error'], example="created"),
+                    "delivery_id": openapi.Schema(type=openapi.TYPE_INTEGER, example=42),
+                }
+            ),
+            status.HTTP_404_NOT_FOUND: openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "message": openapi.Schema(type=openapi.TYPE_STRING, example="Ticket not found")
+                }
+            ),
+        },
+        tags=["Delivery"]
+    )
+    def get(self, request, ticket, *args, **kwargs):
+        ticket_data = get_ticket(ticket)
+
+        if not ticket_data or ticket_data['user_id'] != str(request.user.id):
+            return Response({"message": "Ticket not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        delivery_id = ticket_data.get('delivery_id')
+        return Response({
+            "ticket": ticket,
+            "status": ticket_data['status'],
+            "delivery_id": int(delivery_id) if delivery_id else None,
+        }, status=status.HTTP_200_OK)
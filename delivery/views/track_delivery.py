@@ -0,0 +1,74 @@
+import re
+
+from django.conf import settings
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from delivery.services.tracking import NOT_FOUND, get_tracking
+
+TRACKING_CODE = re.compile(r'[0-9A-F]{16}')
+
+
+class TrackDelivery(APIView):
+    """
+    Public API view for anyone holding a tracking code to follow a delivery.
+
+    No authentication: the 16 character code is the secret. Responses come from
+    the tracking cache, carry an ETag and may be cached by clients and proxies
+    for DELIVERY_TRACKING_MAX_AGE seconds.
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    @swagger_auto_schema(
+        operation_id="track_delivery",
+        operation_description="Return the status and timestamps of the delivery with this tracking code. "
+                              "Send the returned ETag in If-None-Match to get 304 while it is unchanged.",
+        security=[],
+        responses={
+            status.HTTP_200_OK: openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "message": openapi.Schema(type=openapi.TYPE_STRING, example="Delivery found"),
+                    "data": openapi.Schema(
+                        type=openapi.TYPE_OBJECT,
+                        example={
+                            "tracking_code": "3F2A9C81D04B77E5",
+                            "status": "IN_TRANSIT",
+                            "delivery_date": "2026-02-05",
+                            "created_at": "2026-02-01T10:00:00Z",
+                            "updated_at": "2026-02-05T08:30:00Z"
+                        }
+                    ),
+                }
+            ),
+            status.HTTP_304_NOT_MODIFIED: "Delivery unchanged since the ETag in If-None-Match",
+            status.HTTP_404_NOT_FOUND: openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "message": openapi.Schema(type=openapi.TYPE_STRING, example="Delivery not found")
+                }
+            ),
+        },
+        tags=["Delivery"]
+    )
+    def get(self, request, tracking_code):
+        tracking_code = tracking_code.upper()
+        # Malformed codes cannot exist, so they never reach the cache or the database
+        tracking = get_tracking(tracking_code) if TRACKING_CODE.fullmatch(tracking_code) else NOT_FOUND
+
+        if not tracking:
+            response = Response({"message": "Delivery not found"}, status=status.HTTP_404_NOT_FOUND)
+        elif request.headers.get('If-None-Match') == tracking['etag']:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response({"message": "Delivery found", "data": tracking['data']}, status=status.HTTP_200_OK)
+
+        if tracking:
+            response['ETag'] = tracking['etag']
+        response['Cache-Control'] = f"public, max-age={settings.DELIVERY_TRACKING_MAX_AGE}"
+        return response
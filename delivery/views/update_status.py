@@ -5,16 +5,18 @@ from rest_framework import status, permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from delivery.models import Delivery
 from delivery.serializers.delivery import DeliverySerializer
-from notification.services import NotificationService
+from delivery.services.transitions import TransitionError, bulk_transition_deliveries, transition_delivery
 from utils.user_role_based_permissions import AdminUserPermission
 
 
 class UpdateDeliveryStatus(APIView):
     """
     API view to update delivery status.
-    Validates state transitions and sends notifications.
+    Validates state transitions; notifications are sent by transition hooks after commit.
+
+    The transition is applied with one conditional UPDATE (see `transition_delivery`),
+    so no row lock is held while the request is processed.
     """
     serializer_class = DeliverySerializer
     # permission_classes = [AdminUserPermission]
@@ -28,7 +30,9 @@ class UpdateDeliveryStatus(APIView):
                 "- CREATED → ASSIGNED\n"
                 "- ASSIGNED → IN_TRANSIT\n"
                 "- IN_TRANSIT → COMPLETED or FAILED\n\n"
-                "Terminal states (COMPLETED, FAILED) cannot be updated."
+                "Terminal states (COMPLETED, FAILED) cannot be updated.\n\n"
+                "Send the `version` returned with the delivery to reject the update "
+                "if someone else changed the delivery in the meantime."
         ),
         request_body=openapi.Schema(
             type=openapi.TYPE_OBJECT,
@@ -40,6 +44,11 @@ class UpdateDeliveryStatus(APIView):
                     enum=['ASSIGNED', 'IN_TRANSIT', 'COMPLETED', 'FAILED'],
                     example='IN_TRANSIT'
                 ),
+                "version": openapi.Schema(
+                    type=openapi.TYPE_INTEGER,
+                    description="Expected current version of the delivery (optional)",
+                    example=1
+                ),
             }
         ),
         responses={
@@ -78,45 +87,123 @@ class UpdateDeliveryStatus(APIView):
                     )
                 }
             ),
+            status.HTTP_409_CONFLICT: openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "message": openapi.Schema(
+                        type=openapi.TYPE_STRING,
+                        example="Delivery was modified by another request, reload it and try again"
+                    )
+                }
+            ),
         },
         tags=["Delivery"]
     )
-    @transaction.atomic
     def patch(self, request, pk, *args, **kwargs):
         new_status = request.data.get('status')
 
         if not new_status:
             return Response({"message": "status field is required"}, status=status.HTTP_400_BAD_REQUEST)
 
+        expected_version = request.data.get('version')
+        if expected_version is not None and type(expected_version) is not int:
+            return Response({"message": "version must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+
         try:
-            # Lock the row for update
-            delivery = Delivery.objects.select_for_update().get(pk=pk)
-        except Delivery.DoesNotExist:
-            return Response({"message": "Delivery not found"}, status=status.HTTP_404_NOT_FOUND)
+            # The creator is notified by a transition hook once this commits
+            delivery, _ = transition_delivery(pk, new_status, expected_version=expected_version, changed_by_id=request.user.id)
+        except TransitionError as e:
+            return Response({"message": e.message}, status=e.status_code)
 
-        old_status = delivery.status
+        serializer = self.serializer_class(delivery)
+        return Response({"message": "Delivery status updated successfully", "data": serializer.data}, status=status.HTTP_200_OK)
 
-        # Check if delivery is in terminal state
-        if old_status in Delivery.TERMINAL_STATES:
-            return Response({"message": f"Cannot update delivery in {delivery.status} state. This is a terminal state."}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Validate status transition
-        can_transition, message = delivery.can_transition_to(new_status)
-        if not can_transition:
-            return Response({"message": message}, status=status.HTTP_400_BAD_REQUEST)
+class BulkUpdateDeliveryStatus(APIView):
+    """
+    API view to update the status of many deliveries at once, e.g. a scanned cage of parcels.
+
+    Every item follows the same state machine as `UpdateDeliveryStatus`. Items are
+    validated in memory and applied with one UPDATE per (from, to) status pair;
+    each item is reported as `updated` or `failed`. Notifications are sent in bulk
+    by transition hooks after commit. Admins can only update the deliveries
+    assigned to them; any other id is reported as not found.
+    """
+    permission_classes = [permissions.IsAuthenticated, AdminUserPermission]
+    max_batch_size = 1000
+
+    @swagger_auto_schema(
+        operation_id="bulk_update_delivery_status",
+        operation_description="Update the status of up to 1000 deliveries in one call.",
+        request_body=openapi.Schema(
+            type=openapi.TYPE_ARRAY,
+            items=openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                required=["id", "status"],
+                properties={
+                    "id": openapi.Schema(type=openapi.TYPE_INTEGER, example=1),
+                    "status": openapi.Schema(
+                        type=openapi.TYPE_STRING,
+                        enum=['ASSIGNED', 'IN_TRANSIT', 'COMPLETED', 'FAILED'],
+                        example='IN_TRANSIT'
+                    ),
+                }
+            )
+        ),
+        responses={
+            status.HTTP_207_MULTI_STATUS: openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "message": openapi.Schema(type=openapi.TYPE_STRING, example="Bulk Status Update Processed..."),
+                    "summary": openapi.Schema(type=openapi.TYPE_OBJECT, example={"updated": 1, "failed": 1}),
+                    "results": openapi.Schema(
+                        type=openapi.TYPE_ARRAY,
+                        items=openapi.Schema(
+                            type=openapi.TYPE_OBJECT,
+                            example={"index": 0, "id": 1, "result": "updated", "old_status": "ASSIGNED", "status": "IN_TRANSIT"}
+                        )
+                    ),
+                }
+            ),
+            status.HTTP_400_BAD_REQUEST: openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "message": openapi.Schema(type=openapi.TYPE_STRING, example="Request body must be a non-empty list of status updates")
+                }
+            ),
+        },
+        tags=["Delivery"]
+    )
+    def patch(self, request, *args, **kwargs):
+        items = request.data
+
+        if not isinstance(items, list) or not items:
+            return Response({"message": "Request body must be a non-empty list of status updates"}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Update status
-        serializer = self.serializer_class(delivery, data={'status': new_status}, partial=True, context={'request': request})
+        if len(items) > self.max_batch_size:
+            return Response({"message": f"A bulk update can contain at most {self.max_batch_size} deliveries"}, status=status.HTTP_400_BAD_REQUEST)
 
-        if serializer.is_valid():
-            serializer.save()
+        results = [None] * len(items)
+        transitions = []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict) or type(item.get('id')) is not int or not item.get('status'):
+                results[index] = {"index": index, "result": "failed", "message": "Each item needs an integer id and a status"}
+                continue
+            transitions.append((index, item['id'], item['status']))
 
-            # Send notification to the user who created the delivery
-            NotificationService.notify_status_changed(
-                delivery=delivery,
-                old_status=old_status,
-                new_status=new_status,
+        with transaction.atomic():
+            outcomes = bulk_transition_deliveries(
+                [(pk, new_status) for _, pk, new_status in transitions], changed_by_id=request.user.id, assigned_to_id=request.user.id
             )
 
-            return Response({"message": "Delivery status updated successfully", "data": serializer.data}, status=status.HTTP_200_OK)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+        for (index, pk, _), outcome in zip(transitions, outcomes):
+            if isinstance(outcome, TransitionError):
+                results[index] = {"index": index, "id": pk, "result": "failed", "message": outcome.message}
+            else:
+                results[index] = {"index": index, "id": pk, "result": "updated", "old_status": outcome['old_status'], "status": outcome['status']}
+
+        summary = {"updated": 0, "failed": 0}
+        for result in results:
+            summary[result["result"]] += 1
+
+        return Response({"message": "Bulk Status Update Processed...🤗🤗", "summary": summary, "results": results}, status=status.HTTP_207_MULTI_STATUS)
@@ -0,0 +1,20 @@
+# Generated by Django 6.0.1 on 2026-10-17 01:29
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Built without blocking writes to the table
+    atomic = False
+
+    dependencies = [
+        ('delivery_auth', '0001_initial'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='authuser',
+            index=models.Index(fields=['-created_at', '-id'], name='auth_user_list_idx'),
+        ),
+    ]
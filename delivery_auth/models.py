@@ -34,6 +34,8 @@ class AuthUser(AbstractBaseUser, BaseModel):
 
     class Meta:
         db_table = 'auth_user'
+        # Cursor pages of the users list, see utils.pagination.KeysetPagination
+        indexes = [models.Index(fields=['-created_at', '-id'], name='auth_user_list_idx')]
 
     def has_perm(self, app_label):
         if self.is_active and self.is_superuser:
@@ -0,0 +1,50 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from delivery_auth.models import AuthUser
+
+
+class UsersListTestCase(TestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.client = APIClient()
+
+        # Create admin user
+        self.admin_user = AuthUser.objects.create_user(
+            email='admin@test.com',
+            password='testpass123',
+            role='admin',
+            first_name='Admin',
+            last_name='User'
+        )
+
+        # Create partner users
+        for index in range(3):
+            AuthUser.objects.create_user(
+                email=f'partner{index}@test.com',
+                password='testpass123',
+                role='partner',
+                first_name=f'Partner{index}',
+                last_name='User'
+            )
+
+        self.url = reverse('list_users')
+
+    def test_list_users_cursor_pages(self):
+        """Test cursor pages keep the filters and follow the requested creation order"""
+        self.client.force_authenticate(user=self.admin_user)
+
+        first = self.client.get(self.url, {'role': 'partner', 'cursor': '', 'per_page': 2})
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual([user['email'] for user in first.data['results']], ['partner2@test.com', 'partner1@test.com'])
+        second = self.client.get(first.data['next'])
+        self.assertEqual([user['email'] for user in second.data['results']], ['partner0@test.com'])
+        self.assertIsNone(second.data['next'])
+
+        oldest = self.client.get(self.url, {'cursor': '', 'sort_by': 'oldest', 'per_page': 2})
+        self.assertEqual([user['email'] for user in oldest.data['results']], ['admin@test.com', 'partner0@test.com'])
+
+        response = self.client.get(self.url, {'cursor': '', 'sort_by': 'alphabet'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
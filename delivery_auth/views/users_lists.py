@@ -7,7 +7,7 @@ from rest_framework.views import APIView
 
 from delivery_auth.models import AuthUser
 from delivery_auth.serializers.create_users import AuthUserSerializers
-from utils.pagination import CustomPagination
+from utils.pagination import CustomPagination, KeysetPagination
 from utils.user_role_based_permissions import AdminUserPermission
 
 
@@ -24,11 +24,13 @@ class UsersListAPIView(APIView):
         serializer_class (AuthUserSerializers): Serializer for user data.
         permission_classes (list): Requires authenticated access.
         pagination_class (CustomPagination): Custom pagination for query results.
+        keyset_pagination_class (KeysetPagination): Cursor pagination used when a `cursor` is sent.
     """
     # queryset = TestPaper.objects.filter(is_deleted=False).order_by('-id')
     serializer_class = AuthUserSerializers
     permission_classes = [AdminUserPermission]
     pagination_class = CustomPagination
+    keyset_pagination_class = KeysetPagination
 
     @swagger_auto_schema(
         operation_id='list_users',
@@ -70,6 +72,8 @@ class UsersListAPIView(APIView):
                 role (str, optional): Filter by user's role.
                 search (str, optional): Search across full name, email, and role.
                 sort_by (str, optional): Sort results by 'latest', 'oldest', or 'alphabet'.
+                cursor (str, optional): Page by cursor instead of page number; empty for
+                    the first page. Only 'latest' and 'oldest' orders can be paged this way.
 
             Returns:
                 Response: A Response object containing:
@@ -82,6 +86,10 @@ class UsersListAPIView(APIView):
                 400: Bad request if query parameters are invalid.
         """
         paginator = self.pagination_class()
+        if self.keyset_pagination_class.requested(request):
+            if self.request.query_params.get("sort_by") == 'alphabet':
+                return Response({"message": "Cursor pagination only supports sort_by 'latest' or 'oldest'"}, status=status.HTTP_400_BAD_REQUEST)
+            paginator = self.keyset_pagination_class(ascending=self.request.query_params.get("sort_by") == 'oldest')
         first_name = self.request.query_params.get('first_name', None)
         last_name = self.request.query_params.get('last_name', None)
         email = self.request.query_params.get('email', None)
@@ -19,7 +19,10 @@ python3 manage.py collectstatic --noinput &&
 
 # Start Celery worker with your app's Celery instance
 #echo "==========================👌🙏🔥 Starting Celery worker 👌🙏🔥========================"
-celery -A project worker --loglevel=INFO &
+celery -A project worker -Q celery,${DELIVERY_HOOKS_QUEUE:-delivery_hooks} --loglevel=INFO &
+
+# Start Celery beat for scheduled jobs
+celery -A project beat --loglevel=INFO &
 
 # Start Flower monitoring
 #echo "==========================👌🙏🔥 Starting Flower 👌🙏🔥=============================="
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class NotificationConfig(AppConfig):
     name = 'notification'
+
+    def ready(self):
+        # Registers the notification transition hooks
+        from notification import hooks  # noqa: F401
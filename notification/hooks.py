@@ -0,0 +1,32 @@
+from delivery.services.hooks import on_transition
+from delivery_auth.models import AuthUser
+from notification.services import NotificationService
+from utils.enums import DeliveryStatus
+
+
+@on_transition((DeliveryStatus.CREATED.value, DeliveryStatus.ASSIGNED.value))
+def notify_assigned(events):
+    """Tell partners their deliveries were assigned, with one query for the admins' names."""
+    names = {
+        admin_id: f"{first_name} {last_name}"
+        for admin_id, first_name, last_name in AuthUser.objects.filter(
+            id__in={event['assigned_to_id'] for event in events}
+        ).values_list('id', 'first_name', 'last_name')
+    }
+    NotificationService.bulk_notify_assigned(
+        (event['delivery_id'], event['created_by_id'], event['product_name'], names.get(event['assigned_to_id'], ''))
+        for event in events
+    )
+
+
+@on_transition(
+    (DeliveryStatus.ASSIGNED.value, DeliveryStatus.IN_TRANSIT.value),
+    (DeliveryStatus.IN_TRANSIT.value, DeliveryStatus.COMPLETED.value),
+    (DeliveryStatus.IN_TRANSIT.value, DeliveryStatus.FAILED.value),
+)
+def notify_status_changed(events):
+    """Tell partners their deliveries moved on."""
+    NotificationService.bulk_notify_status_changed(
+        (event['delivery_id'], event['created_by_id'], event['product_name'], event['old_status'], event['new_status'])
+        for event in events
+    )
@@ -20,12 +20,12 @@ class NotificationService:
         )
 
     @staticmethod
-    def notify_status_changed(delivery, old_status, new_status):
-        """Notify when delivery status changes."""
+    def status_changed_fields(product_name, old_status, new_status):
+        """Notification type, title, message and metadata for a status change."""
         status_messages = {
-            'IN_TRANSIT': f'Your delivery #{delivery.product_name} is now in transit.',
-            'COMPLETED': f'Your delivery #{delivery.product_name} has been completed successfully! 🎉',
-            'FAILED': f'Your delivery #{delivery.product_name} has failed. Please contact support.',
+            'IN_TRANSIT': f'Your delivery #{product_name} is now in transit.',
+            'COMPLETED': f'Your delivery #{product_name} has been completed successfully! 🎉',
+            'FAILED': f'Your delivery #{product_name} has failed. Please contact support.',
         }
 
         notification_types = {
@@ -33,13 +33,59 @@ class NotificationService:
             'FAILED': 'delivery_failed',
         }
 
-        return NotificationService.create_delivery_notification(
-            delivery=delivery,
-            notification_type=notification_types.get(new_status, 'status_changed'),
-            title=f'Delivery Status Updated',
-            message=status_messages.get(new_status, f'Your delivery status changed to {new_status}'),
-            metadata={
+        return {
+            'notification_type': notification_types.get(new_status, 'status_changed'),
+            'title': f'Delivery Status Updated',
+            'message': status_messages.get(new_status, f'Your delivery status changed to {new_status}'),
+            'metadata': {
                 'old_status': old_status,
                 'new_status': new_status
             }
+        }
+
+    @staticmethod
+    def notify_status_changed(delivery, old_status, new_status):
+        """Notify when delivery status changes."""
+        return NotificationService.create_delivery_notification(
+            delivery=delivery,
+            **NotificationService.status_changed_fields(delivery.product_name, old_status, new_status)
         )
+
+    @staticmethod
+    def bulk_notify_status_changed(changes):
+        """
+        Notify many status changes with a single INSERT.
+
+        `changes` is an iterable of (delivery_id, created_by_id, product_name, old_status, new_status).
+        """
+        notifications = [
+            Notification(
+                recipient_id=created_by_id,
+                delivery_id=delivery_id,
+                **NotificationService.status_changed_fields(product_name, old_status, new_status)
+            )
+            for delivery_id, created_by_id, product_name, old_status, new_status in changes
+            if created_by_id
+        ]
+        return Notification.objects.bulk_create(notifications)
+
+    @staticmethod
+    def bulk_notify_assigned(assignments):
+        """
+        Notify many assignments with a single INSERT.
+
+        `assignments` is an iterable of (delivery_id, created_by_id, product_name, admin_full_name).
+        """
+        notifications = [
+            Notification(
+                recipient_id=created_by_id,
+                delivery_id=delivery_id,
+                notification_type='delivery_assigned',
+                title='Delivery Assigned',
+                message=f"Your delivery for {product_name} has been assigned to {admin_full_name}",
+                metadata={}
+            )
+            for delivery_id, created_by_id, product_name, admin_full_name in assignments
+            if created_by_id
+        ]
+        return Notification.objects.bulk_create(notifications)
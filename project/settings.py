@@ -70,6 +70,8 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'django.middleware.gzip.GZipMiddleware',
+    'utils.idempotency_middleware.IdempotencyKeyMiddleware',
+    'utils.transition_hook_middleware.TransitionHookMiddleware',
     'debug_toolbar.middleware.DebugToolbarMiddleware',
 ]
 
@@ -237,8 +239,120 @@ CACHES = {
     }
 }
 
+# Idempotency-Key header replay (utils/idempotency_middleware.py)
+IDEMPOTENCY_KEY_TTL = int(os.environ.get('IDEMPOTENCY_KEY_TTL', 60 * 60 * 24))
+IDEMPOTENCY_KEY_LOCK_TTL = int(os.environ.get('IDEMPOTENCY_KEY_LOCK_TTL', 60))
+IDEMPOTENCY_KEY_WAIT_TIMEOUT = int(os.environ.get('IDEMPOTENCY_KEY_WAIT_TIMEOUT', 10))
+
+# Idempotency ledger (delivery.models.IdempotencyKey) and its Redis Bloom filter
+IDEMPOTENCY_LEDGER_TTL_DAYS = int(os.environ.get('IDEMPOTENCY_LEDGER_TTL_DAYS', 30))
+IDEMPOTENCY_LEDGER_PURGE_CHUNK_SIZE = int(os.environ.get('IDEMPOTENCY_LEDGER_PURGE_CHUNK_SIZE', 5000))
+IDEMPOTENCY_BLOOM_FILTER_ENABLED = os.environ.get('IDEMPOTENCY_BLOOM_FILTER_ENABLED', 'True') == 'True'
+IDEMPOTENCY_BLOOM_FILTER_CAPACITY = int(os.environ.get('IDEMPOTENCY_BLOOM_FILTER_CAPACITY', 10_000_000))
+IDEMPOTENCY_BLOOM_FILTER_ERROR_RATE = float(os.environ.get('IDEMPOTENCY_BLOOM_FILTER_ERROR_RATE', 0.01))
+
+# Asynchronous delivery ingestion (delivery/services/ingestion.py)
+DELIVERY_INGEST_BATCH_SIZE = int(os.environ.get('DELIVERY_INGEST_BATCH_SIZE', 500))
+DELIVERY_INGEST_MAX_WAIT_MS = int(os.environ.get('DELIVERY_INGEST_MAX_WAIT_MS', 200))
+DELIVERY_INGEST_DRAIN_SECONDS = int(os.environ.get('DELIVERY_INGEST_DRAIN_SECONDS', 5))
+DELIVERY_INGEST_RECLAIM_IDLE_MS = int(os.environ.get('DELIVERY_INGEST_RECLAIM_IDLE_MS', 60_000))
+DELIVERY_INGEST_STREAM_MAXLEN = int(os.environ.get('DELIVERY_INGEST_STREAM_MAXLEN', 1_000_000))
+DELIVERY_INGEST_TICKET_TTL = int(os.environ.get('DELIVERY_INGEST_TICKET_TTL', 60 * 60 * 24))
+
+# Recurring delivery schedules (delivery/services/schedules.py)
+DELIVERY_SCHEDULE_HORIZON_DAYS = int(os.environ.get('DELIVERY_SCHEDULE_HORIZON_DAYS', 14))
+DELIVERY_SCHEDULE_CHUNK_SIZE = int(os.environ.get('DELIVERY_SCHEDULE_CHUNK_SIZE', 500))
+
+# Automatic dispatch to the least-loaded admin (delivery/services/dispatch.py): off, on_create or periodic
+DELIVERY_AUTO_DISPATCH = os.environ.get('DELIVERY_AUTO_DISPATCH', 'off')
+DELIVERY_DISPATCH_BATCH_SIZE = int(os.environ.get('DELIVERY_DISPATCH_BATCH_SIZE', 1000))
+DELIVERY_DISPATCH_INTERVAL_SECONDS = int(os.environ.get('DELIVERY_DISPATCH_INTERVAL_SECONDS', 10))
+
+# Per-admin workload counters (delivery.models.AdminWorkload)
+ADMIN_WORKLOAD_RECONCILE_CHUNK_SIZE = int(os.environ.get('ADMIN_WORKLOAD_RECONCILE_CHUNK_SIZE', 500))
+
+# Nearby delivery search (delivery.services.geo)
+DELIVERY_GEO_MAX_CELLS = int(os.environ.get('DELIVERY_GEO_MAX_CELLS', 64))
+DELIVERY_NEARBY_MAX_RADIUS_KM = int(os.environ.get('DELIVERY_NEARBY_MAX_RADIUS_KM', 50))
+
+# Daily route sequencing (delivery.services.routing)
+DELIVERY_ROUTE_TIME_BUDGET_MS = int(os.environ.get('DELIVERY_ROUTE_TIME_BUDGET_MS', 150))
+DELIVERY_ROUTE_CACHE_TTL = int(os.environ.get('DELIVERY_ROUTE_CACHE_TTL', 60 * 60 * 24))
+
+# Offline geocoding of delivery addresses (delivery.services.geocoding), empty disables it
+DELIVERY_GAZETTEER_PATH = os.environ.get('DELIVERY_GAZETTEER_PATH', '')
+
+# Delivery date capacity (delivery.services.capacity); zones are geohash prefixes of this length
+DELIVERY_CAPACITY_ZONE_PRECISION = int(os.environ.get('DELIVERY_CAPACITY_ZONE_PRECISION', 4))
+DELIVERY_AVAILABLE_DATES_MAX_DAYS = int(os.environ.get('DELIVERY_AVAILABLE_DATES_MAX_DAYS', 90))
+
+# Public delivery tracking (delivery.services.tracking); MAX_AGE is how long clients and proxies may reuse a response
+DELIVERY_TRACKING_CACHE_TTL = int(os.environ.get('DELIVERY_TRACKING_CACHE_TTL', 300))
+DELIVERY_TRACKING_MAX_AGE = int(os.environ.get('DELIVERY_TRACKING_MAX_AGE', 30))
+
+# Delivery status history (delivery.services.history); monthly partitions created this many months ahead
+DELIVERY_STATUS_EVENT_PARTITIONS_AHEAD = int(os.environ.get('DELIVERY_STATUS_EVENT_PARTITIONS_AHEAD', 2))
+
+# Stale delivery sweeper (delivery.services.sweeper); deliveries this many days past their date are overdue
+DELIVERY_STALE_GRACE_DAYS = int(os.environ.get('DELIVERY_STALE_GRACE_DAYS', 1))
+DELIVERY_SWEEP_CHUNK_SIZE = int(os.environ.get('DELIVERY_SWEEP_CHUNK_SIZE', 2000))
+DELIVERY_SWEEP_PAUSE_MS = int(os.environ.get('DELIVERY_SWEEP_PAUSE_MS', 100))
+
+# List totals (utils.counting): planner estimates above this many rows, and per-user cached delivery counts
+PAGINATION_EXACT_COUNT_THRESHOLD = int(os.environ.get('PAGINATION_EXACT_COUNT_THRESHOLD', 10000))
+DELIVERY_LIST_COUNT_TTL = int(os.environ.get('DELIVERY_LIST_COUNT_TTL', 60 * 10))
+
+# Side effects of delivery transitions (delivery.services.hooks) run on their own queue
+DELIVERY_HOOKS_QUEUE = os.environ.get('DELIVERY_HOOKS_QUEUE', 'delivery_hooks')
+CELERY_TASK_ROUTES = {
+    'delivery.celery_tasks.run_transition_hooks': {'queue': DELIVERY_HOOKS_QUEUE},
+}
+
+CELERY_BEAT_SCHEDULE = {
+    'purge-idempotency-keys': {
+        'task': 'delivery.celery_tasks.purge_idempotency_keys',
+        'schedule': timedelta(hours=1),
+    },
+    'drain-delivery-ingest-stream': {
+        'task': 'delivery.celery_tasks.drain_delivery_ingest_stream',
+        'schedule': timedelta(seconds=DELIVERY_INGEST_DRAIN_SECONDS),
+        'options': {'expires': DELIVERY_INGEST_DRAIN_SECONDS},
+    },
+    'expand-delivery-schedules': {
+        'task': 'delivery.celery_tasks.expand_delivery_schedules',
+        'schedule': timedelta(hours=1),
+    },
+    'dispatch-created-deliveries': {
+        'task': 'delivery.celery_tasks.dispatch_created_deliveries',
+        'schedule': timedelta(seconds=DELIVERY_DISPATCH_INTERVAL_SECONDS),
+        'options': {'expires': DELIVERY_DISPATCH_INTERVAL_SECONDS},
+    },
+    'reconcile-admin-workloads': {
+        'task': 'delivery.celery_tasks.reconcile_admin_workloads',
+        'schedule': timedelta(hours=1),
+    },
+    'rebuild-dispatch-workload': {
+        'task': 'delivery.celery_tasks.rebuild_dispatch_workload',
+        'schedule': timedelta(minutes=5),
+    },
+    'add-status-event-partitions': {
+        'task': 'delivery.celery_tasks.add_status_event_partitions',
+        'schedule': timedelta(days=1),
+    },
+    'sweep-stale-deliveries': {
+        'task': 'delivery.celery_tasks.sweep_stale_deliveries',
+        'schedule': timedelta(hours=1),
+    },
+}
+
 # Test settings
 if 'test' in sys.argv:
     CELERY_TASK_ALWAYS_EAGER = True
     CELERY_TASK_EAGER_PROPAGATES = True
-    EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
\ No newline at end of file
+    EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+    IDEMPOTENCY_BLOOM_FILTER_ENABLED = False
\ No newline at end of file
@@ -0,0 +1,80 @@
+import hashlib
+import math
+import time
+
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+
+
+class RedisBloomFilter:
+    """
+    Bloom filter stored as a Redis bitmap, shared by every gunicorn and Celery worker.
+
+    A negative answer is definite, a positive answer only means "maybe".
+    Bloom filters cannot forget, so the bitmap is rotated every `period` seconds:
+    items are added to the current generation and looked up in the current and
+    previous ones. Anything older falls out of the filter and is answered as
+    "not seen", so `period` must not be shorter than the ledger it fronts.
+
+    Any Redis error is answered with "maybe", which sends the caller to the database.
+    """
+
+    def __init__(self, name, capacity, error_rate, period):
+        self.name = name
+        self.period = period
+        self.size = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+
+    def _positions(self, item):
+        # Kirsch-Mitzenmacher double hashing: two 64 bit halves give all k positions
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:], 'big') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def _generation_keys(self):
+        generation = int(time.time() // self.period)
+        return f"{self.name}:{generation}", f"{self.name}:{generation - 1}"
+
+    def add_many(self, items):
+        current, _ = self._generation_keys()
+        try:
+            pipe = get_redis_connection('default').pipeline(transaction=False)
+            for item in items:
+                for position in self._positions(item):
+                    pipe.setbit(current, position, 1)
+            pipe.expire(current, self.period * 2)
+            pipe.execute()
+        except RedisError:
+            pass
+
+    def add(self, item):
+        self.add_many([item])
+
+    def might_contain_many(self, items):
+        """Return the subset of `items` that may have been added before."""
+        items = list(items)
+        if not items:
+            return set()
+        try:
+            pipe = get_redis_connection('default').pipeline(transaction=False)
+            for key in self._generation_keys():
+                for item in items:
+                    for position in self._positions(item):
+                        pipe.getbit(key, position)
+            bits = pipe.execute()
+        except RedisError:
+            return set(items)
+
+        maybe = set()
+        per_generation = len(items) * self.hash_count
+        for generation in range(2):
+            offset = generation * per_generation
+            for index, item in enumerate(items):
+                start = offset + index * self.hash_count
+                if all(bits[start:start + self.hash_count]):
+                    maybe.add(item)
+        return maybe
+
+    def might_contain(self, item):
+        return item in self.might_contain_many([item])
@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.db import connection
+
+
+def exact_count(queryset):
+    """Count strategy running `COUNT(*)` over the queryset."""
+    return queryset.count(), True
+
+
+def planner_estimate(queryset):
+    """
+    Return the planner's row estimate for `queryset` from EXPLAIN, without running it.
+
+    The estimate scales the table statistics (`pg_class.reltuples`) by the
+    selectivity of the filters, so it is only as fresh as the last ANALYZE.
+    """
+    if queryset.query.select_related:
+        queryset = queryset.select_related(None)
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def estimated_count(queryset, threshold=None):
+    """
+    Count strategy counting exactly only what the planner expects to be small.
+
+    Below `threshold` (PAGINATION_EXACT_COUNT_THRESHOLD by default) estimated
+    rows the queryset is counted; above it the estimate is returned as is, so a
+    large result costs one EXPLAIN instead of a second scan.
+    """
+    threshold = settings.PAGINATION_EXACT_COUNT_THRESHOLD if threshold is None else threshold
+    estimate = planner_estimate(queryset)
+    if estimate < threshold:
+        return exact_count(queryset)
+    return estimate, False
@@ -0,0 +1,74 @@
+import mmap
+import re
+
+_NON_WORD = re.compile(r'[\W_]+')
+
+
+def normalize(text):
+    """Lowercase and collapse punctuation and whitespace, the form gazetteer keys are stored in."""
+    return _NON_WORD.sub(' ', text.lower()).strip()
+
+
+class Gazetteer:
+    """
+    Read-only address/postcode gazetteer memory-mapped from a sorted text file.
+
+    Each line is `<normalized key>\\t<latitude>\\t<longitude>`, sorted bytewise by
+    key (see the `build_gazetteer` command). Lookups binary search the mapping
+    directly, touching O(log n) pages and never loading the file, so every
+    process mapping the same file shares one copy in the OS page cache.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as source:
+            # mmap cannot map an empty file, which is simply a gazetteer without entries
+            self._map = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ) if source.seek(0, 2) else b''
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+
+    def get(self, key):
+        """Return `(latitude, longitude)` for an already normalized key, or None."""
+        target = key.encode()
+        data = self._map
+        low, high = 0, len(data)
+        while low < high:
+            # Look at the line containing the midpoint; low and high always sit on line starts
+            middle = (low + high) // 2
+            start = data.rfind(b'\n', low, middle) + 1 or low
+            end = data.find(b'\n', start, high)
+            if end == -1:
+                end = high
+            key_end = data.find(b'\t', start, end)
+            line_key = data[start:key_end]
+            if line_key == target:
+                latitude, longitude = data[key_end + 1:end].split(b'\t')
+                return float(latitude), float(longitude)
+            if line_key < target:
+                low = end + 1
+            else:
+                high = start
+        return None
+
+    def lookup(self, address):
+        """
+        Resolve a free-form address to `(latitude, longitude)`, or None.
+
+        Tries the whole address first, then ever shorter comma separated tails
+        ("12 thamel marg, kathmandu 44600" then "kathmandu 44600"), then each
+        token containing a digit as a postcode.
+        """
+        parts = [normalize(part) for part in address.split(',')]
+        parts = [part for part in parts if part]
+        for index in range(len(parts)):
+            found = self.get(' '.join(parts[index:]))
+            if found:
+                return found
+        for token in reversed(' '.join(parts).split()):
+            if any(char.isdigit() for char in token):
+                found = self.get(token)
+                if found:
+                    return found
+        return None
@@ -0,0 +1,113 @@
+import math
+
+import numpy as np
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+_DECODE = {char: index for index, char in enumerate(BASE32)}
+
+MAX_PRECISION = 12
+
+
+def encode(latitude, longitude, precision=MAX_PRECISION):
+    """Encode a point as a geohash of `precision` characters."""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+    while len(chars) < precision:
+        value, bounds = (longitude, lon_range) if even else (latitude, lat_range)
+        middle = (bounds[0] + bounds[1]) / 2
+        bits <<= 1
+        if value >= middle:
+            bits |= 1
+            bounds[0] = middle
+        else:
+            bounds[1] = middle
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return ''.join(chars)
+
+
+def _spread_bits(values):
+    """Move bit i of each 30 bit integer to bit 2i (Morton interleaving)."""
+    values = values & 0x3FFFFFFF
+    values = (values | (values << 16)) & 0x0000FFFF0000FFFF
+    values = (values | (values << 8)) & 0x00FF00FF00FF00FF
+    values = (values | (values << 4)) & 0x0F0F0F0F0F0F0F0F
+    values = (values | (values << 2)) & 0x3333333333333333
+    values = (values | (values << 1)) & 0x5555555555555555
+    return values
+
+
+def encode_many(latitudes, longitudes, precision=MAX_PRECISION):
+    """Vectorized `encode` for arrays of points; returns a list of geohashes."""
+    scale = 1 << 30
+    lat_bits = np.clip(np.floor((np.asarray(latitudes, dtype=np.float64) + 90.0) / 180.0 * scale), 0, scale - 1).astype(np.uint64)
+    lon_bits = np.clip(np.floor((np.asarray(longitudes, dtype=np.float64) + 180.0) / 360.0 * scale), 0, scale - 1).astype(np.uint64)
+    # Geohash starts with a longitude bit, so longitude takes the odd (higher) positions
+    code = (_spread_bits(lon_bits) << np.uint64(1)) | _spread_bits(lat_bits)
+
+    shifts = np.array([55 - 5 * i for i in range(precision)], dtype=np.uint64)
+    indices = (code[:, None] >> shifts) & np.uint64(31)
+    chars = np.frombuffer(BASE32.encode(), dtype=np.uint8)[indices.astype(np.intp)]
+    return [value.decode() for value in np.ascontiguousarray(chars).view(f'S{precision}').ravel()]
+
+
+def bounds(geohash):
+    """Return the (min_lat, min_lon, max_lat, max_lon) cell of a geohash."""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        value = _DECODE[char]
+        for shift in range(4, -1, -1):
+            target = lon_range if even else lat_range
+            middle = (target[0] + target[1]) / 2
+            if value >> shift & 1:
+                target[0] = middle
+            else:
+                target[1] = middle
+            even = not even
+    return lat_range[0], lon_range[0], lat_range[1], lon_range[1]
+
+
+def cell_size(precision):
+    """Return the (height, width) in degrees of a cell at `precision`."""
+    bits = precision * 5
+    return 180.0 / 2 ** (bits // 2), 360.0 / 2 ** ((bits + 1) // 2)
+
+
+def cover(min_lat, min_lon, max_lat, max_lon, max_cells=32):
+    """
+    Return geohash prefixes whose cells together cover the bounding box.
+
+    Uses the longest precision that needs at most `max_cells` cells, so the
+    prefixes prune as many rows as possible while staying a short OR of
+    index range scans. Boxes crossing the antimeridian are not supported.
+    """
+    min_lat, max_lat = max(min_lat, -90.0), min(max_lat, 90.0)
+    min_lon, max_lon = max(min_lon, -180.0), min(max_lon, 180.0)
+
+    for precision in range(MAX_PRECISION, 0, -1):
+        height, width = cell_size(precision)
+        rows = math.floor((max_lat + 90) / height) - math.floor((min_lat + 90) / height) + 1
+        columns = math.floor((max_lon + 180) / width) - math.floor((min_lon + 180) / width) + 1
+        if rows * columns <= max_cells:
+            break
+
+    first_row = math.floor((min_lat + 90) / height)
+    first_column = math.floor((min_lon + 180) / width)
+    cells = set()
+    for row in range(first_row, first_row + rows):
+        for column in range(first_column, first_column + columns):
+            # Encode the centre of each cell so rounding never lands on a neighbour
+            latitude = min(-90 + (row + 0.5) * height, 90.0)
+            longitude = min(-180 + (column + 0.5) * width, 180.0)
+            cells.add(encode(latitude, longitude, precision))
+    return sorted(cells)
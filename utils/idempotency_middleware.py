@@ -0,0 +1,126 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, JsonResponse
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings
+
+IDEMPOTENT_METHODS = ('POST', 'PATCH')
+
+IN_FLIGHT = 'in_flight'
+COMPLETED = 'completed'
+
+
+class IdempotencyKeyMiddleware:
+    """
+    Replay mutating requests that carry a client supplied `Idempotency-Key` header.
+
+    The first request with a key reserves it atomically in the cache (`cache.add`
+    is a Redis SET NX). Its response is stored against the key so retries get the
+    original status and body back without reaching the view or the database.
+    A retry that arrives while the first request is still running waits for it.
+
+    Keys are scoped per user, and reusing a key with a different method, path
+    or body is rejected. Server errors are not stored so the client can retry them.
+    """
+
+    header = 'HTTP_IDEMPOTENCY_KEY'
+    poll_interval = 0.05
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.jwt_authentication = JWTAuthentication()
+
+    def __call__(self, request):
+        key = request.META.get(self.header)
+
+        if request.method not in IDEMPOTENT_METHODS or not key:
+            return self.get_response(request)
+
+        if len(key) > 255:
+            return JsonResponse({"message": "Idempotency-Key must be at most 255 characters"}, status=400)
+
+        user_id = self.get_user_id(request)
+        if user_id is None:
+            # Unauthenticated requests are rejected by the view itself
+            return self.get_response(request)
+
+        cache_key = f"idempotency:{user_id}:{key}"
+        fingerprint = self.get_fingerprint(request)
+
+        record = None
+        for _ in range(2):
+            if cache.add(cache_key, {'state': IN_FLIGHT, 'fingerprint': fingerprint}, timeout=settings.IDEMPOTENCY_KEY_LOCK_TTL):
+                return self.process_first_request(request, cache_key, fingerprint)
+            record = self.wait_for_completion(cache_key)
+            if record is not None:
+                break
+            # The in-flight request failed and released the key, so try to take it over once
+
+        if record is None:
+            return JsonResponse({"message": "A request with this Idempotency-Key is still being processed"}, status=409)
+
+        if record['fingerprint'] != fingerprint:
+            return JsonResponse({"message": "Idempotency-Key was already used with a different request"}, status=422)
+
+        if record['state'] == IN_FLIGHT:
+            return JsonResponse({"message": "A request with this Idempotency-Key is still being processed"}, status=409)
+
+        response = HttpResponse(record['content'], status=record['status'], content_type=record['content_type'])
+        response['Idempotent-Replayed'] = 'true'
+        return response
+
+    def process_first_request(self, request, cache_key, fingerprint):
+        try:
+            response = self.get_response(request)
+        except Exception:
+            cache.delete(cache_key)
+            raise
+
+        if response.status_code >= 500 or response.streaming:
+            cache.delete(cache_key)
+            return response
+
+        cache.set(cache_key, {
+            'state': COMPLETED,
+            'fingerprint': fingerprint,
+            'status': response.status_code,
+            'content': response.content,
+            'content_type': response.get('Content-Type'),
+        }, timeout=settings.IDEMPOTENCY_KEY_TTL)
+        return response
+
+    def wait_for_completion(self, cache_key):
+        """Poll the cache until the in-flight request stores its response or the wait times out."""
+        deadline = time.monotonic() + settings.IDEMPOTENCY_KEY_WAIT_TIMEOUT
+        record = cache.get(cache_key)
+        while record is not None and record['state'] == IN_FLIGHT and time.monotonic() < deadline:
+            time.sleep(self.poll_interval)
+            record = cache.get(cache_key)
+        return record
+
+    def get_user_id(self, request):
+        """Resolve the user from the JWT claims (no database hit) or the session."""
+        header = self.jwt_authentication.get_header(request)
+        if header is not None:
+            raw_token = self.jwt_authentication.get_raw_token(header)
+            if raw_token is None:
+                return None
+            try:
+                validated_token = self.jwt_authentication.get_validated_token(raw_token)
+            except (InvalidToken, TokenError):
+                return None
+            return validated_token.get(api_settings.USER_ID_CLAIM)
+
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            return user.pk
+        return None
+
+    @staticmethod
+    def get_fingerprint(request):
+        raw_string = f"{request.method}:{request.path}:".encode() + request.body
+        return hashlib.sha256(raw_string).hexdigest()
@@ -1,9 +1,20 @@
+import base64
+import binascii
+from collections import OrderedDict
 from urllib import parse
 
-from django.core.paginator import InvalidPage
+from django.core.paginator import EmptyPage, InvalidPage, Page, PageNotAnInteger, Paginator
+from django.db import connection
+from django.db.models import BooleanField
+from django.db.models.expressions import RawSQL
+from django.utils.dateparse import parse_datetime
 from django.utils.encoding import force_str
+from django.utils.functional import cached_property
 from rest_framework.exceptions import NotFound
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+
+from utils.counting import exact_count
 
 
 def replace_query_param(url, key, val):
@@ -26,9 +37,77 @@ def remove_query_param(url, key):
     return parse.urlunsplit((scheme, netloc, path, query, fragment))
 
 
+class EstimatedPage(Page):
+    """A page whose paginator only has an estimated count; it knows from one extra row whether another page follows."""
+
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+    def next_page_number(self):
+        return self.number + 1
+
+    def previous_page_number(self):
+        return self.number - 1
+
+
+class CountStrategyPaginator(Paginator):
+    """
+    Paginator taking its total from `count_strategy(queryset) -> (count, is_exact)`.
+
+    With an estimated count the page number is not bounded by the estimate,
+    which may fall short of the real total; the page is read with one extra row
+    instead. The last page makes the count exact again, as it shows how many
+    rows there are.
+    """
+
+    def __init__(self, object_list, per_page, count_strategy=exact_count, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_strategy = count_strategy
+
+    @cached_property
+    def counted(self):
+        return self.count_strategy(self.object_list)
+
+    @property
+    def count(self):
+        return self.counted[0]
+
+    @property
+    def count_is_exact(self):
+        return self.counted[1]
+
+    def page(self, number):
+        if self.count_is_exact:
+            return super().page(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages['invalid_page'])
+        if number < 1:
+            raise EmptyPage(self.error_messages['min_page'])
+
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage(self.error_messages['no_results'])
+        has_next = len(rows) > self.per_page
+        if not has_next:
+            self.counted = (bottom + len(rows), True)
+        return EstimatedPage(rows[:self.per_page], number, self, has_next)
+
+
 class CustomPagination(PageNumberPagination):
     page_size = 10
     page_size_query_param = 'per_page'
+    django_paginator_class = CountStrategyPaginator
+
+    def __init__(self, count_strategy=exact_count):
+        # See utils.counting for strategies trading an exact total for a cheaper one
+        self.count_strategy = count_strategy
 
     def get_next_link(self):
         if not self.page.has_next():
@@ -55,7 +134,7 @@ class CustomPagination(PageNumberPagination):
         if not page_size:
             return None
 
-        paginator = self.django_paginator_class(queryset, page_size)
+        paginator = self.django_paginator_class(queryset, page_size, count_strategy=self.count_strategy)
         page_number = self.get_page_number(request, paginator)
 
         try:
@@ -72,3 +151,123 @@ class CustomPagination(PageNumberPagination):
 
         self.request = request
         return self.page
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('count', self.page.paginator.count),
+            ('count_is_exact', self.page.paginator.count_is_exact),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination keyed on `(created_at, id)`, newest first by default.
+
+    Each page continues from the last row of the previous one with a row value
+    comparison, `(created_at, id) < (%s, %s)`, which an index on the filter
+    columns followed by `(created_at, id)` answers by reading only the rows of
+    the page. Unlike `CustomPagination` there is no COUNT and no OFFSET, so a
+    page costs the same at any depth and rows created meanwhile never shift
+    later pages.
+
+    Views opt in per request: a `cursor` query parameter (empty for the first
+    page) selects this class, and the `next`/`previous` links carry opaque
+    cursors from then on.
+    """
+    page_size = 10
+    page_size_query_param = 'per_page'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self, ascending=False):
+        self.ascending = ascending
+
+    @classmethod
+    def requested(cls, request):
+        """Whether the client asked for cursor pages."""
+        return cls.cursor_query_param in request.query_params
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(page_size, self.max_page_size) if page_size > 0 else self.page_size
+
+    @staticmethod
+    def position(row):
+        """The `(created_at, id)` of a model instance or of a `.values()` row."""
+        if isinstance(row, dict):
+            return row['created_at'], row['id']
+        return row.created_at, row.id
+
+    def encode_cursor(self, position, reverse):
+        created_at, pk = position
+        query = parse.urlencode({'p': created_at.isoformat(), 'i': pk, 'r': int(reverse)})
+        cursor = base64.urlsafe_b64encode(query.encode()).decode()
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        """Return `((created_at, id), reverse)` from the request, or `(None, False)` for the first page."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            query = parse.parse_qs(base64.urlsafe_b64decode(encoded.encode()).decode(), strict_parsing=True)
+            created_at = parse_datetime(query['p'][0])
+            pk = int(query['i'][0])
+            reverse = query['r'][0] == '1'
+        except (binascii.Error, UnicodeDecodeError, KeyError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if created_at is None:
+            raise NotFound(self.invalid_cursor_message)
+        return (created_at, pk), reverse
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request)
+
+        # Walking back towards the start reads the index the other way round
+        ascending = self.ascending != reverse
+        if position:
+            table = connection.ops.quote_name(queryset.model._meta.db_table)
+            operator = '>' if ascending else '<'
+            queryset = queryset.filter(RawSQL(
+                f"({table}.created_at, {table}.id) {operator} (%s, %s)", position, output_field=BooleanField()
+            ))
+        ordering = ('created_at', 'id') if ascending else ('-created_at', '-id')
+        rows = list(queryset.order_by(*ordering)[:page_size + 1])
+
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+        first = self.position(rows[0]) if rows else position
+        last = self.position(rows[-1]) if rows else position
+
+        # The page we came from always exists; the one further on only when a row was left over
+        if reverse:
+            self.next = self.encode_cursor(last, False) if last else None
+            self.previous = self.encode_cursor(first, True) if has_more else None
+        else:
+            self.next = self.encode_cursor(last, False) if has_more else None
+            self.previous = self.encode_cursor(first, True) if position else None
+        return rows
+
+    def get_next_link(self):
+        return self.next
+
+    def get_previous_link(self):
+        return self.previous
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.next),
+            ('previous', self.previous),
+            ('results', data),
+        ]))
@@ -0,0 +1,18 @@
+from delivery.services.hooks import collect
+
+
+class TransitionHookMiddleware:
+    """
+    Batch the side effects of the delivery transitions a request commits.
+
+    Hooks registered with `delivery.services.hooks.on_transition` are queued as the
+    transitions commit and sent to Celery as one message when the view returns,
+    so the response never waits for notifications or other side effects.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with collect():
+            return self.get_response(request)